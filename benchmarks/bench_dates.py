@@ -0,0 +1,48 @@
+"""
+Benchmark of date parsing in cleaning_df: the original per column
+pd.to_datetime(format="%m/%d/%Y") against normalize_dates, which parses each distinct
+string once and tries every format in CONFIG.DATE_FORMATS. Also reports how many
+dates each approach loses.
+
+Run from the project root:
+    $ python -m benchmarks.bench_dates [n_rows]
+"""
+
+import sys
+import time
+import random
+import pandas as pd
+from scripts.child_fatality_scrape import normalize_dates
+
+
+def synthetic_dates(n_rows, seed=0):
+    # a few hundred distinct dates repeated across rows, as in the county outputs
+    rng = random.Random(seed)
+    shapes = ["{m}/{d}/{y}"] * 8 + ["{m}/{d}/{yy}", "{m}-{d}-{y}"]
+    return pd.Series(
+        [
+            rng.choice(shapes).format(
+                m=rng.randint(1, 12), d=rng.randint(1, 28), y=rng.randint(2017, 2024), yy=rng.randint(17, 24)
+            )
+            for _ in range(n_rows)
+        ]
+    )
+
+
+def bench(n_rows=100_000):
+    values = synthetic_dates(n_rows)
+
+    start = time.perf_counter()
+    single_format = pd.to_datetime(values, format="%m/%d/%Y", errors="coerce")
+    single_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    dates, failed = normalize_dates(values)
+    normalize_seconds = time.perf_counter() - start
+
+    print(f"{'to_datetime(%m/%d/%Y)':>22}: {single_seconds:7.3f} s, {single_format.isna().sum():6d} dates lost")
+    print(f"{'normalize_dates':>22}: {normalize_seconds:7.3f} s, {failed:6d} dates lost")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
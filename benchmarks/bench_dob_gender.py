@@ -0,0 +1,60 @@
+"""
+Benchmark of splitting 'date_of_birth_and_gender' into DOB and gender: the row by row
+apply(parse_dob_gender) against the vectorized split_dob_gender used by cleaning_df.
+
+Run from the project root:
+    $ python -m benchmarks.bench_dob_gender [n_rows]
+"""
+
+import sys
+import time
+import random
+import pandas as pd
+from scripts.child_fatality_scrape import parse_dob_gender, split_dob_gender
+
+
+def synthetic_values(n_rows, seed=0):
+    # shapes seen in output_files/child_fatality_*.csv plus missing and unparseable values
+    rng = random.Random(seed)
+    shapes = [
+        "{m}/{d}/{y}, {g}",
+        "{m}/{d}/{y} {g}",
+        "{g}, {m}-{d}-{yy}",
+        "DOB: {m}/{d}/{y} Gender: {g}",
+        "Unknown",
+    ]
+    values = []
+    for _ in range(n_rows):
+        values.append(
+            rng.choice(shapes).format(
+                m=rng.randint(1, 12),
+                d=rng.randint(1, 28),
+                y=rng.randint(2005, 2024),
+                yy=rng.randint(5, 24),
+                g=rng.choice(["Male", "Female", "male", "FEMALE"]),
+            )
+        )
+    return pd.Series(values)
+
+
+def bench(n_rows=100_000):
+    values = synthetic_values(n_rows)
+
+    start = time.perf_counter()
+    expected = values.apply(parse_dob_gender)
+    apply_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = split_dob_gender(values)
+    vectorized_seconds = time.perf_counter() - start
+
+    assert result["DOB"].fillna("").tolist() == expected[0].fillna("").tolist()
+    assert result["gender"].fillna("").tolist() == expected[1].fillna("").tolist()
+
+    print(f"{'apply(parse_dob_gender)':>24}: {apply_seconds:7.3f} s for {n_rows} rows")
+    print(f"{'split_dob_gender':>24}: {vectorized_seconds:7.3f} s for {n_rows} rows")
+    print(f"{'speedup':>24}: {apply_seconds / vectorized_seconds:7.1f}x")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,109 @@
+"""
+Throughput and soak test of download_all_pdfs against the local DCFS stand-in
+(benchmarks.dcfs_server), fully offline. Times a cold download of every PDF and a
+conditional re-run (all 304s). With failures injected, it keeps re-running until the local
+folder mirrors the server or --rounds runs out, then checks every file byte for byte.
+
+Run from the project root:
+    $ python -m benchmarks.bench_download [--files 2000] [--workers 16] [--latency 0.02]
+          [--bandwidth 1048576] [--error-rate 0.02] [--drop-rate 0.02] [--stall-rate 0.005]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from unittest.mock import patch
+import config.CONFIG as CONFIG
+from scripts.child_fatality_scrape import download_all_pdfs
+from benchmarks.dcfs_server import DCFSServer
+
+
+def missing_or_wrong(server, county, save_dir):
+    # server files the folder doesn't hold an identical copy of
+    bad = []
+    for name in server.files[county]:
+        path = os.path.join(save_dir, name)
+        if not os.path.exists(path):
+            bad.append(name)
+            continue
+        with open(path, "rb") as f:
+            if f.read() != server.file_bytes(county, name):
+                bad.append(name)
+    return bad
+
+
+def timed_run(url, workers):
+    start = time.perf_counter()
+    save_dir = download_all_pdfs(url, max_workers=workers)
+    return save_dir, time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="download_all_pdfs against a local DCFS stand-in")
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--file-size", type=int, default=32 * 1024)
+    parser.add_argument("--workers", type=int, default=CONFIG.DOWNLOAD_WORKERS)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds before each response")
+    parser.add_argument("--bandwidth", type=int, default=0, help="bytes/second per response, 0 unlimited")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of PDF requests answered 503")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="share of PDF bodies cut off half way")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="share of PDF requests that time out")
+    parser.add_argument("--timeout", type=float, default=2.0, help="client timeout, stalls outlast it")
+    parser.add_argument("--rounds", type=int, default=10, help="runs allowed to converge under failures")
+    args = parser.parse_args(argv)
+
+    county = "Clark"
+    server = DCFSServer(
+        {county: args.files},
+        file_size=args.file_size,
+        latency=args.latency,
+        bandwidth=args.bandwidth or None,
+        error_rate=args.error_rate,
+        stall_rate=args.stall_rate,
+        drop_rate=args.drop_rate,
+        stall_seconds=args.timeout * 2,
+    )
+
+    # download into a throwaway ./output_files
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir, server, patch.object(CONFIG, "DOWNLOAD_TIMEOUT", args.timeout):
+        os.chdir(tmp_dir)
+        try:
+            url = server.county_url(county)
+            save_dir, seconds = timed_run(url, args.workers)
+            megabytes = server.stats["bytes_sent"] / 1024 / 1024
+            print(
+                f"cold: {seconds:.2f} s, {args.files / seconds:.0f} PDFs/s, {megabytes / seconds:.1f} MiB/s "
+                f"({args.workers} workers)"
+            )
+
+            rounds = 1
+            while missing_or_wrong(server, county, save_dir) and rounds < args.rounds:
+                _, seconds = timed_run(url, args.workers)
+                rounds += 1
+                print(f"retry round {rounds}: {seconds:.2f} s")
+
+            bad = missing_or_wrong(server, county, save_dir)
+            if not bad:
+                # nothing changed on the server, every PDF should come back 304
+                before = server.stats["304"]
+                _, seconds = timed_run(url, args.workers)
+                print(
+                    f"conditional: {seconds:.2f} s, {args.files / seconds:.0f} PDFs/s, "
+                    f"{server.stats['304'] - before} not modified"
+                )
+        finally:
+            os.chdir(cwd)
+
+    print(f"server: {dict(server.stats)}")
+    if bad:
+        print(f"FAILED: {len(bad)} PDFs missing or corrupt after {rounds} rounds, e.g. {bad[:3]}")
+        return 1
+    print(f"OK: {args.files} PDFs identical to the server after {rounds} round(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Micro-benchmark of the per-PDF parse cost of scrape_individual_pdf's line parser
+(parse_disclosure_fields) against the original two pass implementation, kept below as
+legacy_parse_fields for reference. DataFrame construction is left out of both timings.
+
+Run from the project root:
+    $ python -m benchmarks.bench_parse
+"""
+
+import re
+import timeit
+import config.CONFIG as CONFIG
+from scripts.child_fatality_scrape import (
+    parse_disclosure_fields,
+    restructure_alphabetical_dict,
+    merge_dicts,
+)
+
+PAGE_1 = """Division of Child and Family Services MTL# 0401-12032021
+Family Programs Office: Statewide Policy Manual Section 0400
+CHILD WELFARE AGENCY PUBLIC DISCLOSURE FORM
+Date: 5/2/2023
+Agency Name: Clark County Department of Family Services
+Agency Address: 500 S. Grand Central Pkwy, 5th Floor, Las Vegas, NV 89155
+Date of written notification to the Division of Child and Family Services and Legislative Auditor: 4/20/2023
+Internal reference UNITY Case Number: 1446073
+Child Fatality Date of Death:
+Near Fatality Date of Near Fatality: 4/13/2023
+INFORMATION FOR RELEASE
+A. Date of the notification to the child welfare agency of the death of a child:
+4/13/2023
+B. Location of child at the time of death or near fatality (city/county):
+Las Vegas, Clark
+C. A summary of the report of abuse or neglect and a factual description of the contents of the report:
+{summary}
+D. The date of birth and gender of child:
+7/19/2021, Male
+E. The date that the child suffered the fatality or near fatality:
+4/13/2023
+F. The cause of the fatality or near fatality, if such information has been determined:
+The cause of the near fatality is under investigation.
+G. Whether the agency had any contact with the child or a member of the child's family
+Date: 12/03/2021 FPO 0401A - Child Welfare Agency Public Disclosure Form Page 1 of 2"""
+
+PAGE_2 = """Division of Child and Family Services MTL# 0401-12032021
+Family Programs Office: Statewide Policy Manual Section 0400
+{history}
+H. Whether the agency which provides child welfare services, in response to the fatality
+CCDFS has opened a case for investigation and family assessment.
+Date: 12/03/2021 FPO 0401A - Child Welfare Agency Public Disclosure Form Page 2 of 2"""
+
+
+def sample_pages(summary_lines=6, history_lines=20):
+    summary = "\n".join(
+        "CCDFS received a report that the child was transported to a local hospital."
+        for _ in range(summary_lines)
+    )
+    history = "\n".join(
+        f"{i % 12 + 1}/2/2019-A referral was received and was coded Information Only."
+        for i in range(history_lines)
+    )
+    return [PAGE_1.format(summary=summary), PAGE_2.format(history=history)]
+
+
+def legacy_parse_fields(pages_text, pdf_file, keys):
+    # the original implementation: two passes, list membership and an uncompiled regex per line
+    data = {key: "" for key in keys}
+    alphabetical_dict = {}
+    current_alphabetical_key = None
+    information_for_release_index = None
+
+    for page_text in pages_text:
+        lines = page_text.split("\n")
+        for i, line in enumerate(lines):
+            if "INFORMATION FOR RELEASE" in line:
+                information_for_release_index = i
+                break
+
+    for page_text in pages_text:
+        lines = page_text.split("\n")
+        for i, line in enumerate(lines):
+            if i < information_for_release_index:
+                if ": " in line:
+                    key, value = line.split(": ", 1)
+                    if key in keys and not data[key]:
+                        data[key] = value
+            else:
+                match = re.match(r"([A-Z])\.", line)
+                if match:
+                    current_alphabetical_key = match.group(1)
+                    alphabetical_dict[current_alphabetical_key] = line[3:] + "\n"
+                elif current_alphabetical_key:
+                    alphabetical_dict[current_alphabetical_key] += line + "\n"
+
+    return merge_dicts(data, restructure_alphabetical_dict(alphabetical_dict))
+
+
+def bench(number=2000):
+    pdf_file = "./output_files/Clark_pdfs/2023-01-17_ID_1469166.pdf"
+    pages = sample_pages()
+
+    legacy = legacy_parse_fields(pages, pdf_file, CONFIG.KEYS)
+    current = parse_disclosure_fields(pages, pdf_file, CONFIG.KEYS, stop_section=None)
+    assert legacy == current, "parsers disagree"
+
+    results = {}
+    for name, func in (
+        ("legacy", legacy_parse_fields),
+        ("parse_disclosure_fields", parse_disclosure_fields),
+    ):
+        seconds = min(
+            timeit.repeat(lambda: func(pages, pdf_file, CONFIG.KEYS), number=number, repeat=3)
+        )
+        results[name] = 1e6 * seconds / number
+        print(f"{name:>24}: {results[name]:8.1f} us per PDF")
+
+    print(f"{'speedup':>24}: {results['legacy'] / results['parse_disclosure_fields']:8.2f}x")
+    return results
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,58 @@
+"""
+Benchmark of building the county DataFrame from per-PDF records versus the original
+one row DataFrame per PDF (two df.insert calls and a df.replace each) and a pd.concat.
+Reports time and peak traced allocation per PDF for the scrape + cleaning_df step.
+
+Run from the project root:
+    $ python -m benchmarks.bench_records [n_pdfs]
+"""
+
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import config.CONFIG as CONFIG
+from scripts.child_fatality_scrape import parse_disclosure_fields, scrape_text, cleaning_df
+from benchmarks.bench_parse import sample_pages
+
+
+def legacy_one_row_frame(pages_text, pdf_file, keys):
+    # the original scrape_individual_pdf output shape
+    df = pd.DataFrame(parse_disclosure_fields(pages_text, pdf_file, keys), index=[0])
+    df.insert(0, "original_pdf", pdf_file.split("/")[-1])
+    df.insert(0, "original_region", pdf_file.split("/")[-2].split("_")[0])
+    df.replace("", np.nan, inplace=True)
+    return df
+
+
+def measure(build, n_pdfs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = cleaning_df(build(), CONFIG.RENAME_COLS, CONFIG.TIME_COLS)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, 1e6 * seconds / n_pdfs, peak / n_pdfs
+
+
+def bench(n_pdfs=1000):
+    pages = sample_pages()
+    pdf_files = [f"./output_files/Clark_pdfs/2023-01-17_ID_{i}.pdf" for i in range(n_pdfs)]
+
+    frames_df, frames_us, frames_bytes = measure(
+        lambda: [legacy_one_row_frame(pages, f, CONFIG.KEYS) for f in pdf_files], n_pdfs
+    )
+    records_df, records_us, records_bytes = measure(
+        lambda: [scrape_text(pages, f, CONFIG.KEYS) for f in pdf_files], n_pdfs
+    )
+    records_df = records_df.drop(columns=["prior_cases_count"])
+    assert frames_df.to_csv(index=False) == records_df.to_csv(index=False), "outputs differ"
+
+    print(f"{'one row DataFrames':>20}: {frames_us:8.1f} us, {frames_bytes / 1024:7.1f} KiB peak per PDF")
+    print(f"{'records':>20}: {records_us:8.1f} us, {records_bytes / 1024:7.1f} KiB peak per PDF")
+    print(f"{'speedup':>20}: {frames_us / records_us:8.2f}x")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,295 @@
+"""
+Local stand-in for the DCFS child fatality site, for exercising the real download path
+(find_pdf_links, download_pdf, download_all_pdfs) offline. It serves the county index pages
+at /Programs/CWS/CPS/ChildFatalities/{county}/ and their PDF links under
+/uploadedFiles/dcfsnvgov/content/Programs/CWS/CPS/ChildFatalities/{county}/, like dcfs.nv.gov.
+
+Every request can be slowed down (latency before the response, per-connection bandwidth
+limit) and PDF requests can fail: a 503, a stall longer than the client timeout or a
+connection dropped half way through the body. Failures are injected at random rates or
+queued for a specific file. PDFs carry an ETag and Last-Modified, answer If-None-Match with
+a 304 and Range + If-Range with a 206, or a 416 past the end of the file. PDF bodies are
+generated from the file name, so thousands of files cost no memory.
+
+Example:
+    with DCFSServer({"Clark": 2000}, latency=0.02, bandwidth=2 * 1024 * 1024, error_rate=0.01) as server:
+        download_all_pdfs(server.county_url("Clark"))
+        print(server.stats)
+"""
+
+import re
+import sys
+import time
+import random
+import hashlib
+import threading
+from collections import Counter
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Union
+
+INDEX_PATH = "/Programs/CWS/CPS/ChildFatalities/{county}/"
+UPLOAD_PATH = "/uploadedFiles/dcfsnvgov/content/Programs/CWS/CPS/ChildFatalities/{county}/{name}"
+
+FAULTS = ("503", "stall", "drop")
+
+# body bytes written between bandwidth checks
+WRITE_CHUNK = 16 * 1024
+
+
+class QuietThreadingHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # the default backlog of 5 drops connects from a large download pool, which then wait
+    # out a 1 second SYN retransmit
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # clients hang up on streamed responses they close early, that's not a server error
+        if not isinstance(sys.exc_info()[1], (ConnectionError, TimeoutError)):
+            super().handle_error(request, client_address)
+
+
+def synthetic_pdf_bytes(name: str, version: int, size: int) -> bytes:
+    # deterministic filler behind a PDF header, different for every name and version
+    seed = hashlib.sha256(f"{name}:{version}".encode()).digest()
+    header = f"%PDF-1.7\n% {name} v{version}\n".encode()
+    return (header + seed * (size // len(seed) + 1))[:max(size, len(header))]
+
+
+class DCFSServer:
+    """
+    Threaded HTTP server imitating the DCFS county pages and PDF uploads, see the module docstring.
+
+    Args:
+        counties (dict): {county: number of PDFs} or {county: {file name: bytes}}.
+        file_size (int): Size of the generated PDFs.
+        latency (float): Seconds slept before answering any request.
+        bandwidth (int): Bytes per second per response body, None for unlimited.
+        error_rate (float): Chance a PDF request gets a 503.
+        stall_rate (float): Chance a PDF request stalls for stall_seconds before answering.
+        drop_rate (float): Chance a PDF response is cut off half way through the body.
+        stall_seconds (float): Length of a stall, set it above the client timeout.
+        seed (int): Seed of the random failures.
+    """
+
+    def __init__(
+        self,
+        counties: Dict[str, Union[int, Dict[str, bytes]]],
+        file_size: int = 32 * 1024,
+        latency: float = 0.0,
+        bandwidth: Optional[int] = None,
+        error_rate: float = 0.0,
+        stall_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        stall_seconds: float = 5.0,
+        seed: int = 0,
+    ):
+        self.file_size = file_size
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.rates = {"503": error_rate, "stall": stall_rate, "drop": drop_rate}
+        self.stall_seconds = stall_seconds
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.faults: Dict[str, list] = {}
+
+        # {county: {name: [version, bytes or None for generated]}}
+        self.files: Dict[str, Dict[str, list]] = {}
+        for county, files in counties.items():
+            if isinstance(files, int):
+                files = {f"{county}_{i:06d}.pdf": None for i in range(files)}
+            self.files[county] = {name: [1, data] for name, data in files.items()}
+
+        self.httpd: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+    # -- lifecycle
+
+    def start(self) -> "DCFSServer":
+        self.httpd = QuietThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def __enter__(self) -> "DCFSServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def county_url(self, county: str) -> str:
+        # same shape as CONFIG.URL_LIST, the county is the second to last path part
+        return self.base_url + INDEX_PATH.format(county=county)
+
+    # -- content
+
+    def file_bytes(self, county: str, name: str) -> bytes:
+        version, data = self.files[county][name]
+        return data if data is not None else synthetic_pdf_bytes(name, version, self.file_size)
+
+    def etag(self, county: str, name: str) -> str:
+        version, data = self.files[county][name]
+        digest = hashlib.sha1(data if data is not None else f"{county}/{name}".encode()).hexdigest()
+        return f'"{digest[:16]}-{version}"'
+
+    def update_file(self, county: str, name: str, data: Optional[bytes] = None) -> None:
+        """
+        Publishes a new version of a PDF (new bytes, new ETag), adding it if it is new.
+        """
+
+        with self.lock:
+            version = self.files[county][name][0] + 1 if name in self.files[county] else 1
+            self.files[county][name] = [version, data]
+
+    def remove_file(self, county: str, name: str) -> None:
+        with self.lock:
+            del self.files[county][name]
+
+    def inject(self, name: str, *faults: str) -> None:
+        """
+        Queues faults ('503', 'stall' or 'drop') for the next requests of a PDF, one per request.
+        """
+
+        assert all(fault in FAULTS for fault in faults), f"faults are {FAULTS}"
+        with self.lock:
+            self.faults.setdefault(name, []).extend(faults)
+
+    def _next_fault(self, name: str) -> Optional[str]:
+        with self.lock:
+            if self.faults.get(name):
+                return self.faults[name].pop(0)
+            roll = self.rng.random()
+        for fault in FAULTS:
+            if roll < self.rates[fault]:
+                return fault
+            roll -= self.rates[fault]
+        return None
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self.lock:
+            self.stats[key] += n
+
+    # -- HTTP
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive, like the real site, so the client's connection pool is exercised
+            protocol_version = "HTTP/1.1"
+            # headers and body go out in separate writes, don't let them wait on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server._count("requests")
+                if server.latency:
+                    time.sleep(server.latency)
+
+                # hrefs are appended to 'https://dcfs.nv.gov/', so PDF paths arrive as //uploadedFiles/...
+                path = re.sub("/+", "/", self.path.split("?")[0])
+                for county, files in server.files.items():
+                    if path.rstrip("/") == INDEX_PATH.format(county=county).rstrip("/"):
+                        return self.index_page(county, files)
+                    prefix = UPLOAD_PATH.format(county=county, name="")
+                    if path.startswith(prefix) and path[len(prefix):] in files:
+                        return self.pdf(county, path[len(prefix):])
+                self.send_body(404, b"Not Found", {"Content-Type": "text/plain"})
+
+            def index_page(self, county, files):
+                with server.lock:
+                    names = list(files)
+                links = "\n".join(
+                    f'<li><a href="{UPLOAD_PATH.format(county=county, name=name)}">{name}</a></li>' for name in names
+                )
+                # a few links every real page has that aren't county PDFs
+                body = (
+                    f"<html><body><h1>{county} Child Fatalities</h1>\n"
+                    '<a href="/Programs/CWS/CPS/ChildFatalities/">Back</a>\n'
+                    '<a href="/uploadedFiles/dcfsnvgov/content/Programs/CWS/Policy.pdf">Policy</a>\n'
+                    f"<ul>\n{links}\n</ul></body></html>"
+                ).encode()
+                server._count("index")
+                self.send_body(200, body, {"Content-Type": "text/html; charset=utf-8"})
+
+            def pdf(self, county, name):
+                fault = server._next_fault(name)
+                if fault == "503":
+                    server._count("503")
+                    return self.send_body(503, b"Service Unavailable", {"Content-Type": "text/plain"})
+                if fault == "stall":
+                    server._count("stall")
+                    time.sleep(server.stall_seconds)
+                    self.close_connection = True
+                    return
+
+                with server.lock:
+                    data, etag = server.file_bytes(county, name), server.etag(county, name)
+                    version = server.files[county][name][0]
+                headers = {
+                    "Content-Type": "application/pdf",
+                    "ETag": etag,
+                    "Last-Modified": formatdate(1700000000 + version, usegmt=True),
+                    "Accept-Ranges": "bytes",
+                }
+
+                if self.headers.get("If-None-Match") == etag:
+                    server._count("304")
+                    return self.send_body(304, b"", headers)
+
+                status, start = 200, 0
+                range_header = self.headers.get("Range", "")
+                match = re.fullmatch(r"bytes=(\d+)-", range_header)
+                # If-Range: only resume when the partial bytes came from this version
+                if match and self.headers.get("If-Range", etag) == etag:
+                    if int(match.group(1)) >= len(data):
+                        # nothing past the end of the file, like a real server
+                        server._count("416")
+                        headers["Content-Range"] = f"bytes */{len(data)}"
+                        return self.send_body(416, b"", headers)
+                    status, start = 206, int(match.group(1))
+                    headers["Content-Range"] = f"bytes {start}-{len(data) - 1}/{len(data)}"
+                server._count(str(status))
+                self.send_body(status, data[start:], headers, drop=fault == "drop")
+
+            def send_body(self, status, body, headers, drop=False):
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if status == 304:
+                    return
+
+                if drop:
+                    # advertise the whole body, send half and hang up
+                    body = body[: len(body) // 2]
+                    self.close_connection = True
+                    server._count("drop")
+
+                started = time.perf_counter()
+                for offset in range(0, len(body), WRITE_CHUNK):
+                    chunk = body[offset : offset + WRITE_CHUNK]
+                    if server.bandwidth:
+                        # hold each chunk back until sending it keeps the response at bandwidth bytes/second
+                        ahead = (offset + len(chunk)) / server.bandwidth - (time.perf_counter() - started)
+                        if ahead > 0:
+                            time.sleep(ahead)
+                    self.wfile.write(chunk)
+                server._count("bytes_sent", len(body))
+                self.wfile.flush()
+
+        return Handler
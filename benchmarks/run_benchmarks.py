@@ -0,0 +1,189 @@
+"""
+Offline benchmark suite over a synthetic disclosure corpus (see benchmarks.synthetic_corpus).
+For each county layout it times, separately:
+
+    scrape_individual_pdf      parsing already extracted page text
+    count_dates_in_g_section   prior history count from the PDF bytes
+    loop_pdf_scrape            open, extract and scrape every PDF (CONFIG.SCRAPE_WORKERS)
+    cleaning_df                records -> typed county DataFrame
+    merge                      prior history counts joined onto the county DataFrame
+
+Stages are reported in microseconds per PDF so scales compare. Results are written to a JSON
+file and checked against a baseline: a stage more than --threshold slower than its baseline
+for the same scale is a regression and the exit status is 1.
+
+Run from the project root:
+    $ python -m benchmarks.run_benchmarks --scale 1k --update-baseline   # record a baseline
+    $ python -m benchmarks.run_benchmarks --scale 1k                     # check against it
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+from typing import Dict, List
+import config.CONFIG as CONFIG
+from scripts.child_fatality_scrape import scrape_individual_pdf, loop_pdf_scrape, cleaning_df
+from scripts.prior_history import count_dates_in_g_section, merge_prior_counts, prior_counts_from_scrape
+from scripts.pdf_text import extract_pages_text
+from benchmarks.synthetic_corpus import LAYOUTS, generate_corpus, scale_size
+
+STAGES = ["scrape_individual_pdf", "count_dates_in_g_section", "loop_pdf_scrape", "cleaning_df", "merge"]
+
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+
+
+def best_of(func, repeat: int) -> float:
+    # fastest of repeat runs, the least disturbed by the rest of the machine
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench_county(
+    pdf_dir: str, file_list: List[str], sample: int, repeat: int, workers: int, backend: str
+) -> Dict[str, Dict[str, float]]:
+    """
+    Times every stage on one county's corpus.
+
+    Args:
+        pdf_dir (str): {county}_pdfs folder.
+        file_list (list): PDF file names in it.
+        sample (int): PDFs used for the per-PDF stages that don't need the whole corpus.
+        repeat (int): Runs of each stage, the fastest is kept. loop_pdf_scrape runs once.
+        workers (int): Processes for loop_pdf_scrape.
+        backend (str): Text extraction backend.
+
+    Returns:
+        results (dict): {stage: {'seconds': ..., 'n_pdfs': ..., 'us_per_pdf': ...}}
+    """
+
+    def result(seconds, n_pdfs):
+        return {"seconds": round(seconds, 4), "n_pdfs": n_pdfs, "us_per_pdf": round(1e6 * seconds / n_pdfs, 2)}
+
+    sample_paths = [os.path.join(pdf_dir, pdf_file) for pdf_file in file_list[:sample]]
+    results = {}
+
+    # text extraction is loop_pdf_scrape's cost, keep it out of the parse timing
+    pages = [extract_pages_text(path, backend) for path in sample_paths]
+    results["scrape_individual_pdf"] = result(
+        best_of(lambda: [scrape_individual_pdf(p, path, CONFIG.KEYS) for p, path in zip(pages, sample_paths)], repeat),
+        len(sample_paths),
+    )
+
+    pdf_data = []
+    for path in sample_paths:
+        with open(path, "rb") as f:
+            pdf_data.append(f.read())
+    results["count_dates_in_g_section"] = result(
+        best_of(lambda: [count_dates_in_g_section(data) for data in pdf_data], repeat), len(pdf_data)
+    )
+
+    start = time.perf_counter()
+    records = loop_pdf_scrape(file_list, pdf_dir, CONFIG.KEYS, workers=workers, backend=backend)
+    results["loop_pdf_scrape"] = result(time.perf_counter() - start, len(file_list))
+
+    results["cleaning_df"] = result(
+        best_of(lambda: cleaning_df(records, CONFIG.RENAME_COLS, CONFIG.TIME_COLS), repeat), len(records)
+    )
+
+    final_df = cleaning_df(records, CONFIG.RENAME_COLS, CONFIG.TIME_COLS)
+    prior_counts = prior_counts_from_scrape(final_df)
+    results["merge"] = result(best_of(lambda: merge_prior_counts(final_df, prior_counts), repeat), len(final_df))
+    return results
+
+
+def find_regressions(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Stages slower than (1 + threshold) times their baseline us_per_pdf. Counties or stages
+    missing from the baseline are not compared.
+
+    Example:
+        find_regressions({'Clark': {'merge': {'us_per_pdf': 3.0}}}, {'Clark': {'merge': {'us_per_pdf': 2.0}}}, 0.25)
+        >>> ['Clark merge: 3.0 us/PDF vs baseline 2.0 (+50%)']
+    """
+
+    regressions = []
+    for county, stages in results.items():
+        for stage, timing in stages.items():
+            base = baseline.get(county, {}).get(stage)
+            if not base or not base["us_per_pdf"]:
+                continue
+            change = timing["us_per_pdf"] / base["us_per_pdf"] - 1
+            if change > threshold:
+                regressions.append(
+                    f"{county} {stage}: {timing['us_per_pdf']} us/PDF vs baseline {base['us_per_pdf']} ({change:+.0%})"
+                )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks over a synthetic disclosure corpus")
+    parser.add_argument("--scale", default="1k", help="PDFs per county: 1k, 10k, 50k or a number")
+    parser.add_argument("--counties", nargs="+", default=list(LAYOUTS), choices=list(LAYOUTS))
+    parser.add_argument("--corpus-dir", default=os.path.join(".", "benchmarks", "corpus"))
+    parser.add_argument("--sample", type=int, default=200, help="PDFs for the per-PDF stages")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=CONFIG.SCRAPE_WORKERS)
+    parser.add_argument("--backend", default=CONFIG.PDF_BACKEND)
+    parser.add_argument("--output", default=os.path.join("benchmarks", "latest.json"))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    args = parser.parse_args(argv)
+
+    scale = str(scale_size(args.scale))
+    corpus = generate_corpus(args.corpus_dir, args.scale, args.counties)
+
+    results = {}
+    for county, file_list in corpus.items():
+        pdf_dir = os.path.join(args.corpus_dir, f"{county}_pdfs")
+        results[county] = bench_county(pdf_dir, file_list, args.sample, args.repeat, args.workers, args.backend)
+        for stage in STAGES:
+            timing = results[county][stage]
+            print(f"{county:>7} {stage:>25}: {timing['us_per_pdf']:12.1f} us/PDF {timing['seconds']:10.3f} s")
+
+    run = {
+        "scale": scale,
+        "backend": args.backend,
+        "workers": args.workers,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(run, f, indent=2)
+    print(f"Saved {args.output}")
+
+    # the baseline holds one run per scale
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baselines = json.load(f)
+
+    if args.update_baseline:
+        baselines[scale] = run
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2)
+        print(f"Saved baseline for {scale} PDFs per county to {args.baseline}")
+        return 0
+
+    if scale not in baselines:
+        print(f"No baseline for {scale} PDFs per county in {args.baseline}, run with --update-baseline")
+        return 0
+
+    regressions = find_regressions(results, baselines[scale]["results"], args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No stage more than {args.threshold:.0%} slower than the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+"""
+Generator of synthetic DCFS public disclosure PDFs for offline benchmarks, in the
+Clark, Washoe and Rural layouts: the header KEYS, "INFORMATION FOR RELEASE", lettered
+sections A-H and a section G listing dated prior CPS history. Files are named like each
+county's real PDFs and written to {directory}/{county}_pdfs, the folder shape the
+scrapers expect. Output is deterministic for a given seed.
+
+Run from the project root:
+    $ python -m benchmarks.synthetic_corpus [1k|10k|50k|n_pdfs] [directory]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import fitz  # PyMuPDF
+from typing import Dict, List
+
+SCALES = {"1k": 1000, "10k": 10000, "50k": 50000}
+
+LAYOUTS = {
+    "Clark": {
+        "agency_name": "Clark County Department of Family Services",
+        "agency_addresses": ["500 S. Grand Central Pkwy, 5th Floor, Las Vegas, NV 89155"],
+        "case_key": "Internal reference UNITY Case Number",
+        "locations": ["Las Vegas, Clark", "Henderson, Clark", "North Las Vegas, Clark"],
+        "agency": "CCDFS",
+        "file_name": "{y}-{m:02d}-{d:02d}_ID {case_number}.pdf",
+        "summary_lines": (2, 8),
+        "history_lines": (0, 12),
+    },
+    "Washoe": {
+        "agency_name": "Washoe County Human Services Agency",
+        "agency_addresses": ["350 South Center Street, Reno, NV 89502"],
+        "case_key": "Internal reference UNITY Case Number",
+        "locations": ["Reno, Washoe", "Sparks, Washoe"],
+        "agency": "WCHSA",
+        "file_name": "Public Disclosure {case_number} NF.pdf",
+        "summary_lines": (4, 14),
+        "history_lines": (0, 20),
+    },
+    "Rural": {
+        "agency_name": "Division of Child and Family Services",
+        "agency_addresses": [
+            "2533 N. Carson Street #100 Carson City, Nevada 89706",
+            "1010 Ruby Vista Drive, Suite 101 Elko, Nevada 89801",
+        ],
+        "case_key": "Internal reference UNITY Case Number or Report Number",
+        "locations": ["Elko, Elko", "Carson City, Carson City", "Fallon, Churchill", "Pahrump, Nye"],
+        "agency": "DCFS",
+        "file_name": "{case_number}_{m}.{d}.{yy}.pdf",
+        "summary_lines": (2, 6),
+        "history_lines": (0, 8),
+    },
+}
+
+SUMMARY_SENTENCES = [
+    "{agency} received a report that the child was transported to a local hospital.",
+    "The infant was found unresponsive after co-sleeping with a parent.",
+    "Law enforcement located marijuana and drug paraphernalia within reach of the child.",
+    "The child was found in the backyard pool and was not breathing.",
+    "The toddler ingested an unknown substance and was taken to the emergency room.",
+    "Medical staff reported injuries inconsistent with the explanation given by the caregiver.",
+    "The family was referred for services and a safety plan was put in place.",
+]
+
+CAUSES = [
+    "The cause of the fatality is under investigation.",
+    "The cause of the near fatality is under investigation.",
+    "Drowning.",
+    "Unsafe sleep environment.",
+    "Blunt force trauma.",
+    "Ingestion of a controlled substance.",
+]
+
+PAGE_1 = """Division of Child and Family Services MTL# 0401-12032021
+Family Programs Office: Statewide Policy Manual Section 0400
+CHILD WELFARE AGENCY PUBLIC DISCLOSURE FORM
+Date: {date}
+Agency Name: {agency_name}
+Agency Address: {agency_address}
+Date of written notification to the Division of Child and Family Services and Legislative Auditor: {notification_date}
+{case_key}: {case_number}
+Child Fatality Date of Death: {death_date}
+Near Fatality Date of Near Fatality: {near_fatality_date}
+INFORMATION FOR RELEASE
+A. Date of the notification to the child welfare agency of the death of a child:
+{incident_date}
+B. Location of child at the time of death or near fatality (city/county):
+{location}
+C. A summary of the report of abuse or neglect and a factual description of the contents of the report:
+{summary}
+D. The date of birth and gender of child:
+{dob}, {gender}
+E. The date that the child suffered the fatality or near fatality:
+{incident_date}
+F. The cause of the fatality or near fatality, if such information has been determined:
+{cause}
+G. Whether the agency had any contact with the child or a member of the child's family
+Date: 12/03/2021 FPO 0401A - Child Welfare Agency Public Disclosure Form Page 1 of 2"""
+
+PAGE_2 = """Division of Child and Family Services MTL# 0401-12032021
+Family Programs Office: Statewide Policy Manual Section 0400
+The information contained in this section is limited to contact(s) with the child who is the subject of this disclosure or
+a member of that child's family or household that is related to the fatality or near fatality incident.
+{agency} has the following prior CPS history for this child or member of the child's family:
+{history}
+H. Whether the agency which provides child welfare services, in response to the fatality
+{agency} has opened a case for investigation and family assessment.
+Date: 12/03/2021 FPO 0401A - Child Welfare Agency Public Disclosure Form Page 2 of 2"""
+
+
+def scale_size(scale) -> int:
+    # '10k' or a plain number of PDFs
+    return SCALES[scale] if scale in SCALES else int(scale)
+
+
+def random_date(rng: random.Random, years=(2017, 2024)) -> str:
+    return f"{rng.randint(1, 12)}/{rng.randint(1, 28)}/{rng.randint(*years)}"
+
+
+def disclosure_fields(county: str, i: int, seed: int = 0) -> Dict[str, object]:
+    """
+    Field values of the i-th synthetic disclosure of a county, the same for the same seed.
+    history_dates is the number of dated prior history lines written to section G.
+    """
+
+    layout = LAYOUTS[county]
+    rng = random.Random(f"{seed}-{county}-{i}")
+    agency = layout["agency"]
+    incident_date = random_date(rng)
+    fatality = rng.random() < 0.4
+    history_dates = rng.randint(*layout["history_lines"])
+
+    return {
+        "date": random_date(rng),
+        "agency_name": layout["agency_name"],
+        "agency_address": rng.choice(layout["agency_addresses"]),
+        "notification_date": random_date(rng),
+        "case_key": layout["case_key"],
+        "case_number": 1400000 + i,
+        "death_date": incident_date if fatality else "",
+        "near_fatality_date": "" if fatality else incident_date,
+        "incident_date": incident_date,
+        "location": rng.choice(layout["locations"]),
+        "summary": "\n".join(
+            rng.choice(SUMMARY_SENTENCES).format(agency=agency)
+            for _ in range(rng.randint(*layout["summary_lines"]))
+        ),
+        "dob": random_date(rng, years=(2006, 2023)),
+        "gender": rng.choice(["Male", "Female"]),
+        "cause": rng.choice(CAUSES),
+        "agency": agency,
+        "history": "\n".join(
+            f"{random_date(rng, years=(2010, 2022))}-A referral was received and was coded Information Only."
+            for _ in range(history_dates)
+        )
+        or "There is no prior CPS history.",
+        "history_dates": history_dates,
+        "file_date": (rng.randint(2017, 2024), rng.randint(1, 12), rng.randint(1, 28)),
+    }
+
+
+def file_name(county: str, fields: Dict[str, object]) -> str:
+    y, m, d = fields["file_date"]
+    return LAYOUTS[county]["file_name"].format(
+        y=y, m=m, d=d, yy=str(y)[2:], case_number=fields["case_number"]
+    )
+
+
+def write_disclosure_pdf(path: str, fields: Dict[str, object]) -> str:
+    """
+    Writes one two page disclosure PDF.
+    """
+
+    doc = fitz.open()
+    for template in (PAGE_1, PAGE_2):
+        page = doc.new_page()
+        page.insert_text((36, 36), template.format(**fields), fontsize=7)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def generate_county(directory: str, county: str, n_pdfs: int, seed: int = 0) -> List[str]:
+    """
+    Writes n_pdfs synthetic disclosures for a county into {directory}/{county}_pdfs.
+    A corpus.json in the folder records what was generated, so a corpus of the same size and
+    seed is reused instead of being written again. A folder with files but no corpus.json (e.g.
+    real downloaded PDFs) is never cleared, a ValueError is raised instead.
+
+    Args:
+        directory (str): Root of the corpus.
+        county (str): Clark, Washoe or Rural.
+        n_pdfs (int): Number of PDFs.
+        seed (int): Random seed.
+
+    Returns:
+        file_list (list): PDF file names, sorted.
+
+    Example:
+        generate_county('./benchmarks/corpus', 'Washoe', SCALES['1k'])
+    """
+
+    pdf_dir = os.path.join(directory, f"{county}_pdfs")
+    corpus_file = os.path.join(pdf_dir, "corpus.json")
+    if os.path.exists(corpus_file):
+        with open(corpus_file, "r") as f:
+            corpus = json.load(f)
+        # no file_list: an earlier run stopped half way through writing the PDFs
+        if corpus["n_pdfs"] == n_pdfs and corpus["seed"] == seed and "file_list" in corpus:
+            return corpus["file_list"]
+    elif os.path.isdir(pdf_dir) and os.listdir(pdf_dir):
+        # e.g. ./output_files/Clark_pdfs, only a folder this module wrote is ever cleared
+        raise ValueError(
+            f"{pdf_dir} holds files but no corpus.json, refusing to replace them with a synthetic corpus"
+        )
+
+    os.makedirs(pdf_dir, exist_ok=True)
+    for old_file in os.listdir(pdf_dir):
+        os.remove(os.path.join(pdf_dir, old_file))
+    # claims the folder before the first PDF lands, so a rerun after a crash may clear it
+    with open(corpus_file, "w") as f:
+        json.dump({"county": county, "n_pdfs": n_pdfs, "seed": seed}, f)
+
+    start_time = time.time()
+    history_dates = {}
+    for i in range(n_pdfs):
+        fields = disclosure_fields(county, i, seed)
+        # case numbers are unique, so are the file names
+        name = file_name(county, fields)
+        write_disclosure_pdf(os.path.join(pdf_dir, name), fields)
+        history_dates[name] = fields["history_dates"]
+
+    corpus = {
+        "county": county,
+        "n_pdfs": n_pdfs,
+        "seed": seed,
+        "file_list": sorted(history_dates),
+        "history_dates": history_dates,
+    }
+    with open(corpus_file, "w") as f:
+        json.dump(corpus, f)
+    print(f"{county}: wrote {n_pdfs} PDFs to {pdf_dir} in {round(time.time() - start_time, 2)} seconds")
+    return corpus["file_list"]
+
+
+def generate_corpus(directory: str, scale="1k", counties=tuple(LAYOUTS), seed: int = 0) -> Dict[str, List[str]]:
+    """
+    {county: file_list} of a corpus with scale PDFs per county, see generate_county.
+    """
+
+    return {county: generate_county(directory, county, scale_size(scale), seed) for county in counties}
+
+
+if __name__ == "__main__":
+    generate_corpus(
+        sys.argv[2] if len(sys.argv) > 2 else os.path.join(".", "benchmarks", "corpus"),
+        sys.argv[1] if len(sys.argv) > 1 else "1k",
+    )
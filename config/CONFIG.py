@@ -12,6 +12,62 @@ FULL_DATA_PATH = os.getenv("FULL_DATA_PATH")# Full config for main.py
 SCRAPE_YEARS = ['2021', '2022', '2023']
 URL_based_run=False
 
+# how folder runs gather a county's PDFs: "copy", "link" (hardlink/symlink, copies only as a
+# fallback) or "manifest" (nothing placed, PDFs are read in their original year folders)
+INGEST_MODE = "link"
+
+# number of PDFs downloaded at once, each worker keeps a pooled keep-alive connection
+DOWNLOAD_WORKERS = 16
+DOWNLOAD_TIMEOUT = 60  # seconds
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # bytes held in memory per download
+DOWNLOAD_RETRIES = 3  # attempts after a failed request or a dropped transfer (resumed with HTTP Range)
+
+# processes used to extract PDF text, set to 1 to scrape serially when debugging
+SCRAPE_WORKERS = os.cpu_count()
+SCRAPE_CHUNKSIZE = 8  # PDFs handed to a worker at a time
+
+# PDF text extraction backend: "pdfplumber" (fidelity) or "pymupdf" (throughput)
+PDF_BACKEND = "pdfplumber"
+
+# URL runs download, extract and write as overlapping stages instead of one after another,
+# each stage holds at most STREAM_QUEUE_SIZE PDFs; scraped records are spooled to disk, then
+# cleaned and written STREAM_CHUNK_SIZE at a time
+STREAMING_RUN = False
+STREAM_QUEUE_SIZE = 32
+STREAM_CHUNK_SIZE = 500
+
+# lettered section whose start, once sections A-G and every key are captured, ends the scrape,
+# pages after it are never extracted
+STOP_SECTION = "H"
+
+# extracted page text is cached by PDF content hash so unchanged PDFs aren't parsed again
+TEXT_CACHE_ENABLED = True
+TEXT_CACHE_DIR = os.path.join(".", ".cache", "pdf_text")
+TEXT_CACHE_MAX_BYTES = 512 * 1024 * 1024  # least recently used entries evicted past this
+TEXT_CACHE_EVICT_TO = 0.9  # eviction frees down to this fraction of TEXT_CACHE_MAX_BYTES
+
+# typed copy of every output csv: "parquet", "feather" or None for csv only
+OUTPUT_FORMAT = "parquet"
+
+# only scrape PDFs added or changed since the last run and upsert them into child_fatality_{county},
+# turn off for a full rebuild (e.g. after changing how fields are parsed)
+INCREMENTAL_REFRESH = False
+
+# also write {county}_pdfs_prior_counts.csv, only needed for debugging the prior history merge
+WRITE_INTERMEDIATE_CSVS = False
+
+# add agency_zip/agency_city columns looked up from the ZIP in the agency address
+ENRICH_AGENCY_CITY = False
+
+# keep a full text index of incident summaries and causes up to date after every run,
+# query it with python -m scripts.search_index query "..."
+BUILD_SEARCH_INDEX = True
+SEARCH_INDEX_PATH = os.path.join(".", "output_files", "search_index.json")
+
+# per county/stage/PDF timings of the last run, also served by the Flask service on /metrics
+METRICS_REPORT_PATH = os.path.join(".", "output_files", "run_report.json")
+METRICS_SLOW_LOG = 20  # most expensive PDFs kept in the report
+
 ######
 
 
@@ -51,6 +107,12 @@ KEYS = [
     "Location of child at the time of death or near fatality (city/county)",
 ]
 
+# keys a form only fills one of, the scrape can stop early once any of them has a value
+ALTERNATIVE_KEYS = [
+    ("Internal reference UNITY Case Number", "Internal reference UNITY Case Number or Report Number"),
+    ("Child Fatality Date of Death", "Near Fatality Date of Near Fatality"),
+]
+
 # rename columns
 RENAME_COLS = {
     "date_of_written_notification_to_the_division_of_child_and_family_services_and_legislative_auditor": "date_of_written_notification",
@@ -63,6 +125,19 @@ RENAME_COLS = {
     "the_cause_of_the_fatality_or_near_fatality,_if_such_information_has_been_determined": "cause_of_incident_if_determined",
 }
 
+# formats tried in order when parsing TIME_COLS and DOB, typed-in PDFs aren't consistent
+DATE_FORMATS = [
+    "%m/%d/%Y",
+    "%m/%d/%y",
+    "%m-%d-%Y",
+    "%m-%d-%y",
+    "%m.%d.%Y",
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%b. %d, %Y",
+    "%Y-%m-%d",
+]
+
 # renamed time columns
 TIME_COLS = [
     "date",
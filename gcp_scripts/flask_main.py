@@ -1,32 +1,129 @@
 import os
-import time
-from flask import Flask
+import sys
+import hashlib
+import pandas as pd
+from flask import Flask, Response, jsonify, request, url_for
+
+# project root, so config/scripts/main import when run as gcp_scripts/flask_main.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import config.CONFIG as CONFIG
-from scripts.child_fatality_scrape import run_pdf_scraping
+from main import main as run_main
+from scripts.jobs import JobManager
+from scripts.dataset_index import DatasetStore
+from scripts.metrics import METRICS
 
 # Create a Flask app
 app = Flask(__name__)
 
+# merged statewide data held in memory with its indexes, built on first read
+store = DatasetStore(os.path.join(".", "output_files"))
 
-@app.route("/")
-def main():
-    # Start the timer
-    start_time = time.time()
-
-    for url in CONFIG.URL_LIST:
-        print(f"Getting info from: {url}")
-        run_pdf_scraping(
-            url=url,
-            keys=CONFIG.KEYS,
-            rename_cols=CONFIG.RENAME_COLS,
-            time_cols=CONFIG.TIME_COLS,
+MAX_PAGE_SIZE = 500
+
+
+def run_and_reload(**kwargs):
+    result = run_main(**kwargs)
+    # swap the read index over to the data this run just landed
+    store.refresh()
+    return result
+
+
+# one scrape at a time runs in the background, requests only enqueue and report.
+# On Cloud Run the service needs CPU allocated outside of requests for the worker to progress.
+jobs = JobManager(run_and_reload)
+
+
+def job_response(job, created):
+    body = {**job, "status_url": url_for("job_status", job_id=job["id"], _external=True)}
+    if not created:
+        # a scrape was already queued or running, the trigger joins it
+        body["deduplicated"] = True
+    response = jsonify(body)
+    response.status_code = 202
+    response.headers["Location"] = body["status_url"]
+    return response
+
+
+@app.route("/jobs", methods=["POST"])
+def create_job():
+    # {"URL_based_run": true} overrides CONFIG.URL_based_run for this job
+    options = request.get_json(silent=True) or {}
+    url_based_run = options.get("URL_based_run", CONFIG.URL_based_run)
+    if not isinstance(url_based_run, bool):
+        # "false" or 0 would otherwise quietly pick a different data source
+        return jsonify({"error": "URL_based_run must be a JSON boolean"}), 400
+    job, created = jobs.submit(URL_based_run=url_based_run)
+    return job_response(job, created)
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": f"unknown job {job_id}"}), 404
+    return jsonify(job)
+
+
+@app.route("/records", methods=["GET"])
+def records():
+    # ?region=Clark&start=2023-01-01&end=2023-06-30&case_number=1469166&page=1&page_size=50
+    index = store.current()
+    if jobs.active_id is None:
+        # picks up output written outside the service, never a run that is still writing
+        index = store.refresh()
+
+    args = request.args
+    try:
+        start = pd.Timestamp(args["start"]) if "start" in args else None
+        end = pd.Timestamp(args["end"]) if "end" in args else None
+        page = int(args.get("page", 1))
+        page_size = int(args.get("page_size", 50))
+        if page < 1 or not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page must be >= 1 and page_size between 1 and {MAX_PAGE_SIZE}")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # same data version and same query, same response
+    query = "&".join(f"{key}={value}" for key, value in sorted(args.items(multi=True)))
+    etag = f"{index.version}-{hashlib.sha1(query.encode()).hexdigest()[:16]}"
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    response = jsonify(
+        index.query(
+            region=args.get("region"),
+            start=start,
+            end=end,
+            case_number=args.get("case_number"),
+            page=page,
+            page_size=page_size,
         )
+    )
+    response.set_etag(etag)
+    return response
 
-    # Calculate the elapsed time
-    elapsed_time = time.time() - start_time
-    print(f"Execution time for main.py: {round(elapsed_time,2)} seconds")
 
-    return "Done", 200
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    # Prometheus scrape target: counters and timers of the running or last finished run
+    return Response(METRICS.to_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/metrics/report", methods=["GET"])
+def metrics_report():
+    # the same numbers as the JSON run report, stages per county and the slowest PDFs
+    return jsonify(METRICS.report())
+
+
+# Cloud Scheduler hits / with a GET, it only enqueues now so the HTTP timeout never caps a run.
+# The service has no FULL_DATA_PATH, so this route always scrapes CONFIG.URL_LIST like it always has
+@app.route("/", methods=["GET", "POST"])
+def main():
+    job, created = jobs.submit(URL_based_run=True)
+    return job_response(job, created)
 
 
 if __name__ == "__main__":
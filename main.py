@@ -1,52 +1,149 @@
 import os
 import time
+import traceback
+import multiprocessing
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import config.CONFIG as CONFIG
 from scripts.child_fatality_scrape import run_pdf_scraping_URL, run_pdf_scraping_FOLDER
 from scripts.prior_history import run_and_merge_prior_history_counts
+from scripts.streaming import run_pdf_streaming_URL
+from scripts.search_index import update_search_index
+from scripts.metrics import METRICS
 from dotenv import load_dotenv
 
 
-# run for Clark, Washoe, and Rural Nevada
-def main(URL_based_run=CONFIG.URL_based_run):
-    # Start the timer
-    start_time = time.time()
-
+def county_jobs(URL_based_run=CONFIG.URL_based_run):
+    # {county: (run function, its source argument)}
     if URL_based_run:
-        print("Running main from URLs")
-        for url in CONFIG.URL_LIST:
-            print(f"Getting info from: {url}")
-            run_pdf_scraping_URL(
-                url=url,
+        run_func = run_pdf_streaming_URL if CONFIG.STREAMING_RUN else run_pdf_scraping_URL
+        return {url.split("/")[-2]: (run_func, {"url": url}) for url in CONFIG.URL_LIST}
+    return {
+        os.path.basename(os.path.normpath(county_folder)): (run_pdf_scraping_FOLDER, {"county_folder": county_folder})
+        for county_folder in CONFIG.FULL_PATH_COUNTIES
+    }
+
+
+def run_county(county, run_func, source, executor=None, progress=None):
+    # error boundary for one county, a failure is recorded instead of aborting the other counties
+    start_time = time.time()
+    print(f"Getting info from: {next(iter(source.values()))}")
+    if progress is not None:
+        progress(county, {"status": "running"})
+    try:
+        with METRICS.stage(county, "total"):
+            final_df = run_func(
+                **source,
                 keys=CONFIG.KEYS,
                 rename_cols=CONFIG.RENAME_COLS,
                 time_cols=CONFIG.TIME_COLS,
+                executor=executor,
             )
-
+    except Exception as e:
+        traceback.print_exc()
+        status = {"status": "failed", "error": repr(e)}
+        final_df = None
     else:
-        print("Running main from FULL_DATA_PATH")
+        status = {"status": "ok", "rows": len(final_df)}
+    status["seconds"] = round(time.time() - start_time, 2)
+    if progress is not None:
+        progress(county, status)
+    return final_df, status
 
-        for county_folder in CONFIG.FULL_PATH_COUNTIES:
-            print(county_folder)
-            print(f"Getting info from: {county_folder}")
 
-            run_pdf_scraping_FOLDER(
-                county_folder=county_folder,
-                keys=CONFIG.KEYS,
-                rename_cols=CONFIG.RENAME_COLS,
-                time_cols=CONFIG.TIME_COLS,
-            )
+# run for Clark, Washoe, and Rural Nevada
+def main(URL_based_run=CONFIG.URL_based_run, progress=None):
+    # progress(county, status) is called as each county starts and finishes, e.g. by the job API
+    # Start the timer, and a fresh set of run metrics
+    start_time = time.time()
+    METRICS.reset()
 
+    print(f"Running main from {'URLs' if URL_based_run else 'FULL_DATA_PATH'}")
+    jobs = county_jobs(URL_based_run)
+    if not jobs:
+        # nothing to run is a configuration mistake, not a run where every county failed
+        source = "CONFIG.URL_LIST" if URL_based_run else "CONFIG.FULL_PATH_COUNTIES"
+        raise ValueError(f"No counties configured, {source} is empty")
 
+    # cleaned DataFrame per county, merged with prior history counts without a csv round trip
+    frames, statuses = {}, {}
 
-    # Runs prior history count extraction and merges with csvs from run_pdf_scraping
-    run_and_merge_prior_history_counts(directory="./output_files/")
+    # every county is scheduled at once over one shared pool of PDF workers, so small counties
+    # finish while Clark is still extracting. Workers are spawned rather than forked since the
+    # county threads are already running when the pool starts them.
+    pdf_pool = None
+    if CONFIG.SCRAPE_WORKERS and CONFIG.SCRAPE_WORKERS > 1:
+        pdf_pool = ProcessPoolExecutor(
+            max_workers=CONFIG.SCRAPE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    try:
+        with ThreadPoolExecutor(max_workers=max(len(jobs), 1)) as county_pool:
+            futures = {
+                county_pool.submit(run_county, county, run_func, source, pdf_pool, progress): county
+                for county, (run_func, source) in jobs.items()
+            }
+            for future in as_completed(futures):
+                county = futures[future]
+                final_df, statuses[county] = future.result()
+                print(f"{county}: {statuses[county]}")
+                if final_df is not None:
+                    frames[county] = final_df
+    finally:
+        if pdf_pool is not None:
+            pdf_pool.shutdown()
+
+    # Runs prior history count extraction and merges with the frames from run_pdf_scraping
+    if progress is not None:
+        progress("prior_history", {"status": "running"})
+    try:
+        # timed inside as each county's prior_history stage
+        run_and_merge_prior_history_counts(directory="./output_files/", frames=frames)
+        prior_history_status = {"status": "ok"}
+    except Exception as e:
+        traceback.print_exc()
+        prior_history_status = {"status": "failed", "error": repr(e)}
+
+    # folds the cleaned frames into the full text index, only new or edited disclosures are reindexed
+    search_index_status = {"status": "skipped"}
+    if CONFIG.BUILD_SEARCH_INDEX and frames:
+        if progress is not None:
+            progress("search_index", {"status": "running"})
+        try:
+            with METRICS.stage("statewide", "search_index"):
+                index = update_search_index(frames)
+            search_index_status = {"status": "ok", "documents": len(index)}
+        except Exception as e:
+            traceback.print_exc()
+            search_index_status = {"status": "failed", "error": repr(e)}
 
     # Calculate the elapsed time
     elapsed_time = time.time() - start_time
     print(f"Execution time for main.py: {round(elapsed_time,2)} seconds")
 
-    return "Done", 200
+    # per stage/PDF timings, e.g. the slowest PDFs, in a JSON run report (also on the service's /metrics)
+    try:
+        os.makedirs(os.path.dirname(CONFIG.METRICS_REPORT_PATH), exist_ok=True)
+        report = METRICS.write_report(CONFIG.METRICS_REPORT_PATH)
+        print(f"Saved run report to {CONFIG.METRICS_REPORT_PATH}")
+    except OSError:
+        traceback.print_exc()
+        report = METRICS.report()
+
+    result = {
+        "counties": {county: statuses[county] for county in jobs},
+        "prior_history": prior_history_status,
+        "search_index": search_index_status,
+        "stages": report["stages"],
+        "seconds": round(elapsed_time, 2),
+    }
+
+    # 200 everything ran, 207 some counties failed, 500 nothing usable was produced
+    failed = [county for county, status in statuses.items() if status["status"] != "ok"]
+    if not failed and prior_history_status["status"] == "ok" and search_index_status["status"] != "failed":
+        return result, 200
+    if len(failed) < len(jobs):
+        return result, 207
+    return result, 500
 
 
 if __name__ == "__main__":
@@ -0,0 +1,129 @@
+import os
+import sys
+import glob
+import time
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+import config.CONFIG as CONFIG
+from .child_fatality_scrape import list_files, scrape_text
+from .pdf_text import extract_pages_text
+
+
+def scrape_with_backend(
+    pdf_paths: List[str], keys: List[str], backend: str
+) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Scrapes every PDF with one extraction backend and times extraction and parsing separately.
+
+    Args:
+        pdf_paths (list): Full paths of the PDFs.
+        keys (list): List of keys to initialize the dictionary with.
+        backend (str): 'pdfplumber' or 'pymupdf'.
+
+    Returns:
+        df (DataFrame): One row per PDF, indexed by original_pdf.
+        timings (dict): Seconds spent extracting text and parsing it.
+    """
+
+    timings = {"extract_seconds": 0.0, "parse_seconds": 0.0}
+    records = []
+    for pdf_path in pdf_paths:
+        start = time.perf_counter()
+        pages_text = extract_pages_text(pdf_path, backend)
+        timings["extract_seconds"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        records.append(scrape_text(pages_text, pdf_path, keys))
+        timings["parse_seconds"] += time.perf_counter() - start
+
+    df = pd.DataFrame.from_records(records).set_index("original_pdf") if records else pd.DataFrame()
+    return df, timings
+
+
+def compare_backends(
+    pdf_paths: List[str],
+    keys: List[str] = CONFIG.KEYS,
+    backends: Tuple[str, str] = ("pdfplumber", "pymupdf"),
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Runs two extraction backends over the same PDFs and diffs the scraped records field by field.
+
+    Args:
+        pdf_paths (list): Full paths of the PDFs.
+        keys (list): List of keys to initialize the dictionary with.
+        backends (tuple): The two backends to compare, the first is the reference.
+
+    Returns:
+        diffs (DataFrame): One row per differing field: original_pdf, field and each backend's value.
+        timings (DataFrame): Per backend extract/parse/total seconds and ms per PDF.
+
+    Example:
+        diffs, timings = compare_backends(list_files('./output_files/Clark_pdfs', append_base_path=True))
+    """
+
+    frames, timing_rows = {}, []
+    for backend in backends:
+        frames[backend], timings = scrape_with_backend(pdf_paths, keys, backend)
+        total = timings["extract_seconds"] + timings["parse_seconds"]
+        timing_rows.append(
+            {
+                "backend": backend,
+                **timings,
+                "total_seconds": total,
+                "ms_per_pdf": 1000 * total / max(len(pdf_paths), 1),
+            }
+        )
+
+    reference, candidate = (frames[backend] for backend in backends)
+    diff_rows = []
+    for original_pdf in reference.index:
+        for field in reference.columns:
+            left = reference.at[original_pdf, field]
+            right = candidate.at[original_pdf, field]
+            if pd.isna(left) and pd.isna(right):
+                continue
+            if left != right:
+                diff_rows.append(
+                    {
+                        "original_pdf": original_pdf,
+                        "field": field,
+                        backends[0]: left,
+                        backends[1]: right,
+                    }
+                )
+
+    diffs = pd.DataFrame(diff_rows, columns=["original_pdf", "field", *backends])
+    return diffs, pd.DataFrame(timing_rows)
+
+
+def parity_pdf_paths(folders: Optional[List[str]] = None) -> List[str]:
+    """
+    PDFs to compare: every PDF in the given folders, or in each county's
+    ./output_files/{county}_pdfs folder when none are given.
+
+    Example:
+        parity_pdf_paths(['./output_files/Clark_pdfs'])
+    """
+
+    folders = folders or sorted(glob.glob(os.path.join(".", "output_files", "*_pdfs")))
+    return [
+        path
+        for folder in folders
+        for path in list_files(folder, append_base_path=True)
+        if path.lower().endswith(".pdf")
+    ]
+
+
+if __name__ == "__main__":
+    # python -m scripts.backend_parity [./output_files/Clark_pdfs ./output_files/Rural_pdfs ...]
+    pdf_paths = parity_pdf_paths(sys.argv[1:])
+    if not pdf_paths:
+        # comparing nothing would report parity
+        sys.exit(f"No PDFs found in {' '.join(sys.argv[1:]) or './output_files/*_pdfs'}")
+
+    diffs, timings = compare_backends(pdf_paths)
+    print(timings.to_string(index=False))
+    print(f"{diffs['original_pdf'].nunique()} of {len(pdf_paths)} PDFs differ in {len(diffs)} fields")
+    if not diffs.empty:
+        print(diffs.to_string(index=False, max_colwidth=60))
+        diffs.to_csv(os.path.join(".", "output_files", "backend_parity_diffs.csv"), index=False)
@@ -0,0 +1,61 @@
+import os
+from typing import Dict, List, Tuple
+from .download_manifest import load_manifest, save_manifest
+
+
+def build_state_path(csv_path: str) -> str:
+    """
+    Path of the build state sidecar that records which PDFs a county dataset was built from.
+
+    Args:
+        csv_path (str): County dataset, e.g. ./output_files/child_fatality_Clark.csv
+
+    Returns:
+        path (str): Sidecar path, e.g. ./output_files/child_fatality_Clark_build_state.json
+
+    Example:
+        build_state_path('./output_files/child_fatality_Clark.csv')
+        >>> './output_files/child_fatality_Clark_build_state.json'
+    """
+
+    return f"{os.path.splitext(csv_path)[0]}_build_state.json"
+
+
+def load_build_state(path: str) -> Dict[str, str]:
+    """
+    Loads the {pdf_name: sha256} the dataset was last built from, empty if it was never built.
+    """
+
+    return load_manifest(path)
+
+
+def save_build_state(pdf_hashes: Dict[str, str], path: str) -> None:
+    """
+    Saves the {pdf_name: sha256} the dataset was just built from, written atomically.
+    """
+
+    save_manifest(pdf_hashes, path)
+
+
+def diff_build_state(
+    pdf_hashes: Dict[str, str], state: Dict[str, str]
+) -> Tuple[List[str], List[str]]:
+    """
+    Compares the current PDFs against the ones the dataset was built from.
+
+    Args:
+        pdf_hashes (dict): {pdf_name: sha256} of the PDFs on disk now.
+        state (dict): {pdf_name: sha256} of the last build.
+
+    Returns:
+        changed (list): PDFs that are new or whose content changed, in pdf_hashes order.
+        removed (list): PDFs in the last build that are gone now.
+
+    Example:
+        diff_build_state({'a.pdf': '1', 'b.pdf': '9'}, {'b.pdf': '2', 'c.pdf': '3'})
+        >>> (['a.pdf', 'b.pdf'], ['c.pdf'])
+    """
+
+    changed = [pdf for pdf, sha256 in pdf_hashes.items() if state.get(pdf) != sha256]
+    removed = [pdf for pdf in state if pdf not in pdf_hashes]
+    return changed, removed
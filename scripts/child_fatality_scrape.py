@@ -1,75 +1,375 @@
 import os
 import re
 import time
+from datetime import datetime
 import pandas as pd
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import pdfplumber
 import zipcodes
 import shutil
-from typing import List, Dict, Optional
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from itertools import repeat
+from contextlib import closing
+from urllib.parse import urlsplit
+from functools import lru_cache
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 import config.CONFIG as CONFIG
+from .download_manifest import (
+    manifest_path,
+    load_manifest,
+    save_manifest,
+    conditional_headers,
+    sha256_file,
+)
+from .pdf_text import count_dates_in_g_text, extract_pages_text, iter_pages_text, extractor_version
+from .text_cache import TextCache, get_text_cache
+from .columnar import read_dataset, write_dataset
+from .build_state import build_state_path, load_build_state, save_build_state, diff_build_state
+from .metrics import METRICS
+
+
+def make_session(pool_size: int = CONFIG.DOWNLOAD_WORKERS) -> requests.Session:
+    """
+    Creates a requests Session whose connection pool is large enough for every download worker
+    to keep its own keep-alive connection open to the DCFS server.
+
+    Args:
+        pool_size (int): Number of pooled connections per host.
+
+    Returns:
+        session (requests.Session): Session with a sized HTTPAdapter mounted for http & https.
 
+    Example:
+        session = make_session(pool_size=8)
+        session.get('https://www.some_url.com')
+    """
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
 
-def download_all_pdfs(url: str) -> str:
+
+def find_pdf_links(url: str, session: requests.Session) -> List[str]:
     """
-    Download all PDFs from a specified URL and save to a local directory.
+    Finds every county PDF link on a DCFS child fatality page.
 
     Args:
         url (str): URL to scrape for PDF links.
+        session (requests.Session): Session used to fetch the page.
 
     Returns:
-        save_dir (str): Directory where PDFs are saved.
+        hrefs (list): Full URLs of every PDF found on the page, in page order.
 
     Example:
         url = 'https://www.some_url.com'
-        download_all_pdfs(url)
+        find_pdf_links(url, make_session())
     """
 
     # Get the webpage content
-    response = requests.get(url)
+    response = session.get(url, timeout=CONFIG.DOWNLOAD_TIMEOUT)
     soup = BeautifulSoup(response.text, "html.parser")
 
     # Find all links in the webpage
     links = soup.find_all("a")
 
-    # directory pdfs will be saved
-    county = url.split("/")[-2]
-    save_dir = os.path.join(
-        ".", "output_files", f"{county}_pdfs"
-    )  # use os.path.join for OS compatibility
-
     # UNIQUE: this uploadedFiles path is required, why?
     # Due to the level of inconsistency in the pdf formats between counties
     # Clark has consistency: 2023-01-17_ID_1469166.pdf, 2023-01-22_ID_1506602.pdf, etc...
     # Washoe & Rural are random: 1482308_child_B.pdf, Disclosure_Form_Final_01_04_2019.pdf
+    county = url.split("/")[-2]
     upload_href = (
         f"/uploadedFiles/dcfsnvgov/content/Programs/CWS/CPS/ChildFatalities/{county}"
     )
 
-    # Download each PDF
+    # append needed site link since pdf hrefs don't come naturally with it,
+    # taken from the page so a mirror or local test server works too
+    page = urlsplit(url)
+    prefix_for_href = f"{page.scheme}://{page.netloc}/"
+
+    hrefs = []
     for link in links:
         href = link.get("href")
         if href and upload_href in href and href.endswith(".pdf"):
-            # append needed dcfs link since pdf hrefs don't come naturally with it
-            prefix_for_href = "https://dcfs.nv.gov/"
-            href = prefix_for_href + href
+            hrefs.append(prefix_for_href + href)
+
+    return hrefs
+
+
+def stream_to_part(
+    response: requests.Response, part_path: str, offset: int, chunk_size: int
+) -> str:
+    """
+    Streams a response body into a .part file chunk by chunk, appending after offset bytes
+    when the server answered a Range request. Memory use is bounded by chunk_size.
 
-            # Get the PDF content
-            pdf_response = requests.get(href)
+    Args:
+        response (requests.Response): Streaming (stream=True) response, 200 or 206.
+        part_path (str): Temp file the body is written to.
+        offset (int): Bytes already on disk from an interrupted transfer.
+        chunk_size (int): Bytes read from the socket per chunk.
 
-            # Get the PDF name from the URL
-            pdf_name = os.path.basename(href)
+    Returns:
+        sha256 (str): Hex digest of the complete file (existing bytes + streamed bytes).
+    """
 
-            # Create the directory if it doesn't exist
-            if not os.path.exists(save_dir):
-                print(f"Making Directory: {save_dir.split('/')[-1]}")
-                os.makedirs(save_dir)
+    digest = hashlib.sha256()
+    if response.status_code == 206 and offset:
+        # re-hash the bytes we kept from the interrupted transfer
+        with open(part_path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        mode = "ab"
+    else:
+        # a 200 means the server sent the whole file again, start the part file over
+        mode = "wb"
+
+    with open(part_path, mode) as f:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if chunk:
+                f.write(chunk)
+                digest.update(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+
+    return digest.hexdigest()
+
+
+def download_pdf(
+    href: str,
+    save_dir: str,
+    session: requests.Session,
+    entry: Optional[Dict] = None,
+    chunk_size: int = CONFIG.DOWNLOAD_CHUNK_SIZE,
+    retries: int = CONFIG.DOWNLOAD_RETRIES,
+) -> Tuple[str, Dict]:
+    """
+    Downloads a single PDF into save_dir using a pooled session connection.
+    If a previous manifest entry is given and the local file still exists, a conditional GET
+    is sent so an unchanged PDF is neither transferred nor rewritten.
 
-            # Save the PDFs to the directory
-            with open(os.path.join(save_dir, pdf_name), "wb") as f:
-                f.write(pdf_response.content)
+    The body is streamed into {pdf_name}.part and atomically renamed onto the final name once
+    complete, so a crash never leaves a truncated PDF behind. A leftover .part file is resumed
+    with a Range request (guarded by If-Range), both on retry and on the next run. A 416 answer
+    means the .part file is already complete (it is renamed into place) or doesn't fit the server's
+    file (it is deleted and the PDF fetched again).
+
+    Args:
+        href (str): Full URL of the PDF.
+        save_dir (str): Directory the PDF is written to.
+        session (requests.Session): Shared session so the TCP/TLS connection is reused.
+        entry (dict): Manifest entry from the previous download of this PDF, or None.
+        chunk_size (int): Bytes streamed per chunk, bounds memory per download.
+        retries (int): Extra attempts after a failed request or a dropped transfer, each resuming
+            where it stopped.
+
+    Returns:
+        status (str): 'new', 'changed', 'unchanged' (downloaded, same bytes) or 'skipped' (304).
+        entry (dict): Updated manifest entry for the PDF.
+
+    Example:
+        download_pdf('https://www.some_url.com/file.pdf', './output_files/Clark_pdfs', make_session())
+    """
+
+    # Get the PDF name from the URL
+    pdf_name = os.path.basename(href)
+    pdf_path = os.path.join(save_dir, pdf_name)
+    part_path = f"{pdf_path}.part"
+    part_meta_path = f"{part_path}.json"
+
+    # only ask the server for "changes since" when we still have the old copy
+    if not os.path.exists(pdf_path):
+        entry = None
+
+    attempt = 0
+    while True:
+        headers = conditional_headers(entry)
+
+        # resume an interrupted transfer, If-Range makes the server send the whole
+        # file instead if it changed since the partial bytes were written
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        part_meta = load_manifest(part_meta_path) if offset else {}
+        validator = part_meta.get("etag") or part_meta.get("last_modified")
+        if offset and validator:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+
+        # Get the PDF content, a refused connection or a timeout is retried like a dropped transfer
+        try:
+            pdf_response = session.get(
+                href, headers=headers, stream=True, timeout=CONFIG.DOWNLOAD_TIMEOUT
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+            attempt += 1
+            print(f"Retrying {pdf_name} after failed request")
+            continue
+
+        try:
+            if pdf_response.status_code == 304:
+                for stale in (part_path, part_meta_path):
+                    if os.path.exists(stale):
+                        os.remove(stale)
+                return "skipped", entry
+
+            if pdf_response.status_code == 416 and "Range" in headers:
+                # nothing left past the .part file's size, e.g. a crash between its fsync and the rename
+                total = pdf_response.headers.get("Content-Range", "").rpartition("/")[2]
+                if total.isdigit() and int(total) == offset:
+                    etag, last_modified = part_meta.get("etag"), part_meta.get("last_modified")
+                    sha256 = sha256_file(part_path)
+                else:
+                    # the .part file doesn't fit the server's file, throw it away and fetch it whole
+                    for stale in (part_path, part_meta_path):
+                        os.remove(stale)
+                    print(f"Restarting {pdf_name}, partial download doesn't match the server")
+                    continue
+            else:
+                pdf_response.raise_for_status()
+
+                etag = pdf_response.headers.get("ETag") or part_meta.get("etag")
+                last_modified = pdf_response.headers.get("Last-Modified") or part_meta.get(
+                    "last_modified"
+                )
+                if pdf_response.status_code != 206:
+                    save_manifest({"etag": etag, "last_modified": last_modified}, part_meta_path)
+
+                try:
+                    sha256 = stream_to_part(pdf_response, part_path, offset, chunk_size)
+                except requests.RequestException:
+                    # keep the .part file, the next attempt picks up from its size
+                    if attempt == retries:
+                        raise
+                    attempt += 1
+                    print(f"Resuming {pdf_name} after interrupted transfer")
+                    continue
+        finally:
+            pdf_response.close()
+
+        new_entry = {
+            "url": href,
+            "etag": etag,
+            "last_modified": last_modified,
+            "size": os.path.getsize(part_path),
+            "sha256": sha256,
+        }
+        if os.path.exists(part_meta_path):
+            os.remove(part_meta_path)
+
+        # server ignored the conditional headers but the bytes are the same, leave the file alone
+        if entry and entry.get("sha256") == new_entry["sha256"]:
+            os.remove(part_path)
+            return "unchanged", new_entry
+
+        # Save the PDF to the directory, the rename is atomic on the same filesystem
+        os.replace(part_path, pdf_path)
+
+        return ("changed" if entry else "new"), new_entry
+
+
+def timed_download_pdf(county: str, href: str, save_dir: str, session: requests.Session, entry: Optional[Dict] = None):
+    """
+    download_pdf that records the PDF's download time, outcome and transferred bytes in METRICS.
+    """
+
+    pdf_name = os.path.basename(href)
+    start = time.perf_counter()
+    try:
+        status, new_entry = download_pdf(href, save_dir, session, entry)
+    except requests.RequestException:
+        METRICS.record_download(county, pdf_name, "failed", time.perf_counter() - start)
+        raise
+    size = new_entry["size"] if status != "skipped" else 0
+    METRICS.record_download(county, pdf_name, status, time.perf_counter() - start, size)
+    return status, new_entry
+
+
+def download_all_pdfs(
+    url: str, max_workers: int = CONFIG.DOWNLOAD_WORKERS, use_manifest: bool = True
+) -> str:
+    """
+    Download all PDFs from a specified URL and save to a local directory.
+    PDFs are fetched concurrently by max_workers threads sharing one connection pool.
+    A manifest (URL, ETag, Last-Modified, size, SHA-256 per PDF) is kept next to the
+    directory so later runs only transfer PDFs the server reports as changed.
+
+    Args:
+        url (str): URL to scrape for PDF links.
+        max_workers (int): Maximum number of PDFs downloaded at the same time.
+        use_manifest (bool): Send conditional GETs using the saved manifest.
+
+    Returns:
+        save_dir (str): Directory where PDFs are saved.
+
+    Example:
+        url = 'https://www.some_url.com'
+        download_all_pdfs(url)
+    """
+
+    session = make_session(pool_size=max_workers)
+    county = url.split("/")[-2]
+    with METRICS.stage(county, "listing"):
+        hrefs = find_pdf_links(url, session)
+    METRICS.inc("pdfs_listed", len(hrefs), county=county)
+
+    # directory pdfs will be saved
+    save_dir = os.path.join(
+        ".", "output_files", f"{county}_pdfs"
+    )  # use os.path.join for OS compatibility
+
+    # Create the directory if it doesn't exist
+    if not os.path.exists(save_dir):
+        print(f"Making Directory: {save_dir.split('/')[-1]}")
+        os.makedirs(save_dir)
+
+    manifest_file = manifest_path(save_dir)
+    old_manifest = load_manifest(manifest_file) if use_manifest else {}
+    manifest = {}
+    counts = {"new": 0, "changed": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+
+    # Download each PDF, one failed file shouldn't throw away the rest of the county
+    with METRICS.stage(county, "download"), ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                timed_download_pdf,
+                county,
+                href,
+                save_dir,
+                session,
+                old_manifest.get(os.path.basename(href)),
+            ): href
+            for href in hrefs
+        }
+        for future in as_completed(futures):
+            pdf_name = os.path.basename(futures[future])
+            try:
+                status, entry = future.result()
+            except requests.RequestException as e:
+                print(f"Failed to download {futures[future]}: {e}")
+                counts["failed"] += 1
+                # keep the old entry so the file is retried conditionally next run
+                if pdf_name in old_manifest:
+                    manifest[pdf_name] = old_manifest[pdf_name]
+                continue
+            counts[status] += 1
+            manifest[pdf_name] = entry
+
+    session.close()
+
+    if use_manifest:
+        save_manifest(manifest, manifest_file)
+
+    fetched = counts["new"] + counts["changed"] + counts["unchanged"]
+    print(
+        f"{county}: fetched {fetched}, skipped {counts['skipped']}, "
+        f"changed {counts['new'] + counts['changed']} ({counts['new']} new), failed {counts['failed']}"
+    )
 
     return save_dir
 
@@ -175,74 +475,161 @@ def merge_dicts(data: Dict[str, str], new_dict: Dict[str, str]) -> Dict[str, str
     return data
 
 
-def scrape_individual_pdf(pages_text: List[str], pdf_file, keys: List[str]) -> pd.DataFrame:
+class DisclosureParser:
     """
-    Scrapes text from each page of a PDF document and organizes it into a dictionary,
-    which is then turned into a pandas DataFrame.
+    Single pass line parser for the disclosure form, built once per list of keys.
 
-    Args:
-        pages_text (list): List of strings, where each string represents the text on a page of the PDF.
-        keys (list): List of keys to initialize the dictionary with.
+    The header keys are held in a frozenset so each "Key: value" line costs one hash lookup,
+    and a lettered section ("A.", "B.", ...) is recognized by two character checks instead of
+    a regex. Each page is split into lines once and the header and lettered sections are handled
+    in the same scan; section text is collected in lists and joined at the end.
 
-    Returns:
-        df (DataFrame): DataFrame created from the scraped data.
+    Gives the same result as the original two pass scrape: lines above the line index of
+    'INFORMATION FOR RELEASE' (on any page) are header lines, the rest belong to sections.
 
     Example:
-        keys = ['key1', 'key2']
-        pages_text = ['Page 1 text', 'Page 2 text']
-        scrape_individual_pdf(pages_text, keys)
+        parser = DisclosureParser(CONFIG.KEYS)
+        data, sections = parser.parse(pages_text, 'Clark_pdfs/2023-01-17_ID_1469166.pdf')
     """
 
-    # Initialize a dictionary with the keys and empty values
-    data = {key: "" for key in keys}
-    alphabetical_dict = {}
-    current_alphabetical_key = None
-    information_for_release_index = None
+    RELEASE_HEADER = "INFORMATION FOR RELEASE"
+
+    def __init__(self, keys: List[str], alternative_keys: Iterable[Tuple[str, ...]] = CONFIG.ALTERNATIVE_KEYS):
+        self.keys = list(keys)
+        self.key_set = frozenset(keys)
+        # key -> the keys that stand in for it on forms that don't fill it
+        self.alternatives = {
+            key: [other for other in group if other != key and other in self.key_set]
+            for group in alternative_keys
+            for key in group
+        }
+
+    def parse(
+        self,
+        pages_text: Iterable[str],
+        pdf_file,
+        stop_section: Optional[str] = CONFIG.STOP_SECTION,
+    ) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Parses pages until stop_section begins after every section before it and every key
+        (or one of its CONFIG.ALTERNATIVE_KEYS) has been captured, or the pages run out.
+
+        Returns:
+            data (dict): {key: value} for every key, "" when the header didn't have it.
+            sections (dict): {letter: section text} with the "A. " prefix removed.
+        """
+
+        data = dict.fromkeys(self.keys, "")
+        sections = {}
+        # stop_started: stop_section began after every section before it
+        state = {"current": None, "release_index": None, "stop_section": stop_section, "stop_started": False}
+        waiting_pages = []  # pages before 'INFORMATION FOR RELEASE' shows up
+
+        for page_text in pages_text:
+            lines = page_text.split("\n")
+
+            if state["release_index"] is None:
+                if waiting_pages:
+                    waiting_pages.append(lines)
+                    self._find_release_index(lines, state)
+                    if state["release_index"] is None:
+                        continue
+                    # rare: the release header wasn't on the first page, replay with its index
+                    for waiting_lines in waiting_pages:
+                        self._parse_lines(waiting_lines, data, sections, state)
+                    waiting_pages = []
+                elif not self._parse_first_page(lines, data, sections, state):
+                    waiting_pages.append(lines)
+                    continue
+            else:
+                self._parse_lines(lines, data, sections, state)
 
-    # Find the index of 'INFORMATION FOR RELEASE'
-    for page_text in pages_text:
-        lines = page_text.split("\n")
-        for i, line in enumerate(lines):
-            if "INFORMATION FOR RELEASE" in line:
-                information_for_release_index = i
+            # every section before stop_section is closed, the rest of the PDF can't change the record
+            if state["stop_started"] and self._keys_complete(data, sections):
                 break
 
-    for page_text in pages_text:
-        lines = page_text.split("\n")
-
+        if state["release_index"] is None:
+            raise ValueError(f"'INFORMATION FOR RELEASE' not found in {pdf_file}")
+
+        return data, {
+            letter: "".join(line + "\n" for line in section_lines)
+            for letter, section_lines in sections.items()
+        }
+
+    def _keys_complete(self, data: Dict, sections: Dict) -> bool:
+        # a key is captured when it has a value, when a lettered section's heading fills it
+        # (see restructure_alphabetical_dict) or when one of its alternative keys is captured
+        section_keys = {"\n".join(lines).split(":", 1)[0] for lines in sections.values()}
+        found = {key for key in self.keys if data[key] or key in section_keys}
+        return all(
+            key in found or any(other in found for other in self.alternatives.get(key, ()))
+            for key in self.keys
+        )
+
+    def _find_release_index(self, lines: List[str], state: Dict) -> None:
         for i, line in enumerate(lines):
-            if i < information_for_release_index:
-                # Split each line into a key-value pair
-                if ": " in line:
-                    key, value = line.split(": ", 1)
-                    # Only add the key-value pair to the dictionary if the key is in the list of keys
-                    if key in keys and not data[key]:
-                        data[key] = value
-            else:
-                # For lines after "INFORMATION FOR RELEASE"
-                match = re.match(r"([A-Z])\.", line)
-                if match:
-                    # Alphabetical key detected
-                    current_alphabetical_key = match.group(1)
-                    # Initialize the new key in the dictionary
-                    alphabetical_dict[current_alphabetical_key] = (
-                        line[3:] + "\n"
-                    )  # remove the redundant key by slicing from index 3
-                elif current_alphabetical_key:
-                    # If it's not a new key, append the line to the last key's value
-                    alphabetical_dict[current_alphabetical_key] += line + "\n"
-
-    # Needed to restructure alphabetical dictionary for messiness inside
-    new_dict = restructure_alphabetical_dict(alphabetical_dict)
+            if self.RELEASE_HEADER in line:
+                state["release_index"] = i
+                return
 
-    # Put new_dict = {'A summary of the report of abuse or neglect and a factual description of the contents of the report': 'CCDFS received ....'}
-    # into "data" dict which currently has blank values for the associated keys
-    data = merge_dicts(data, new_dict)
+    def _parse_first_page(self, lines: List[str], data: Dict, sections: Dict, state: Dict) -> bool:
+        # header lines are parsed while looking for the release header, everything from it on
+        # is section text, returns False if the page has no release header at all
+        for i, line in enumerate(lines):
+            if self.RELEASE_HEADER in line:
+                state["release_index"] = i
+                self._parse_section_lines(lines[i:], sections, state)
+                return True
+            self._parse_header_line(line, data)
+
+        # undo the tentative header parse, the page is replayed once the index is known
+        data.update(dict.fromkeys(self.keys, ""))
+        return False
+
+    def _parse_lines(self, lines: List[str], data: Dict, sections: Dict, state: Dict) -> None:
+        release_index = state["release_index"]
+        for line in lines[:release_index]:
+            self._parse_header_line(line, data)
+        self._parse_section_lines(lines[release_index:], sections, state)
+
+    def _parse_header_line(self, line: str, data: Dict) -> None:
+        # Split each line into a key-value pair
+        key, separator, value = line.partition(": ")
+        # Only add the key-value pair to the dictionary if the key is in the list of keys
+        if separator and key in self.key_set and not data[key]:
+            data[key] = value
+
+    def _parse_section_lines(self, lines: List[str], sections: Dict, state: Dict) -> None:
+        for line in lines:
+            # same test as re.match(r"([A-Z])\.", line) without the regex
+            if len(line) > 1 and line[1] == "." and "A" <= line[0] <= "Z":
+                # a stray "H." (e.g. initials in a summary) before section G doesn't end the scrape
+                if line[0] == state["stop_section"]:
+                    state["stop_started"] = all(chr(letter) in sections for letter in range(ord("A"), ord(line[0])))
+                # Alphabetical key detected, remove the redundant key by slicing from index 3
+                state["current"] = line[0]
+                sections[line[0]] = [line[3:]]
+            elif state["current"]:
+                # If it's not a new key, append the line to the last key's value
+                sections[state["current"]].append(line)
+
+
+@lru_cache(maxsize=8)
+def get_disclosure_parser(keys: Tuple[str, ...]) -> DisclosureParser:
+    return DisclosureParser(list(keys))
+
+
+def pdf_origin(pdf_file: str) -> Tuple[str, str]:
+    """
+    Region (county) and file name of a scraped PDF, taken from its path.
 
-    # Now you can create a DataFrame from your data
-    df = pd.DataFrame(data, index=[0])
+    Args:
+        pdf_file (str): Path of the PDF, e.g. ./output_files/Clark_pdfs/2022-04-15_ID_1488030.pdf
 
-    # add original region & pdf file as first columns
+    Returns:
+        original_region (str): Clark, Washoe, Rural
+        original_pdf (str): 2022-04-15_ID_1488030.pdf
+    """
 
     # TODO: Original MacOS/Docker design, needs to be refactored to be OS independent
     try:
@@ -250,61 +637,349 @@ def scrape_individual_pdf(pages_text: List[str], pdf_file, keys: List[str]) -> p
         original_pdf = pdf_file.split("/")[-1] # 2022-04-15_ID_1488030.pdf
         original_region = pdf_file.split("/")[-2].split("_")[0] # Clark, Washoe, Rural
 
-    except:
+    except IndexError:
         # Design for Windows & local pre-made folder scrape
         original_pdf = os.path.basename(pdf_file)
         directory = os.path.dirname(pdf_file)
         directory_parts = directory.split(os.path.sep)
         original_region = directory_parts[-2]
 
-    else:
-        print("Failure inside: child_fatality_scrape.scrape_individual_pdf()")
-        
+    return original_region, original_pdf
+
+
+def parse_disclosure_fields(
+    pages_text: Iterable[str],
+    pdf_file,
+    keys: List[str],
+    stop_section: Optional[str] = CONFIG.STOP_SECTION,
+) -> Dict[str, str]:
+    """
+    Parses the header and lettered sections of a disclosure into {key: value} for every key.
+
+    Args:
+        pages_text (iterable): Strings, where each string represents the text on a page of the PDF.
+        pdf_file (str): Path of the PDF, only used in error messages.
+        keys (list): List of keys to initialize the dictionary with.
+        stop_section (str): Lettered section whose start ends the parse, None reads every page.
+
+    Returns:
+        data (dict): Value of every key, "" when the PDF doesn't have it.
+    """
+
+    # matchers are compiled once per keys list, not per PDF
+    data, alphabetical_dict = get_disclosure_parser(tuple(keys)).parse(
+        pages_text, pdf_file, stop_section
+    )
+
+    # Needed to restructure alphabetical dictionary for messiness inside
+    new_dict = restructure_alphabetical_dict(alphabetical_dict)
 
-    df.insert(0, "original_pdf", original_pdf)
-    df.insert(0, "original_region", original_region)
+    # Put new_dict = {'A summary of the report of abuse or neglect and a factual description of the contents of the report': 'CCDFS received ....'}
+    # into "data" dict which currently has blank values for the associated keys
+    return merge_dicts(data, new_dict)
+
+
+def scrape_individual_pdf(
+    pages_text: Iterable[str],
+    pdf_file,
+    keys: List[str],
+    stop_section: Optional[str] = CONFIG.STOP_SECTION,
+) -> Dict[str, object]:
+    """
+    Scrapes text from each page of a PDF document and organizes it into a record (dict).
+    Records are cheap to build and pickle; cleaning_df turns the whole list into one DataFrame.
+
+    Pages are consumed one at a time, so pages_text can be a lazy generator (see
+    pdf_text.iter_pages_text). Once the stop_section (default "H.") begins after every lettered
+    section the record uses (A-G), and every key has been captured, no further pages are read.
+    The parsing itself is a single pass over the lines, see DisclosureParser.
+
+    Args:
+        pages_text (iterable): Strings, where each string represents the text on a page of the PDF.
+        keys (list): List of keys to initialize the dictionary with.
+        stop_section (str): Lettered section whose start ends the scrape, None reads every page.
+
+    Returns:
+        record (dict): original_region, original_pdf and every key, np.nan where the PDF had no value.
+
+    Example:
+        keys = ['key1', 'key2']
+        pages_text = ['Page 1 text', 'Page 2 text']
+        scrape_individual_pdf(pages_text, keys)
+    """
+
+    data = parse_disclosure_fields(pages_text, pdf_file, keys, stop_section)
+
+    # add original region & pdf file as first columns
+    original_region, original_pdf = pdf_origin(pdf_file)
+    record = {"original_region": original_region, "original_pdf": original_pdf}
 
     # Replace empty strings with NaN
-    df.replace("", np.nan, inplace=True)
+    for key, value in data.items():
+        record[key] = value if value != "" else np.nan
+
+    return record
+
+
+def scrape_text(
+    pages_text: Iterable[str], full_file_path: str, keys: List[str], region: Optional[str] = None
+) -> Dict[str, object]:
+    """
+    Scrapes the page texts of one PDF, which may be a lazy page generator.
+    The prior history count (dates in section "G.") is taken from the same extracted text,
+    so the PDF is parsed once per run.
+
+    Args:
+        pages_text (iterable): Text of each page of the PDF.
+        full_file_path (str): Path of the PDF, used for original_region & original_pdf.
+        keys (list): List of keys to initialize the dictionary with.
+        region (str): original_region to record, None takes it from the PDF's folder name.
+
+    Returns:
+        record (dict): Scraped record of the PDF, including prior_cases_count.
+    """
+
+    # keep the text of the pages the scraper actually read, section G ends inside them
+    pages_read = []
+
+    def read_pages():
+        for page_text in pages_text:
+            pages_read.append(page_text)
+            yield page_text
+
+    scraped = scrape_individual_pdf(read_pages(), full_file_path, keys)
+
+    # same position it ends up in the {county}_merged.csv
+    original_region = scraped.pop("original_region")
+    record = {
+        "original_region": region or original_region,
+        "original_pdf": scraped.pop("original_pdf"),
+        "prior_cases_count": count_dates_in_g_text("\n".join(pages_read)),
+    }
+    record.update(scraped)
+
+    return record
+
+
+def scrape_pdf_file(
+    full_file_path: str,
+    keys: List[str],
+    backend: str = CONFIG.PDF_BACKEND,
+    region: Optional[str] = None,
+) -> Dict[str, object]:
+    """
+    Opens one PDF, extracts the text of every page and scrapes it.
+    Module level so it can be shipped to process pool workers.
+
+    Args:
+        full_file_path (str): Path of the PDF.
+        keys (list): List of keys to initialize the dictionary with.
+        backend (str): Text extraction backend, 'pdfplumber' or 'pymupdf'.
+        region (str): original_region to record, None takes it from the PDF's folder name.
+
+    Returns:
+        record (dict): Scraped record of the PDF, including prior_cases_count.
+
+    Example:
+        scrape_pdf_file('./output_files/Clark_pdfs/2023-01-17_ID_1469166.pdf', CONFIG.KEYS)
+    """
+
+    return scrape_pdf_file_timed(full_file_path, keys, backend, region)[0]
+
+
+def timed_pages(pages_text: Iterable[str], timing: Dict[str, float]) -> Iterator[str]:
+    # passes pages through, counting them and the time spent producing them into timing
+    pages = iter(pages_text)
+    while True:
+        start = time.perf_counter()
+        try:
+            page_text = next(pages)
+        except StopIteration:
+            return
+        finally:
+            timing["extract_seconds"] += time.perf_counter() - start
+        timing["pages"] += 1
+        yield page_text
+
+
+def scrape_pdf_file_timed(
+    full_file_path: str,
+    keys: List[str],
+    backend: str = CONFIG.PDF_BACKEND,
+    region: Optional[str] = None,
+) -> Tuple[Dict[str, object], Dict[str, float]]:
+    """
+    scrape_pdf_file that also returns what the PDF cost, measured where it ran (e.g. a pool
+    worker) so the caller can record it. Extraction is lazy and interleaved with parsing, the
+    time spent waiting on the next page counts as extraction and the rest as parsing.
+
+    Returns:
+        record (dict): Scraped record of the PDF, including prior_cases_count.
+        timing (dict): 'pages' read, 'extract_seconds' and 'parse_seconds'.
+    """
+
+    timing = {"pages": 0, "extract_seconds": 0.0}
+    start = time.perf_counter()
+    # pages are extracted lazily and the PDF is closed as soon as the scrape stops reading
+    with closing(iter_pages_text(full_file_path, backend)) as pages_text:
+        record = scrape_text(timed_pages(pages_text, timing), full_file_path, keys, region)
+    timing["parse_seconds"] = time.perf_counter() - start - timing["extract_seconds"]
+    return record, timing
+
+
+def extract_pages_text_timed(full_file_path: str, backend: str = CONFIG.PDF_BACKEND) -> Tuple[List[str], float]:
+    # extract_pages_text and the seconds it took, for pool workers filling the text cache
+    start = time.perf_counter()
+    pages_text = extract_pages_text(full_file_path, backend)
+    return pages_text, time.perf_counter() - start
 
-    return df
+
+def record_scrape(record: Dict[str, object], pages: int, extract_seconds: float, parse_seconds: float, cached=False):
+    # per PDF metrics, labelled by the region the record ends up in
+    METRICS.record_pdf(
+        record["original_region"], record["original_pdf"], pages, extract_seconds, parse_seconds, cached
+    )
+
+
+def map_pdfs(
+    func, full_file_paths: List[str], workers: Optional[int], chunksize: int, *args, executor=None
+) -> list:
+    """
+    Applies func(full_file_path, *args) to every PDF, in a process pool when workers > 1
+    or in the given executor, e.g. a pool shared by several counties scraped at once.
+    Results are always in full_file_paths order.
+    """
+
+    if executor is not None and len(full_file_paths) > 1:
+        return list(
+            executor.map(func, full_file_paths, *[repeat(arg) for arg in args], chunksize=chunksize)
+        )
+
+    if not workers or workers <= 1 or len(full_file_paths) <= 1:
+        return [func(full_file_path, *args) for full_file_path in full_file_paths]
+
+    # executor.map yields in submission order, which keeps the output deterministic
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                func,
+                full_file_paths,
+                *[repeat(arg) for arg in args],
+                chunksize=chunksize,
+            )
+        )
 
 
 def loop_pdf_scrape(
-    file_list: List[str], path: str, keys: List[str]
-) -> List[pd.DataFrame]:
+    file_list: List[str],
+    path: str,
+    keys: List[str],
+    workers: Optional[int] = CONFIG.SCRAPE_WORKERS,
+    chunksize: int = CONFIG.SCRAPE_CHUNKSIZE,
+    cache: Optional[TextCache] = None,
+    backend: str = CONFIG.PDF_BACKEND,
+    hashes: Optional[Dict[str, str]] = None,
+    executor: Optional[ProcessPoolExecutor] = None,
+    region: Optional[str] = None,
+) -> List[Dict[str, object]]:
     """
     Iterates over a list of PDF files in a directory and scrapes each one.
+    With more than one worker the PDFs are spread across a process pool; results come back
+    in file_list order either way so the output is identical to a serial run.
+
+    When a TextCache is given, every PDF is hashed first and only cache misses are opened
+    and extracted; page texts of unchanged PDFs come straight from the cache.
 
     Args:
         file_list (list): List of file names.
         path (str): Path of the directory where the files are located.
         keys (list): List of keys to initialize the dictionary with.
+        workers (int): Number of processes, 1 (or None) scrapes serially in this process for debugging.
+        chunksize (int): Number of PDFs handed to a worker at a time.
+        cache (TextCache): Extracted-text cache, None always extracts.
+        backend (str): Text extraction backend, 'pdfplumber' for fidelity or 'pymupdf' for speed.
+        hashes (dict): Already known {file name: sha256}, saves hashing those PDFs again for the cache.
+        executor (ProcessPoolExecutor): Shared pool to scrape in instead of starting one, workers is then ignored.
+        region (str): original_region of every PDF, None takes it from each PDF's folder name
+            (needed when the PDFs are read from their year folders).
 
     Returns:
-        df_list (list): List of DataFrames, where each DataFrame represents the scraped data from a PDF.
+        records (list): List of dicts, where each record represents the scraped data from a PDF.
 
     Example:
         file_list = ['file1.pdf', 'file2.pdf']
         path = '/path/to/directory'
         keys = ['key1', 'key2']
-        loop_pdf_scrape(file_list, path, keys)
+        loop_pdf_scrape(file_list, path, keys, workers=4, cache=TextCache())
     """
 
-    df_list = []
-    for pdf_file in file_list:
-        # make sure full directory is appended before opening
-        # full_file_path = path + "/" + pdf_file
-        full_file_path = os.path.join(path, pdf_file)
-        # print(full_file_path)
+    # make sure full directory is appended before opening
+    full_file_paths = [os.path.join(path, pdf_file) for pdf_file in file_list]
+
+    if cache is None:
+        scraped = map_pdfs(
+            scrape_pdf_file_timed, full_file_paths, workers, chunksize, keys, backend, region, executor=executor
+        )
+        for record, timing in scraped:
+            record_scrape(record, timing["pages"], timing["extract_seconds"], timing["parse_seconds"])
+        return [record for record, _ in scraped]
+
+    # look every PDF up by content hash, only misses get parsed
+    extractor = extractor_version(backend)
+    pages_by_path = {}
+    missed_paths, missed_hashes = [], []
+    hashes = hashes or {}
+    for pdf_file, full_file_path in zip(file_list, full_file_paths):
+        pdf_sha256 = hashes.get(pdf_file) or sha256_file(full_file_path)
+        pages_text = cache.get(pdf_sha256, extractor)
+        if pages_text is None:
+            missed_paths.append(full_file_path)
+            missed_hashes.append(pdf_sha256)
+        else:
+            pages_by_path[full_file_path] = pages_text
+
+    extracted = map_pdfs(
+        extract_pages_text_timed, missed_paths, workers, chunksize, backend, executor=executor
+    )
+    extract_seconds = {}
+    for full_file_path, pdf_sha256, (pages_text, seconds) in zip(missed_paths, missed_hashes, extracted):
+        cache.put(pdf_sha256, extractor, pages_text)
+        pages_by_path[full_file_path] = pages_text
+        extract_seconds[full_file_path] = seconds
+
+    print(f"Text cache: {cache.stats()}")
+
+    records = []
+    for full_file_path in full_file_paths:
+        start = time.perf_counter()
+        record = scrape_text(pages_by_path[full_file_path], full_file_path, keys, region)
+        cached = full_file_path not in extract_seconds
+        record_scrape(
+            record,
+            len(pages_by_path[full_file_path]),
+            extract_seconds.get(full_file_path, 0.0),
+            time.perf_counter() - start,
+            cached,
+        )
+        records.append(record)
+    return records
+
+
+@lru_cache(maxsize=None)
+def nv_zip_index() -> Dict[str, str]:
+    """
+    Nevada ZIP code to city lookup, built from the zipcodes dataset the first time it is needed
+    and reused for the rest of the process.
+
+    Returns:
+        index (dict): {zip_code: city}
 
-        with pdfplumber.open(full_file_path) as pdf:
-            # Extract text from each page
-            pages_text = [page.extract_text() for page in pdf.pages]
-            individual_df = scrape_individual_pdf(pages_text, full_file_path, keys)
-            df_list.append(individual_df)
+    Example:
+        nv_zip_index()['89706']
+        >>> 'Carson City'
+    """
 
-    return df_list
+    return {entry["zip_code"]: entry["city"] for entry in zipcodes.filter_by(state="NV")}
 
 
 def get_city_by_zip(zip_code: str) -> str:
@@ -329,6 +1004,11 @@ def get_city_by_zip(zip_code: str) -> str:
     np.nan
     """
 
+    # nearly every agency is in Nevada, skip scanning the whole zipcodes dataset
+    city = nv_zip_index().get(str(zip_code))
+    if city:
+        return city
+
     try:
         result = zipcodes.is_real(str(zip_code))
     except Exception:
@@ -343,42 +1023,175 @@ def get_city_by_zip(zip_code: str) -> str:
     return np.nan
 
 
+# 5 digit ZIP (optionally ZIP+4) at the end of an address, ignoring stray trailing punctuation
+ZIP_PATTERN = re.compile(r"(\d{5})(?:-\d{4})?\W*$")
+
+
+def zip_city_columns(addresses: pd.Series) -> pd.DataFrame:
+    """
+    Pulls the ZIP code out of each address and looks up its city. Only the distinct ZIPs are
+    resolved, a county's addresses only use a handful, and the cities are mapped back onto the rows.
+
+    Args:
+        addresses (Series): Agency addresses as scraped.
+
+    Returns:
+        df (DataFrame): 'agency_zip' and 'agency_city' columns, NaN where there is no valid ZIP.
+
+    Example:
+        zip_city_columns(pd.Series(['350 South Center Street, Reno, NV 89502', '350 S Center Street Reno, Nevada']))
+        >>>   agency_zip agency_city
+        >>> 0      89502        Reno
+        >>> 1        NaN         NaN
+    """
+
+    zips = addresses.astype(object).str.extract(ZIP_PATTERN, expand=False)
+    cities = {zip_code: get_city_by_zip(zip_code) for zip_code in zips.dropna().unique()}
+    return pd.DataFrame(
+        {"agency_zip": zips, "agency_city": zips.map(cities)}, index=addresses.index
+    )
+
+
+# DOB looks like a date, gender is the word "male" or "female" (case insensitive)
+DOB_PATTERN = re.compile(r"(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})")
+GENDER_PATTERN = re.compile(r"(male|female)", re.IGNORECASE)
+
+
 def parse_dob_gender(value):
     # First, we find DOB by searching for a pattern that looks like a date
-    dob_match = re.search(r"\d{1,2}[-/]\d{1,2}[-/]\d{2,4}", value)
+    dob_match = DOB_PATTERN.search(value)
     dob = dob_match.group(0) if dob_match else None
 
     # Next, we look for gender by checking for the words "male" or "female" (case insensitive)
-    gender_match = re.search(r"male|female", value, re.IGNORECASE)
+    gender_match = GENDER_PATTERN.search(value)
     gender = gender_match.group(0) if gender_match else None
 
     return pd.Series([dob, gender])
 
 
+def split_dob_gender(values: pd.Series) -> pd.DataFrame:
+    """
+    Vectorized version of parse_dob_gender over a whole column: pulls the first date and the
+    first "male"/"female" out of each 'date of birth and gender' value with str.extract.
+
+    Args:
+        values (Series): Raw 'date_of_birth_and_gender' strings, NaN where missing.
+
+    Returns:
+        df (DataFrame): 'DOB' and 'gender' columns, NaN where nothing matched.
+
+    Example:
+        split_dob_gender(pd.Series(['7/19/2021, Male', 'Female, DOB 1/30/2023', np.nan]))
+        #          DOB  gender
+        # 0  7/19/2021    Male
+        # 1  1/30/2023  Female
+        # 2        NaN     NaN
+    """
+
+    # object dtype keeps .str usable even when every value is missing
+    values = values.astype(object)
+    return pd.DataFrame(
+        {
+            "DOB": values.str.extract(DOB_PATTERN, expand=False),
+            "gender": values.str.extract(GENDER_PATTERN, expand=False),
+        },
+        index=values.index,
+    )
+
+
+# anything that looks like a date inside a longer typed-in value, e.g. "4/13/2023 (approx.)"
+DATE_TOKEN_PATTERN = re.compile(r"(\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4})")
+
+
+def normalize_dates(
+    values: pd.Series, formats: List[str] = CONFIG.DATE_FORMATS
+) -> Tuple[pd.Series, int]:
+    """
+    Parses a column of date strings written in any of several formats.
+
+    Each distinct string is parsed only once and the result is mapped back onto the rows.
+    The formats are tried in order, each as one vectorized pd.to_datetime over the strings
+    still unparsed. Whatever is left is retried on the first date-looking token inside it.
+
+    Args:
+        values (Series): Date strings, NaN where missing. Datetimes, a datetime64 column or
+            datetime objects among the strings, are kept as they are.
+        formats (list): strptime formats to try, in order.
+
+    Returns:
+        dates (Series): datetime64 column, NaT where the value was missing or unparseable.
+        failed (int): Number of non-missing values that could not be parsed.
+
+    Example:
+        normalize_dates(pd.Series(['4/13/2023', '4/13/23', 'April 13, 2023', 'soon', np.nan]))
+        >>> (Series of 3 x 2023-04-13, NaT, NaT), 1
+    """
+
+    # a column that is already datetime64 (e.g. read back from parquet) has nothing to parse
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype("datetime64[ns]"), 0
+
+    # factorize gives every distinct value a code, -1 for missing
+    codes, uniques = pd.factorize(values.astype(object))
+    uniques = pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+    # datetimes mixed in with the strings are taken as they are, not parsed from their str()
+    is_datetime = uniques.map(lambda value: isinstance(value, (datetime, np.datetime64))).astype(bool)
+    text = uniques.astype(str).str.strip().where(~is_datetime)
+
+    parsed = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+    if is_datetime.any():
+        parsed[is_datetime] = pd.to_datetime(uniques[is_datetime])
+    for candidates in (text, text.str.extract(DATE_TOKEN_PATTERN, expand=False)):
+        for date_format in formats:
+            remaining = parsed.isna() & candidates.notna()
+            if not remaining.any():
+                break
+            parsed[remaining] = pd.to_datetime(
+                candidates[remaining], format=date_format, errors="coerce"
+            )
+
+    dates = pd.Series(
+        pd.DatetimeIndex(parsed).take(codes, allow_fill=True, fill_value=pd.NaT),
+        index=values.index,
+        name=values.name,
+    )
+    failed = int(((codes != -1) & dates.isna().to_numpy()).sum())
+
+    return dates, failed
+
+
 def cleaning_df(
-    df_list: List[pd.DataFrame], rename_cols: Dict[str, str], time_cols: List[str]
+    records: List[Dict[str, object]],
+    rename_cols: Dict[str, str],
+    time_cols: List[str],
+    enrich_city: bool = CONFIG.ENRICH_AGENCY_CITY,
 ) -> pd.DataFrame:
     """
-    Takes a list of DataFrames, concatenates them into a single DataFrame,
+    Takes a list of scraped records, builds a single DataFrame from them,
     and performs a series of cleaning operations.
 
     Args:
-        df_list (list): List of DataFrames to clean and concatenate.
+        records (list): List of record dicts (one per PDF) to clean. A list of one row
+            DataFrames, the older scrape output, is still accepted.
         rename_cols (dict): Dictionary mapping old column names to new column names.
         time_cols (list): List of columns that contain dates.
+        enrich_city (bool): Add 'agency_zip' and 'agency_city' columns parsed from the agency address.
 
     Returns:
-        df (DataFrame): Cleaned and concatenated DataFrame.
+        df (DataFrame): Cleaned DataFrame.
 
     Example:
-        df_list = [DataFrame1, DataFrame2]
+        records = [{'original_region': 'Clark', ...}, {'original_region': 'Clark', ...}]
         rename_cols = {'old_name1': 'new_name1', 'old_name2': 'new_name2'}
         time_cols = ['date_column1', 'date_column2']
-        cleaning_df(df_list, rename_cols, time_cols)
+        cleaning_df(records, rename_cols, time_cols)
     """
 
-    # concatenate final list of dataframes
-    df = pd.concat(df_list).reset_index(drop=True)
+    # one DataFrame for all records instead of concatenating hundreds of one row frames
+    if records and isinstance(records[0], pd.DataFrame):
+        df = pd.concat(records).reset_index(drop=True)
+    else:
+        df = pd.DataFrame.from_records(records)
 
     # make column names pretty
     df.columns = (
@@ -392,10 +1205,11 @@ def cleaning_df(
     # rename long columns
     df = df.rename(columns=rename_cols)
 
-    # convert to pandas datetime dtype
-    df[time_cols] = df[time_cols].apply(
-        pd.to_datetime, format="%m/%d/%Y", errors="coerce"
-    )
+    # convert to pandas datetime dtype, trying every format in CONFIG.DATE_FORMATS
+    for col in time_cols:
+        df[col], failed = normalize_dates(df[col])
+        if failed:
+            print(f"{col}: {failed} of {df[col].size} dates could not be parsed")
 
     # unify 'Internal reference UNITY Case Number' columns
     col1, col2 = (
@@ -408,33 +1222,174 @@ def cleaning_df(
     df = df.drop([col1], axis=1)
 
     # separate DOB & gender into their own columns
-    df[["DOB", "gender"]] = df["date_of_birth_and_gender"].apply(parse_dob_gender)
+    df[["DOB", "gender"]] = split_dob_gender(df["date_of_birth_and_gender"])
+    df["DOB"], failed = normalize_dates(df["DOB"])
+    if failed:
+        print(f"DOB: {failed} of {df['DOB'].size} dates could not be parsed")
 
-    # sort values by date, newest at top
-    df = df.sort_values(by="date", ascending=False).reset_index(drop=True)
+    # sort values by date, newest at top, records with the same date keep their order
+    df = df.sort_values(by="date", ascending=False, kind="stable").reset_index(drop=True)
 
-    # create zip code, if zip is not a 5 digit integer set to np.nan
-    # df['agency_zip'] = df['agency_address'].apply(lambda x: x.split()[-1] if re.match("^\d{5}$", x.split()[-1]) else np.nan)
-
-    # Apply the function to the zip column and create a new column 'city'
-    # non-trivial because PDF has a lot of human error so we have to use the zipcodes package
-    # df['agency_city'] = df['agency_zip'].apply(get_city_by_zip)
+    # zip code and city of the agency, non-trivial because PDF has a lot of human error
+    # so the city comes from the zipcodes package rather than the address text
+    if enrich_city:
+        df[["agency_zip", "agency_city"]] = zip_city_columns(df["agency_address"])
 
     return df
 
 
+def empty_dataset(keys: List[str], rename_cols: Dict[str, str], time_cols: List[str]) -> pd.DataFrame:
+    """
+    A county dataset without rows, with the columns and date dtypes cleaning_df gives scrape_text records.
+
+    Args:
+        keys (list): List of keys every record is initialized with.
+        rename_cols (dict): Dictionary mapping old column names to new column names.
+        time_cols (list): List of columns that contain dates.
+
+    Returns:
+        df (DataFrame): Zero row DataFrame.
+    """
+
+    blank = {"original_region": None, "original_pdf": None, "prior_cases_count": None, **dict.fromkeys(keys)}
+    return cleaning_df([blank], rename_cols, time_cols).iloc[0:0].reset_index(drop=True)
+
+
+def upsert_records(existing: pd.DataFrame, updates: Optional[pd.DataFrame], replaced: Iterable[str]) -> pd.DataFrame:
+    """
+    Drops the rows of replaced PDFs from a county dataset and adds the freshly scraped rows.
+
+    Args:
+        existing (DataFrame): County dataset from the last build.
+        updates (DataFrame): Cleaned rows of new or changed PDFs, None if there are none.
+        replaced (iterable): original_pdf names whose old rows go, changed and removed PDFs.
+
+    Returns:
+        df (DataFrame): Updated dataset, newest date first like cleaning_df.
+    """
+
+    df = existing[~existing["original_pdf"].isin(set(replaced))]
+    if updates is not None:
+        df = pd.concat([df, updates], ignore_index=True)
+    return df.sort_values(by="date", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def scrape_county(
+    file_list: List[str],
+    path: str,
+    csv_filename: str,
+    keys: List[str],
+    rename_cols: Dict[str, str],
+    time_cols: List[str],
+    incremental: bool = CONFIG.INCREMENTAL_REFRESH,
+    executor: Optional[ProcessPoolExecutor] = None,
+    region: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Scrapes, cleans and saves one county's PDFs. The content hash of every PDF is recorded in a
+    build state sidecar next to the csv; in incremental mode only PDFs that are new or changed
+    since that build are scraped, rows of removed PDFs are dropped and the rest of the existing
+    dataset is kept as is.
+
+    Args:
+        file_list (list): PDF file names (or paths relative to path) inside path.
+        path (str): Directory holding the PDFs.
+        csv_filename (str): County dataset to write, e.g. ./output_files/child_fatality_Clark.csv
+        keys (list): List of keys to initialize the dictionary with for data scraping.
+        rename_cols (dict): Dictionary mapping old column names to new column names for cleaning the DataFrame.
+        time_cols (list): List of columns that contain dates for converting to datetime.
+        incremental (bool): Only process the change since the last build, False rebuilds from every PDF.
+        executor (ProcessPoolExecutor): Process pool shared with other counties, None starts its own.
+        region (str): original_region of every PDF, None takes it from each PDF's folder name.
+
+    Returns:
+        final_df (DataFrame): The cleaned, typed county DataFrame that was saved.
+
+    Example:
+        scrape_county(['2023-01-17_ID_1469166.pdf'], './output_files/Clark_pdfs',
+                      './output_files/child_fatality_Clark.csv', keys, rename_cols, time_cols, incremental=True)
+    """
+
+    # metrics label, csv_filename is child_fatality_{county}.csv in URL and FOLDER runs
+    county = region or os.path.splitext(os.path.basename(csv_filename))[0].replace("child_fatality_", "")
+
+    # hashed once, reused by the text cache and saved as the new build state
+    with METRICS.stage(county, "hash"):
+        pdf_hashes = {pdf_file: sha256_file(os.path.join(path, pdf_file)) for pdf_file in file_list}
+    # the state is keyed like original_pdf, file_list may hold year_folder/file.pdf paths
+    built_from = {os.path.basename(pdf_file): sha256 for pdf_file, sha256 in pdf_hashes.items()}
+    state_path = build_state_path(csv_filename)
+
+    existing, state = None, {}
+    if incremental and os.path.exists(csv_filename) and os.path.exists(state_path):
+        existing = read_dataset(csv_filename)
+        state = load_build_state(state_path)
+
+    changed, removed = diff_build_state(built_from, state)
+    if existing is not None:
+        print(
+            f"Incremental refresh: {len(changed)} new or changed, {len(removed)} removed, "
+            f"{len(built_from) - len(changed)} unchanged"
+        )
+        if not changed and not removed:
+            return existing
+    changed_names = set(changed)
+    changed_files = [pdf_file for pdf_file in file_list if os.path.basename(pdf_file) in changed_names]
+
+    # scrape each new or changed pdf: takes about 35 seconds for all of Clark County
+    with METRICS.stage(county, "scrape"):
+        records = loop_pdf_scrape(
+            changed_files,
+            path=path,
+            keys=keys,
+            cache=get_text_cache(),
+            hashes=pdf_hashes,
+            executor=executor,
+            region=region,
+        )
+    print("Done scraping pdfs")
+
+    # build one dataframe from the records, clean, and sort dataframe
+    with METRICS.stage(county, "cleaning"):
+        final_df = cleaning_df(records, rename_cols, time_cols) if records else None
+        if existing is not None:
+            final_df = upsert_records(existing, final_df, changed + removed)
+        elif final_df is None:
+            # no PDFs in the county yet, still save a dataset with the usual columns
+            final_df = empty_dataset(keys, rename_cols, time_cols)
+    print(final_df.shape)
+
+    # save final csv (and its typed parquet copy), then what it was built from
+    with METRICS.stage(county, "write"):
+        final_df = write_dataset(final_df, csv_filename)
+        save_build_state(built_from, state_path)
+    METRICS.inc("rows_written", len(final_df), county=county)
+    print(f"Saved {csv_filename}")
+    return final_df
+
+
 def run_pdf_scraping_URL(
-    url: str, keys: List[str], rename_cols: Dict[str, str], time_cols: List[str]
-) -> None:
+    url: str,
+    keys: List[str],
+    rename_cols: Dict[str, str],
+    time_cols: List[str],
+    incremental: bool = CONFIG.INCREMENTAL_REFRESH,
+    executor: Optional[ProcessPoolExecutor] = None,
+) -> pd.DataFrame:
     """
     Executes a full run of downloading all PDFs from a provided URL, scraping each PDF for data,
-    and finally cleaning and saving the data into a .csv file.
+    and finally cleaning and saving the data into a .csv file and a typed columnar file.
 
     Args:
         url (str): The URL where the PDFs are located.
         keys (list): List of keys to initialize the dictionary with for data scraping.
         rename_cols (dict): Dictionary mapping old column names to new column names for cleaning the DataFrame.
         time_cols (list): List of columns that contain dates for converting to datetime.
+        incremental (bool): Only scrape PDFs added or changed since the last run and upsert them.
+        executor (ProcessPoolExecutor): Process pool shared with other counties, None starts its own.
+
+    Returns:
+        final_df (DataFrame): The cleaned, typed county DataFrame that was saved.
 
     Example:
         url = 'http://example.com'
@@ -451,72 +1406,138 @@ def run_pdf_scraping_URL(
     # Start the timer
     start_time = time.time()
 
-    # takes about 2 min to download all files from url for Clark County
+    # concurrent pooled download, a few seconds for Clark County
     save_dir = download_all_pdfs(url)
     print("Done downloading all pdfs")
 
     # list all local pdfs
     file_list = list_files(path=save_dir, append_base_path=False)
+    # leftover .part files from interrupted downloads are not PDFs yet
+    file_list = [f for f in file_list if f.lower().endswith(".pdf")]
     print(len(file_list))
 
-    # scrape each individual pdf from file_list: takes about 35 seconds for Clark County
-    df_list = loop_pdf_scrape(file_list, path=save_dir, keys=keys)
-    print("Done scraping pdfs")
-
-    # concatenate final list of dataframes, clean, and sort dataframe
-    final_df = cleaning_df(df_list, rename_cols, time_cols)
-    print(final_df.shape)
-
-    # save final csv per county
+    # scrape, clean and save the county, only new or changed pdfs in incremental mode
     county = url.split("/")[-2]
     csv_filename = f"./output_files/child_fatality_{county}.csv"
-    final_df.to_csv(csv_filename, index=False)
-    print(f"Saved {csv_filename}")
+    final_df = scrape_county(
+        file_list, save_dir, csv_filename, keys, rename_cols, time_cols, incremental, executor
+    )
 
     # Calculate the elapsed time
     elapsed_time = time.time() - start_time
     print(f"Execution time for {county}: {round(elapsed_time,2)} seconds")
 
+    # handed to the prior history merge in memory, no need to read the csv back
+    return final_df
 
-def full_data_path_prep(county_folder, test_years=CONFIG.SCRAPE_YEARS):
 
-    # Gets all years inside of the county folder
-    all_years_list = os.listdir(county_folder)
+INGEST_MODES = ("copy", "link", "manifest")
 
-    # New path to copy files to
-    kev_dev_path = os.path.join(CONFIG.FULL_DATA_PATH, county_folder, "Kev_Dev")
 
-    for year_folder in all_years_list:
+def ingest_file(src: str, dst_dir: str, mode: str = "copy") -> str:
+    """
+    Places a source PDF inside dst_dir. In 'link' mode a hardlink is tried first, then a
+    symlink, and it falls back to a copy when the filesystem allows neither.
 
-        # subset to years we want to move to Kev_Dev
-        if year_folder in test_years:
-            print(year_folder)
-            # print(f"copying {county_folder} {year_folder} to {county_folder}\Kev_Dev")
+    Args:
+        src (str): Source file.
+        dst_dir (str): Directory to place it in.
+        mode (str): 'copy' or 'link'.
 
-            county_year_path = os.path.join(CONFIG.FULL_DATA_PATH, county_folder, year_folder)
+    Returns:
+        dst (str): Path of the file inside dst_dir.
+    """
 
-            # Create the new directory if it doesn't exist
-            os.makedirs(kev_dev_path, exist_ok=True)
+    dst = os.path.join(dst_dir, os.path.basename(src))
+    if os.path.lexists(dst):
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            if mode == "link":
+                # linked by an earlier run
+                return dst
+            # a copy must never write through a link into the original
+            os.remove(dst)
+        elif mode == "link" or os.path.islink(dst):
+            os.remove(dst)
+
+    if mode == "link":
+        try:
+            os.link(src, dst)
+            return dst
+        except OSError:
+            pass  # across filesystems, or no hardlink support
+        try:
+            os.symlink(os.path.abspath(src), dst)
+            return dst
+        except OSError:
+            pass  # e.g. Windows without symlink privilege
+
+    shutil.copy(src, dst)
+    return dst
+
+
+def full_data_path_prep(county_folder, test_years=CONFIG.SCRAPE_YEARS, mode=CONFIG.INGEST_MODE):
+    """
+    Gathers a county's PDFs of the selected years for a folder based run.
 
-            # Copy all files from county_year_path to Kev_Dev directory
-            for file_name in os.listdir(county_year_path):
-                file_path = os.path.join(county_year_path, file_name)
-                if os.path.isfile(file_path):
-                    shutil.copy(file_path, kev_dev_path) # Save to analytics folder
+    Args:
+        county_folder (str): {FULL_DATA_PATH}/{county}, holding one folder per year.
+        test_years (list): Year folders to include.
+        mode (str): 'copy' copies every PDF into {county_folder}/Kev_Dev and ./output_files/{county}_pdfs,
+            'link' hardlinks/symlinks them there instead (copying only where it can't link),
+            'manifest' places nothing and lists the originals inside their year folders.
 
+    Returns:
+        pdf_files_list (list): PDF names, or year_folder/name paths in 'manifest' mode.
+        pdf_dir (str): Directory the names are relative to, Kev_Dev or county_folder.
 
-                    # TODO: shouldn't have to save these in two spots, reconcile later
-                    # save files to ./output_files/county_pdfs for prior_history merging
-                    directory = os.path.dirname(kev_dev_path)
-                    directory_parts = directory.split(os.path.sep)
-                    county = directory_parts[-1]
+    Example:
+        pdf_files_list, pdf_dir = full_data_path_prep('/data/Clark', ['2023'], mode='manifest')
+        >>> ['2023/2023-01-17_ID_1469166.pdf', ...], '/data/Clark'
+    """
 
-                    # save PDFs to temp output_file location to blend with rest of code
-                    save_dir = os.path.join(".", "output_files", f"{county}_pdfs")
-                    if not os.path.exists(save_dir):
-                        print(f"Making Directory: {save_dir}")
-                        os.makedirs(save_dir)
-                    shutil.copy(file_path, save_dir) # save to temp ./output_files/county_pdfs
+    if mode not in INGEST_MODES:
+        raise ValueError(f"Unknown ingest mode {mode!r}, expected one of {INGEST_MODES}")
+
+    # county name and destination folders are the same for every file
+    county = os.path.basename(os.path.normpath(county_folder))
+    kev_dev_path = os.path.join(county_folder, "Kev_Dev")
+    save_dir = os.path.join(".", "output_files", f"{county}_pdfs")
+
+    # every file of the years we want, original paths
+    source_paths = []
+    for year_folder in os.listdir(county_folder):
+
+        # subset to years we want to move to Kev_Dev
+        if year_folder in test_years:
+            print(year_folder)
+            county_year_path = os.path.join(county_folder, year_folder)
+            for file_name in os.listdir(county_year_path):
+                file_path = os.path.join(county_year_path, file_name)
+                if os.path.isfile(file_path):
+                    source_paths.append(file_path)
+
+    if mode == "manifest":
+        # scraping reads the originals, a name in two years keeps the later one like Kev_Dev does
+        latest = {os.path.basename(file_path): file_path for file_path in source_paths}
+        pdf_files_list = [
+            os.path.relpath(file_path, county_folder)
+            for file_path in latest.values()
+            if file_path.lower().endswith(".pdf")
+        ]
+        return pdf_files_list, county_folder
+
+    # Create the new directories if they don't exist
+    os.makedirs(kev_dev_path, exist_ok=True)
+    if not os.path.exists(save_dir):
+        print(f"Making Directory: {save_dir}")
+        os.makedirs(save_dir)
+
+    for file_path in source_paths:
+        ingest_file(file_path, kev_dev_path, mode)  # Save to analytics folder
+
+        # TODO: shouldn't have to save these in two spots, reconcile later
+        # save files to ./output_files/county_pdfs for prior_history merging
+        ingest_file(file_path, save_dir, mode)
 
     # Get a list of all the files now inside Kev_Dev for processing
     all_kev_dev_files = os.listdir(kev_dev_path)
@@ -526,34 +1547,44 @@ def full_data_path_prep(county_folder, test_years=CONFIG.SCRAPE_YEARS):
 
 
 def run_pdf_scraping_FOLDER(
-    county_folder: str, keys: List[str], rename_cols: Dict[str, str], time_cols: List[str]
-) -> None:
+    county_folder: str,
+    keys: List[str],
+    rename_cols: Dict[str, str],
+    time_cols: List[str],
+    incremental: bool = CONFIG.INCREMENTAL_REFRESH,
+    executor: Optional[ProcessPoolExecutor] = None,
+) -> pd.DataFrame:
 
     # Start the timer
     start_time = time.time()
 
-    pdf_files_list, kev_dev_path = full_data_path_prep(county_folder)
-
-    save_dir = kev_dev_path
+    county = os.path.basename(os.path.normpath(county_folder))
+    with METRICS.stage(county, "listing"):
+        pdf_files_list, save_dir = full_data_path_prep(county_folder)
+    METRICS.inc("pdfs_listed", len(pdf_files_list), county=county)
 
-    # scrape each individual pdf from file_list: takes about 35 seconds for Clark County
-    df_list = loop_pdf_scrape(pdf_files_list, path=save_dir, keys=keys)
-    print("Done scraping pdfs")
-
-    # concatenate final list of dataframes, clean, and sort dataframe
-    final_df = cleaning_df(df_list, rename_cols, time_cols)
-    print(final_df.shape)
-
-    # save final csv per county
-    county = county_folder.split("\\")[-1]
+    # scrape, clean and save the county, only new or changed pdfs in incremental mode.
+    # The region is passed explicitly, the pdfs sit in Kev_Dev or their year folder, not {county}_pdfs
     csv_filename = f"./output_files/child_fatality_{county}.csv"
-    final_df.to_csv(csv_filename, index=False)
-    print(f"Saved {csv_filename}")
+    final_df = scrape_county(
+        pdf_files_list,
+        save_dir,
+        csv_filename,
+        keys,
+        rename_cols,
+        time_cols,
+        incremental,
+        executor,
+        region=county,
+    )
 
     # Calculate the elapsed time
     elapsed_time = time.time() - start_time
     print(f"Execution time for {county}: {round(elapsed_time,2)} seconds")
 
+    # handed to the prior history merge in memory, no need to read the csv back
+    return final_df
+
 
 
 
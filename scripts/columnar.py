@@ -0,0 +1,251 @@
+import os
+import glob
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Dict, List, Optional
+import config.CONFIG as CONFIG
+
+# explicit column types of the county datasets, anything not listed is stored as a string
+DATETIME_COLUMNS = CONFIG.TIME_COLS + ["DOB"]
+CATEGORY_COLUMNS = ["original_region", "agency_name", "gender"]
+INT_COLUMNS = ["prior_cases_count"]
+
+COLUMNAR_EXTENSIONS = {"parquet": ".parquet", "feather": ".feather"}
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Casts a county dataset to its explicit schema: datetimes for the date columns, categoricals
+    for region/agency/gender, nullable Int64 for prior_cases_count and strings for the rest.
+
+    Args:
+        df (DataFrame): Cleaned or merged county DataFrame, typed or freshly read from CSV.
+
+    Returns:
+        df (DataFrame): Copy of df with the schema applied, column order unchanged.
+
+    Example:
+        df = apply_schema(pd.read_csv('./output_files/Clark_merged.csv'))
+        df.dtypes['prior_cases_count']
+        >>> Int64Dtype()
+    """
+
+    df = df.copy()
+    for col in df.columns:
+        if col in DATETIME_COLUMNS:
+            if not pd.api.types.is_datetime64_any_dtype(df[col]):
+                # only CSVs written before the dates were normalized get here
+                df[col] = pd.to_datetime(df[col], format="mixed", errors="coerce")
+            df[col] = df[col].astype("datetime64[ns]")
+        elif col in CATEGORY_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif col in INT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+        else:
+            df[col] = df[col].astype("string")
+    return df
+
+
+def columnar_path(csv_path: str, fmt: str = CONFIG.OUTPUT_FORMAT) -> str:
+    """
+    Path of the columnar file written alongside a CSV.
+
+    Example:
+        columnar_path('./output_files/child_fatality_Clark.csv', 'parquet')
+        >>> './output_files/child_fatality_Clark.parquet'
+    """
+
+    if fmt not in COLUMNAR_EXTENSIONS:
+        raise ValueError(f"Unknown output format {fmt!r}, expected one of {sorted(COLUMNAR_EXTENSIONS)}")
+    return os.path.splitext(csv_path)[0] + COLUMNAR_EXTENSIONS[fmt]
+
+
+def write_dataset(df: pd.DataFrame, csv_path: str, fmt: Optional[str] = CONFIG.OUTPUT_FORMAT) -> pd.DataFrame:
+    """
+    Saves a county dataset as CSV and, unless fmt is None, as a typed Parquet/Feather file next to it.
+
+    Args:
+        df (DataFrame): Dataset to save.
+        csv_path (str): CSV path, e.g. ./output_files/child_fatality_Clark.csv
+        fmt (str): 'parquet', 'feather' or None for CSV only.
+
+    Returns:
+        df (DataFrame): The dataset with the schema applied.
+    """
+
+    df = apply_schema(df)
+    df.to_csv(csv_path, index=False)
+
+    if fmt is not None:
+        path = columnar_path(csv_path, fmt)
+        tmp_path = f"{path}.tmp"
+        if fmt == "parquet":
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.to_feather(tmp_path)
+        # replaced after the CSV so a complete columnar file is never older than its CSV
+        os.replace(tmp_path, path)
+    return df
+
+
+class DatasetWriter:
+    """
+    Writes a county dataset chunk by chunk, to the same CSV and typed Parquet/Feather files
+    write_dataset produces from a whole DataFrame, so a dataset never has to be in memory at once.
+
+    Both files are written next to their final path and only replace it on close(), CSV first,
+    so readers never see a half written dataset. Categorical columns get the same categories in
+    every chunk: pass the full sets in categories (sorted, like write_dataset's) or each new value
+    is appended as it first shows up.
+
+    Example:
+        with DatasetWriter('./output_files/child_fatality_Clark.csv', categories={'gender': ['Female', 'Male']}) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+        print(writer.rows)
+    """
+
+    def __init__(
+        self,
+        csv_path: str,
+        fmt: Optional[str] = CONFIG.OUTPUT_FORMAT,
+        categories: Optional[Dict[str, List[str]]] = None,
+    ):
+        self.csv_path = csv_path
+        self.path = columnar_path(csv_path, fmt) if fmt is not None else None
+        self.fmt = fmt
+        self.categories = {col: list(values) for col, values in (categories or {}).items()}
+        self.rows = 0
+        self.schema = None
+        self.columnar_writer = None
+        self.csv_file = open(f"{csv_path}.tmp", "w", newline="")
+
+    def __enter__(self) -> "DatasetWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, df: pd.DataFrame) -> None:
+        """
+        Appends a cleaned chunk, with the schema applied like write_dataset.
+        """
+
+        df = apply_schema(df)
+        for col in CATEGORY_COLUMNS:
+            if col in df.columns:
+                known = self.categories.setdefault(col, [])
+                known.extend(value for value in df[col].cat.categories if value not in known)
+                df[col] = df[col].cat.set_categories(known)
+
+        df.to_csv(self.csv_file, index=False, header=self.rows == 0)
+        self.rows += len(df)
+        if self.path is None:
+            return
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self.columnar_writer is None:
+            # one dictionary index width for every chunk, whatever the number of categories
+            self.schema = pa.schema(
+                [
+                    field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+                    if pa.types.is_dictionary(field.type)
+                    else field
+                    for field in table.schema
+                ],
+                metadata=table.schema.metadata,
+            )
+            if self.fmt == "parquet":
+                self.columnar_writer = pq.ParquetWriter(f"{self.path}.tmp", self.schema)
+            else:
+                # Feather is the Arrow IPC file format, categories added later go out as dictionary deltas
+                options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+                self.columnar_writer = pa.ipc.new_file(f"{self.path}.tmp", self.schema, options=options)
+        self.columnar_writer.write_table(table.cast(self.schema))
+
+    def close(self) -> None:
+        """
+        Finishes both files and moves them into place.
+        """
+
+        self.csv_file.close()
+        if self.columnar_writer is not None:
+            self.columnar_writer.close()
+        os.replace(f"{self.csv_path}.tmp", self.csv_path)
+        if self.columnar_writer is not None:
+            os.replace(f"{self.path}.tmp", self.path)
+
+    def abort(self) -> None:
+        """
+        Drops whatever was written, the previous dataset stays as it was.
+        """
+
+        self.csv_file.close()
+        if self.columnar_writer is not None:
+            self.columnar_writer.close()
+        for tmp_path in (f"{self.csv_path}.tmp", f"{self.path}.tmp" if self.path else None):
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def read_dataset(
+    csv_path: str, columns: Optional[List[str]] = None, fmt: Optional[str] = CONFIG.OUTPUT_FORMAT
+) -> pd.DataFrame:
+    """
+    Loads a county dataset, from its typed columnar file when one at least as new as the CSV
+    exists, otherwise from the CSV with the schema re-applied.
+
+    Args:
+        csv_path (str): CSV path, e.g. ./output_files/child_fatality_Clark.csv
+        columns (list): Only load these columns, missing ones are skipped.
+        fmt (str): 'parquet', 'feather' or None to always read the CSV.
+
+    Returns:
+        df (DataFrame): Typed dataset.
+
+    Example:
+        df = read_dataset('./output_files/child_fatality_Clark.csv', columns=['original_region', 'date'])
+    """
+
+    path = columnar_path(csv_path, fmt) if fmt is not None else None
+    if path and os.path.exists(path) and (
+        not os.path.exists(csv_path) or os.path.getmtime(path) >= os.path.getmtime(csv_path)
+    ):
+        df = pd.read_parquet(path) if fmt == "parquet" else pd.read_feather(path)
+        if columns is not None:
+            df = df[[col for col in columns if col in df.columns]]
+        return df
+
+    # everything read as text so case numbers etc. aren't turned into floats, the schema types the rest
+    usecols = (lambda col: col in columns) if columns is not None else None
+    return apply_schema(pd.read_csv(csv_path, usecols=usecols, dtype=str))
+
+
+def read_statewide(directory: str = os.path.join(".", "output_files"), fmt: str = CONFIG.OUTPUT_FORMAT) -> pd.DataFrame:
+    """
+    Loads every county's merged dataset into one typed statewide DataFrame.
+
+    Args:
+        directory (str): Folder holding the {county}_merged files.
+        fmt (str): 'parquet', 'feather' or None to read the CSVs.
+
+    Returns:
+        df (DataFrame): All counties, newest date first.
+
+    Example:
+        df = read_statewide('./output_files')
+        df.groupby('original_region', observed=True)['prior_cases_count'].mean()
+    """
+
+    csv_paths = sorted(glob.glob(os.path.join(directory, "*_merged.csv")))
+    frames = [read_dataset(csv_path, fmt=fmt) for csv_path in csv_paths]
+    if not frames:
+        return pd.DataFrame()
+
+    # counties have different category sets, re-apply the schema after concatenating
+    df = apply_schema(pd.concat(frames, ignore_index=True))
+    return df.sort_values(by="date", ascending=False, kind="stable").reset_index(drop=True)
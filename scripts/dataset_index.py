@@ -0,0 +1,185 @@
+import os
+import glob
+import json
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from .columnar import COLUMNAR_EXTENSIONS, read_statewide
+
+CASE_NUMBER_COLUMN = "internal_reference_unity_case_number"
+
+
+def dataset_fingerprint(directory: str) -> str:
+    """
+    Cheap version of the merged datasets in directory, from the name, size and mtime of every
+    {county}_merged file. Changes whenever a pipeline run writes new output.
+    """
+
+    patterns = ["*_merged.csv"] + [f"*_merged{ext}" for ext in COLUMNAR_EXTENSIONS.values()]
+    digest = hashlib.sha1()
+    for path in sorted(p for pattern in patterns for p in glob.glob(os.path.join(directory, pattern))):
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+class DatasetIndex:
+    """
+    Immutable in-memory copy of the statewide dataset with lookup indexes built once:
+    row positions per original_region and per UNITY case number, and every row position
+    sorted by date so a date range is two binary searches. Rows are returned newest first.
+
+    Example:
+        index = DatasetIndex(read_statewide('./output_files'), version='abc')
+        index.query(region='Clark', start='2023-01-01', end='2023-06-30', page=1, page_size=50)
+        >>> {'total': 112, 'page': 1, 'page_size': 50, 'records': [...]}
+    """
+
+    def __init__(self, df: pd.DataFrame, version: str = ""):
+        self.version = version
+
+        # rows stored newest first, so sorting row positions gives results newest first
+        if "date" in df.columns:
+            df = df.sort_values(by="date", ascending=False, kind="stable", na_position="last")
+            dates = df["date"].to_numpy(dtype="datetime64[ns]")
+        else:
+            dates = np.full(len(df), np.datetime64("NaT"), dtype="datetime64[ns]")
+        self.df = df.reset_index(drop=True)
+
+        self.by_date = np.argsort(dates, kind="stable")
+        self.sorted_dates = dates[self.by_date]
+        # NaT sorts last, keep it out of range lookups
+        self.n_dated = int((~np.isnat(self.sorted_dates)).sum())
+
+        self.by_region = self._positions(self.df.get("original_region"))
+        self.by_case = self._positions(self.df.get(CASE_NUMBER_COLUMN))
+
+    @staticmethod
+    def _positions(column: Optional[pd.Series]) -> Dict[str, np.ndarray]:
+        if column is None:
+            return {}
+        codes, uniques = pd.factorize(column.astype("string"))
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        return {str(value): order[bounds[i] : bounds[i + 1]] for i, value in enumerate(uniques)}
+
+    def regions(self) -> List[str]:
+        return sorted(self.by_region)
+
+    def lookup(
+        self,
+        region: Optional[str] = None,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        case_number: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Row positions matching every given filter (dates inclusive), newest first.
+        """
+
+        empty = np.array([], dtype=np.int64)
+        candidates = []
+        if region is not None:
+            candidates.append(self.by_region.get(region, empty))
+        if case_number is not None:
+            candidates.append(self.by_case.get(case_number, empty))
+        if start is not None or end is not None:
+            dated = self.sorted_dates[: self.n_dated]
+            lo = np.searchsorted(dated, np.datetime64(start, "ns"), side="left") if start is not None else 0
+            hi = (
+                np.searchsorted(dated, np.datetime64(end, "ns"), side="right")
+                if end is not None
+                else self.n_dated
+            )
+            candidates.append(self.by_date[lo:hi])
+
+        if not candidates:
+            positions = np.arange(len(self.df))
+        else:
+            positions = candidates[0]
+            for other in candidates[1:]:
+                positions = np.intersect1d(positions, other, assume_unique=True)
+        return np.sort(positions)
+
+    def query(
+        self,
+        region: Optional[str] = None,
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+        case_number: Optional[str] = None,
+        page: int = 1,
+        page_size: int = 50,
+    ) -> Dict:
+        """
+        One page of matching records, JSON ready (ISO dates, null for missing values).
+
+        Args:
+            region (str): original_region, e.g. Clark
+            start (Timestamp): First date included.
+            end (Timestamp): Last date included.
+            case_number (str): Internal reference UNITY case number.
+            page (int): 1 based page number.
+            page_size (int): Records per page.
+
+        Returns:
+            result (dict): total, page, page_size, pages and the page's records.
+        """
+
+        positions = self.lookup(region, start, end, case_number)
+        offset = (page - 1) * page_size
+        page_rows = self.df.iloc[positions[offset : offset + page_size]]
+        return {
+            "total": int(len(positions)),
+            "page": page,
+            "page_size": page_size,
+            "pages": -(-len(positions) // page_size),
+            "records": json.loads(page_rows.to_json(orient="records", date_format="iso")),
+        }
+
+
+class DatasetStore:
+    """
+    Holds the current DatasetIndex and swaps in a freshly built one when the merged output in
+    directory changes. The swap is a single reference assignment, so a request always sees one
+    complete index, never a half built one.
+
+    Example:
+        store = DatasetStore('./output_files')
+        store.current().query(region='Washoe')
+        store.refresh()  # after a pipeline run lands
+    """
+
+    def __init__(self, directory: str = os.path.join(".", "output_files")):
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.index: Optional[DatasetIndex] = None
+
+    def refresh(self) -> DatasetIndex:
+        """
+        Rebuilds the index if the merged files changed since it was built. If the files can't
+        be read (e.g. a run is rewriting them) the old index stays in place.
+        """
+
+        version = dataset_fingerprint(self.directory)
+        if self.index is not None and self.index.version == version:
+            return self.index
+
+        # one rebuild at a time, readers keep using the old index meanwhile
+        with self.lock:
+            if self.index is None or self.index.version != version:
+                try:
+                    self.index = DatasetIndex(read_statewide(self.directory), version=version)
+                except Exception as e:
+                    if self.index is None:
+                        raise
+                    print(f"Keeping dataset index {self.index.version}, rebuild failed: {e!r}")
+        return self.index
+
+    def current(self) -> DatasetIndex:
+        """
+        The index in use, built on first access.
+        """
+
+        return self.index if self.index is not None else self.refresh()
@@ -0,0 +1,107 @@
+import os
+import json
+import hashlib
+from typing import Dict, Optional
+
+
+def manifest_path(save_dir: str) -> str:
+    """
+    Path of the download manifest that sits next to a county PDF folder.
+    Kept outside the folder so the PDF listings never pick it up.
+
+    Args:
+        save_dir (str): County PDF directory, e.g. ./output_files/Clark_pdfs
+
+    Returns:
+        path (str): Manifest path, e.g. ./output_files/Clark_pdfs_manifest.json
+
+    Example:
+        manifest_path('./output_files/Clark_pdfs')
+        >>> './output_files/Clark_pdfs_manifest.json'
+    """
+
+    save_dir = os.path.normpath(save_dir)
+    return os.path.join(
+        os.path.dirname(save_dir), f"{os.path.basename(save_dir)}_manifest.json"
+    )
+
+
+def load_manifest(path: str) -> Dict[str, Dict]:
+    """
+    Loads a download manifest, an empty manifest is returned if none exists yet.
+
+    Args:
+        path (str): Manifest path.
+
+    Returns:
+        manifest (dict): {pdf_name: {'url', 'etag', 'last_modified', 'size', 'sha256'}}
+    """
+
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: Dict[str, Dict], path: str) -> None:
+    """
+    Writes the manifest through a temp file and an atomic rename so a crash mid-write
+    never leaves a half written manifest behind.
+
+    Args:
+        manifest (dict): Manifest to save.
+        path (str): Manifest path.
+    """
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+    """
+    Builds conditional GET headers from a previous manifest entry.
+
+    Args:
+        entry (dict): Manifest entry of the previous download, or None.
+
+    Returns:
+        headers (dict): If-None-Match / If-Modified-Since headers, empty if nothing is known.
+
+    Example:
+        conditional_headers({'etag': '"abc"', 'last_modified': None})
+        >>> {'If-None-Match': '"abc"'}
+    """
+
+    headers = {}
+    if not entry:
+        return headers
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    SHA-256 of a file on disk, read in chunks.
+
+    Args:
+        path (str): File to hash.
+        chunk_size (int): Bytes read per chunk.
+
+    Returns:
+        digest (str): Hex digest.
+    """
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
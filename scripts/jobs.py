@@ -0,0 +1,106 @@
+import time
+import uuid
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+
+class JobManager:
+    """
+    Runs scrape jobs one at a time on a background worker thread so a request can return
+    straight away with a job id. A trigger that arrives while a job is queued or running gets
+    that job back instead of starting a second full scrape.
+
+    The run function is called as run(progress=callback) and must return (result, status_code),
+    like main.main; callback(name, status) records per-county progress as the job goes.
+
+    Example:
+        jobs = JobManager(main.main)
+        job, created = jobs.submit()
+        jobs.get(job['id'])
+        >>> {'id': '...', 'status': 'running', 'counties': {'Clark': {'status': 'running'}}, ...}
+    """
+
+    def __init__(self, run: Callable[..., Tuple[Dict, int]], history: int = 50):
+        self.run = run
+        self.history = history
+        self.jobs: Dict[str, Dict] = {}
+        self.active_id: Optional[str] = None
+        self.lock = threading.Lock()
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scrape-job")
+
+    def submit(self, **kwargs) -> Tuple[Dict, bool]:
+        """
+        Enqueues a run, kwargs are passed to the run function.
+
+        Returns:
+            job (dict): Snapshot of the new job, or of the job already queued/running.
+            created (bool): False when the trigger was deduplicated onto an existing job.
+        """
+
+        with self.lock:
+            if self.active_id is not None:
+                return self._snapshot(self.jobs[self.active_id]), False
+
+            job = {
+                "id": uuid.uuid4().hex,
+                "status": "queued",
+                "created": time.time(),
+                "started": None,
+                "finished": None,
+                "seconds": None,
+                "counties": {},
+                "result": None,
+                "status_code": None,
+                "error": None,
+            }
+            self.jobs[job["id"]] = job
+            self.active_id = job["id"]
+            self._trim()
+
+        self.worker.submit(self._execute, job, kwargs)
+        return self._snapshot(job), True
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return self._snapshot(job) if job is not None else None
+
+    def _execute(self, job: Dict, kwargs: Dict) -> None:
+        def progress(name, status):
+            with self.lock:
+                job["counties"][name] = dict(status)
+
+        with self.lock:
+            job["status"] = "running"
+            job["started"] = time.time()
+
+        try:
+            result, status_code = self.run(progress=progress, **kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            result, status_code, error = None, 500, repr(e)
+        else:
+            error = None
+
+        with self.lock:
+            job["finished"] = time.time()
+            job["seconds"] = round(job["finished"] - job["started"], 2)
+            job["result"] = result
+            job["status_code"] = status_code
+            job["error"] = error
+            if result is not None:
+                job["counties"].update(result.get("counties", {}))
+            job["status"] = "done" if status_code == 200 else "partial" if status_code == 207 else "failed"
+            self.active_id = None
+
+    def _trim(self) -> None:
+        # finished jobs beyond the history limit are forgotten, oldest first
+        finished = [job_id for job_id, job in self.jobs.items() if job_id != self.active_id]
+        for job_id in finished[: max(len(self.jobs) - self.history, 0)]:
+            del self.jobs[job_id]
+
+    @staticmethod
+    def _snapshot(job: Dict) -> Dict:
+        return {**job, "counties": {name: dict(status) for name, status in job["counties"].items()}}
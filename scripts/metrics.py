@@ -0,0 +1,244 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import config.CONFIG as CONFIG
+
+# prefix of every exported Prometheus metric
+PROMETHEUS_PREFIX = "nv_child_fatality_"
+
+METRIC_HELP = {
+    "stage_seconds": "Wall time of a pipeline stage.",
+    "pdfs_listed": "PDF links found on the county page.",
+    "pdfs_downloaded": "PDF requests by outcome: new, changed, unchanged, skipped (304) or failed.",
+    "download_bytes": "Bytes of PDFs transferred.",
+    "pdf_download_seconds": "Time to download one PDF.",
+    "pdfs_scraped": "PDFs whose fields were scraped.",
+    "pages_extracted": "PDF pages whose text was extracted.",
+    "pdf_extract_seconds": "Time to extract the text of one PDF.",
+    "pdf_parse_seconds": "Time to parse the fields of one PDF from its text.",
+    "text_cache_hits": "PDFs whose text came from the text cache instead of being extracted.",
+    "rows_written": "Rows in the county dataset written.",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def label_key(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels) + "}"
+
+
+def format_value(value: float) -> str:
+    # exact, '{:g}' would round a large counter to 6 significant digits (1.23457e+08)
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metrics:
+    """
+    Thread-safe counters and timers for one pipeline run, labelled by county and stage, plus the
+    cost of every PDF for a slow log of the most expensive ones. Counties run in threads and
+    record into the same registry; per PDF timings measured in pool workers are sent back with
+    the records and recorded here.
+
+    Example:
+        METRICS.reset()
+        with METRICS.timer("stage_seconds", county="Clark", stage="cleaning"):
+            final_df = cleaning_df(records, rename_cols, time_cols)
+        METRICS.inc("rows_written", len(final_df), county="Clark")
+        METRICS.report()
+        >>> {'started': ..., 'stages': {'Clark': {'cleaning': 0.21}}, 'counters': [...], ...}
+        METRICS.to_prometheus()
+        >>> '# HELP nv_child_fatality_stage_seconds Wall time of a pipeline stage.\\n...'
+    """
+
+    def __init__(self, slow_log_size: int = CONFIG.METRICS_SLOW_LOG):
+        self.slow_log_size = slow_log_size
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Starts a new run, everything recorded so far is dropped.
+        """
+
+        with self.lock:
+            self.started = time.time()
+            self.counters: Dict[Tuple[str, Labels], float] = {}
+            # (name, labels) -> [count, sum, max] seconds
+            self.timers: Dict[Tuple[str, Labels], List[float]] = {}
+            # (county, pdf) -> what each stage cost that PDF
+            self.pdf_costs: Dict[Tuple[str, str], Dict[str, float]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        key = (name, label_key(labels))
+        with self.lock:
+            timer = self.timers.setdefault(key, [0, 0.0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        # observes the time the block took, also when it raises
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def stage(self, county: str, stage: str):
+        """
+        Times a pipeline stage of a county, e.g. with METRICS.stage('Clark', 'write'): ...
+        """
+
+        return self.timer("stage_seconds", county=county, stage=stage)
+
+    def record_download(self, county: str, pdf: str, status: str, seconds: float, size: int = 0) -> None:
+        self.inc("pdfs_downloaded", county=county, status=status)
+        self.observe("pdf_download_seconds", seconds, county=county)
+        if size:
+            self.inc("download_bytes", size, county=county)
+        self._add_pdf_cost(county, pdf, download_seconds=seconds, bytes=size)
+
+    def record_pdf(
+        self, county: str, pdf: str, pages: int, extract_seconds: float, parse_seconds: float, cached: bool = False
+    ) -> None:
+        """
+        Records the scrape of one PDF, extract_seconds is 0 when its text came from the cache.
+        """
+
+        self.inc("pdfs_scraped", county=county)
+        if cached:
+            self.inc("text_cache_hits", county=county)
+        else:
+            self.inc("pages_extracted", pages, county=county)
+            self.observe("pdf_extract_seconds", extract_seconds, county=county)
+        self.observe("pdf_parse_seconds", parse_seconds, county=county)
+        self._add_pdf_cost(county, pdf, extract_seconds=extract_seconds, parse_seconds=parse_seconds, pages=pages)
+
+    def _add_pdf_cost(self, county: str, pdf: str, **costs) -> None:
+        with self.lock:
+            pdf_cost = self.pdf_costs.setdefault((county, pdf), {})
+            for key, value in costs.items():
+                pdf_cost[key] = pdf_cost.get(key, 0) + value
+
+    def slow_pdfs(self, n: Optional[int] = None) -> List[Dict]:
+        """
+        The n PDFs that took longest to download, extract and parse, slowest first.
+        """
+
+        with self.lock:
+            costs = [
+                {"county": county, "pdf": pdf, **cost} for (county, pdf), cost in self.pdf_costs.items()
+            ]
+        for cost in costs:
+            cost["seconds"] = sum(cost.get(key, 0) for key in ("download_seconds", "extract_seconds", "parse_seconds"))
+        costs.sort(key=lambda cost: cost["seconds"], reverse=True)
+        return [
+            {key: round(value, 4) if isinstance(value, float) else value for key, value in cost.items()}
+            for cost in costs[: self.slow_log_size if n is None else n]
+        ]
+
+    def report(self) -> Dict:
+        """
+        JSON ready run report: stage seconds per county, every counter and timer, and the slow log.
+        """
+
+        with self.lock:
+            counters = dict(self.counters)
+            timers = {key: list(value) for key, value in self.timers.items()}
+
+        stages: Dict[str, Dict[str, float]] = {}
+        for (name, labels), (_, total, _) in timers.items():
+            labels = dict(labels)
+            if name == "stage_seconds":
+                stages.setdefault(labels["county"], {})[labels["stage"]] = round(total, 4)
+
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "seconds": round(time.time() - self.started, 2),
+            "stages": stages,
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+            "timers": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": count,
+                    "sum": round(total, 6),
+                    "max": round(maximum, 6),
+                    "mean": round(total / count, 6) if count else 0.0,
+                }
+                for (name, labels), (count, total, maximum) in sorted(timers.items())
+            ],
+            "slow_pdfs": self.slow_pdfs(),
+        }
+
+    def write_report(self, path: str = CONFIG.METRICS_REPORT_PATH) -> Dict:
+        """
+        Writes the run report as JSON through a temp file and an atomic rename.
+        """
+
+        report = self.report()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, path)
+        return report
+
+    def to_prometheus(self) -> str:
+        """
+        Prometheus text exposition (format 0.0.4): counters as counters, timers as summaries
+        (_count and _sum) with a _max gauge next to them.
+        """
+
+        with self.lock:
+            counters = dict(self.counters)
+            timers = {key: list(value) for key, value in self.timers.items()}
+
+        lines = []
+        for name in sorted({name for name, _ in counters}):
+            metric = f"{PROMETHEUS_PREFIX}{name}_total"
+            lines.append(f"# HELP {metric} {METRIC_HELP.get(name, name)}")
+            lines.append(f"# TYPE {metric} counter")
+            for (counter_name, labels), value in sorted(counters.items()):
+                if counter_name == name:
+                    lines.append(f"{metric}{format_labels(labels)} {format_value(value)}")
+
+        for name in sorted({name for name, _ in timers}):
+            metric = f"{PROMETHEUS_PREFIX}{name}"
+            samples = sorted((labels, value) for (timer_name, labels), value in timers.items() if timer_name == name)
+            lines.append(f"# HELP {metric} {METRIC_HELP.get(name, name)}")
+            lines.append(f"# TYPE {metric} summary")
+            for labels, (count, total, _) in samples:
+                lines.append(f"{metric}_count{format_labels(labels)} {count}")
+                lines.append(f"{metric}_sum{format_labels(labels)} {total:.6f}")
+            lines.append(f"# HELP {metric}_max Slowest observation of {metric}.")
+            lines.append(f"# TYPE {metric}_max gauge")
+            for labels, (_, _, maximum) in samples:
+                lines.append(f"{metric}_max{format_labels(labels)} {maximum:.6f}")
+
+        return "\n".join(lines) + "\n"
+
+
+# registry of the running process, reset by main at the start of each run
+METRICS = Metrics()
@@ -0,0 +1,150 @@
+import re
+import fitz  # PyMuPDF
+import pdfplumber
+from typing import Iterator, List
+import config.CONFIG as CONFIG
+
+# Cache keys include the extractor version so upgrades never serve stale text
+PDFPLUMBER_EXTRACTOR = f"pdfplumber-{pdfplumber.__version__}"
+# "-2": pages without PyMuPDF's trailing newline, earlier entries may hold either shape
+PYMUPDF_EXTRACTOR = f"pymupdf-{fitz.VersionBind}-2"
+
+# Find the section starting with "G." and ending before "H." or the end of the document
+G_SECTION_PATTERN = re.compile(r"(?<=G\.).+?(?=H\.|\Z)", re.DOTALL)
+
+# Define a regex pattern for dates (MM/DD/YYYY or MM/DD/YY)
+DATE_PATTERN = re.compile(r"\b\d{1,2}/\d{1,2}/\d{2,4}\b")
+
+
+def count_dates_in_g_text(text: str) -> int:
+    """
+    Counts the prior CPS history dates listed in the "G." section of a disclosure's text.
+    Works on already extracted text so scraping and prior history can share one parse.
+
+    Args:
+        text (str): Full text of the PDF, pages joined in order.
+
+    Returns:
+        total_dates (int): Number of dates in section G, minus the form footer date.
+
+    Example:
+        count_dates_in_g_text('G. prior history\\n9/2/2014 referral\\nDate: 12/03/2021 footer\\nH. ...')
+        >>> 1
+    """
+
+    section_g = G_SECTION_PATTERN.search(text)
+    if not section_g:
+        return 0  # If "G." section is not found, return 0
+
+    # Find all dates in the "G." section
+    dates = DATE_PATTERN.findall(section_g.group(0))
+
+    # kevin intervention, ChatGPT cannot see multi-line 0400 12/03/2021 date from footer, simply subtract 1
+    if len(dates) == 0:
+        total_dates = len(dates)
+    else:
+        total_dates = len(dates) - 1
+
+    return total_dates
+
+
+def pdfplumber_iter_pages(full_file_path: str) -> Iterator[str]:
+    """
+    Yields the text of each page with pdfplumber, slower but keeps layout fidelity.
+    Each page's cached layout objects are released as soon as its text is read.
+    """
+
+    with pdfplumber.open(full_file_path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text() or ""
+            page.close()
+            yield page_text
+
+
+def pymupdf_page_text(page: fitz.Page) -> str:
+    # PyMuPDF ends each page with a newline, it is dropped so pages match pdfplumber's shape.
+    # Every PyMuPDF extraction goes through here, they share PYMUPDF_EXTRACTOR cache entries
+    return page.get_text().rstrip("\n")
+
+
+def pymupdf_iter_pages(full_file_path: str) -> Iterator[str]:
+    """
+    Yields the text of each page with PyMuPDF (fitz), several times faster than pdfplumber.
+    """
+
+    with fitz.open(full_file_path) as doc:
+        for page in doc:
+            yield pymupdf_page_text(page)
+
+
+# name -> (page text generator, cache version), "fitz" kept as an alias for PyMuPDF
+BACKENDS = {
+    "pdfplumber": (pdfplumber_iter_pages, PDFPLUMBER_EXTRACTOR),
+    "pymupdf": (pymupdf_iter_pages, PYMUPDF_EXTRACTOR),
+    "fitz": (pymupdf_iter_pages, PYMUPDF_EXTRACTOR),
+}
+
+
+def extractor_version(backend: str) -> str:
+    """
+    Cache version string of a backend, e.g. 'pdfplumber-0.11.10'.
+    """
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}, expected one of {sorted(BACKENDS)}")
+    return BACKENDS[backend][1]
+
+
+def iter_pages_text(full_file_path: str, backend: str = CONFIG.PDF_BACKEND) -> Iterator[str]:
+    """
+    Lazily extracts page text, a page is only parsed when the caller asks for it and the PDF
+    is closed when the generator is exhausted or closed.
+
+    Args:
+        full_file_path (str): Path of the PDF.
+        backend (str): 'pdfplumber' for fidelity or 'pymupdf' (alias 'fitz') for throughput.
+
+    Returns:
+        pages_text (generator): One string per page, empty string for pages without text.
+
+    Example:
+        with closing(iter_pages_text('./output_files/Clark_pdfs/2023-01-17_ID_1469166.pdf')) as pages:
+            first_page = next(pages)
+    """
+
+    extractor_version(backend)  # validates the backend name
+    return BACKENDS[backend][0](full_file_path)
+
+
+def extract_pages_text(full_file_path: str, backend: str = CONFIG.PDF_BACKEND) -> List[str]:
+    """
+    Extracts the text of every page of a PDF with the chosen backend.
+
+    Args:
+        full_file_path (str): Path of the PDF.
+        backend (str): 'pdfplumber' for fidelity or 'pymupdf' (alias 'fitz') for throughput.
+
+    Returns:
+        pages_text (list): One string per page, empty string for pages without text.
+
+    Example:
+        extract_pages_text('./output_files/Clark_pdfs/2023-01-17_ID_1469166.pdf', backend='pymupdf')
+    """
+
+    return list(iter_pages_text(full_file_path, backend))
+
+
+def extract_pymupdf_pages_text(pdf_data: bytes) -> List[str]:
+    """
+    Extracts the text of every page of a PDF held in memory with PyMuPDF.
+
+    Args:
+        pdf_data (bytes): Binary content of the PDF.
+
+    Returns:
+        pages_text (list): One string per page, shaped like pymupdf_iter_pages' pages.
+    """
+
+    # Open the PDF from the binary data
+    with fitz.open(stream=pdf_data, filetype="pdf") as doc:
+        return [pymupdf_page_text(page) for page in doc]
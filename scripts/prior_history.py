@@ -1,40 +1,24 @@
 import os
 import pandas as pd
-import fitz  # PyMuPDF
-import re
+import hashlib
+import config.CONFIG as CONFIG
 from .child_fatality_scrape import *
+from .pdf_text import count_dates_in_g_text, extract_pymupdf_pages_text, PYMUPDF_EXTRACTOR
+from .text_cache import get_text_cache
+from .columnar import read_dataset, write_dataset
+from .metrics import METRICS
+
+MERGE_KEYS = ['original_region', 'original_pdf']
+PRIOR_COUNT_COLUMNS = MERGE_KEYS + ['prior_cases_count']
 
 # Function to count dates in the "G." section of a PDF
 def count_dates_in_g_section(pdf_data):
-    # Open the PDF from the binary data
-    doc = fitz.open(stream=pdf_data, filetype="pdf")
-    text = ""
     # Extract text from each page
-    for page in doc:
-        text += page.get_text()
-    doc.close()
-    
-    # Find the section starting with "G." and ending before "H." or the end of the document
-    section_g = re.search(r'(?<=G\.).+?(?=H\.|\Z)', text, re.DOTALL)
-    if not section_g:
-        return 0  # If "G." section is not found, return 0
-
-    section_g_text = section_g.group(0)
-    # print(section_g_text)
-    # Define a regex pattern for dates (MM/DD/YYYY or MM/DD/YY)
-    date_pattern = re.compile(r'\b\d{1,2}/\d{1,2}/\d{2,4}\b')
-    # Find all dates in the "G." section
-    dates = date_pattern.findall(section_g_text)
-
-    # kevin intervention, ChatGPT cannot see multi-line 0400 12/03/2021 date from footer, simply subtract 1
-    if len(dates)==0:
-        total_dates = len(dates)
-    else:
-        total_dates = len(dates) - 1
+    text = "\n".join(extract_pymupdf_pages_text(pdf_data))
 
-    return total_dates
+    return count_dates_in_g_text(text)
 
-def count_pdf_paths(pdf_paths):
+def count_pdf_paths(pdf_paths, cache=None):
     # Dictionary to hold the counts of dates for each PDF
     date_counts = {}
 
@@ -43,15 +27,26 @@ def count_pdf_paths(pdf_paths):
         # Read the binary data of the PDF file
         with open(pdf_path, "rb") as f:
             pdf_data = f.read()
-        # Count the dates in the "G." section
-        date_counts[pdf_path] = count_dates_in_g_section(pdf_data)
+
+        if cache is None:
+            # Count the dates in the "G." section
+            date_counts[pdf_path] = count_dates_in_g_section(pdf_data)
+            continue
+
+        # unchanged PDFs reuse the text extracted on a previous run
+        pdf_sha256 = hashlib.sha256(pdf_data).hexdigest()
+        pages_text = cache.get(pdf_sha256, PYMUPDF_EXTRACTOR)
+        if pages_text is None:
+            pages_text = extract_pymupdf_pages_text(pdf_data)
+            cache.put(pdf_sha256, PYMUPDF_EXTRACTOR, pages_text)
+        date_counts[pdf_path] = count_dates_in_g_text("\n".join(pages_text))
 
     return date_counts
 
-def turn_pdf_counts_into_dataframe(pdf_paths):
+def turn_pdf_counts_into_dataframe(pdf_paths, cache=None):
 
     # calls count_pdf_paths(count_dates_in_g_section()) for each pdf
-    count_pdf_dict = count_pdf_paths(pdf_paths)
+    count_pdf_dict = count_pdf_paths(pdf_paths, cache=cache)
 
     # display(count_pdf_dict)
     processed_dict = {'/'.join(key.split('/')[-2:]): value for key, value in count_pdf_dict.items()}
@@ -111,105 +106,145 @@ def list_csv_files(directory):
     
     return csv_files
 
-def dataframe_for_each_region(directory_path):
-    
+def prior_counts_from_scrape(child_fatality):
+
+    # prior_cases_count is now counted during scraping from the same extracted text,
+    # so reuse it instead of opening and parsing every PDF a second time
+    if isinstance(child_fatality, pd.DataFrame):
+        df = child_fatality
+    else:
+        df = read_dataset(child_fatality, columns=PRIOR_COUNT_COLUMNS)
+    if 'prior_cases_count' not in df.columns:
+        return None
+    return df[PRIOR_COUNT_COLUMNS]
+
+def scraped_county_files(directory_path):
+
+    # {county: child_fatality csv path} for every county scraped into directory_path
+    return {
+        csv_file[len('child_fatality_'):-len('.csv')]: os.path.join(directory_path, csv_file)
+        for csv_file in sorted(list_csv_files(directory_path))
+        if csv_file.startswith('child_fatality_')
+    }
+
+def dataframe_for_each_region(directory_path, frames=None, write_intermediate=CONFIG.WRITE_INTERMEDIATE_CSVS):
+
+    # {county: DataFrame of original_region, original_pdf, prior_cases_count}
+    prior_counts = {}
+
+    # counties scraped since prior_cases_count moved into the scrape need no PDF parsing,
+    # frames handed over in memory are used before anything is read from disk
+    sources = scraped_county_files(directory_path)
+    sources.update(frames or {})
+    for county, source in sources.items():
+        # timed per county, together with its merge in merge_and_save_csv
+        with METRICS.stage(county, "prior_history"):
+            df = prior_counts_from_scrape(source)
+        if df is not None:
+            print(f"{county}: prior history counts taken from the scrape")
+            prior_counts[county] = df
+
+    # older csvs without prior_cases_count fall back to counting from the PDFs
     pdf_folders = list_files_and_folders(directory_path)
+    cache = get_text_cache()
 
     for pdf_folder in pdf_folders:
+        df_name = pdf_folder.split("/")[-1]
+        county = df_name.replace('_pdfs', '')
+        if county in prior_counts:
+            continue
         print(pdf_folder)
         pdf_paths = list_files(pdf_folder, append_base_path=True)
-        df = turn_pdf_counts_into_dataframe(pdf_paths=pdf_paths)
+        pdf_paths = [path for path in pdf_paths if path.lower().endswith(".pdf")]
+        with METRICS.stage(county, "prior_history"):
+            prior_counts[county] = turn_pdf_counts_into_dataframe(pdf_paths=pdf_paths, cache=cache)
 
-        # output count csvs to folder
-        df_name = pdf_folder.split("/")[-1]
-        df.to_csv(os.path.join(directory_path, f"{df_name}_prior_counts.csv"), index=False)
+    # count csvs are only debug artifacts now, the merge takes the frames directly
+    if write_intermediate:
+        for county, df in prior_counts.items():
+            df.to_csv(os.path.join(directory_path, f"{county}_pdfs_prior_counts.csv"), index=False)
 
-def merge_and_save_csv(directory):
-    files_to_merge = [
-        ('Rural_pdfs_prior_counts.csv', 'child_fatality_Rural.csv'),
-        ('Washoe_pdfs_prior_counts.csv', 'child_fatality_Washoe.csv'),
-        ('Clark_pdfs_prior_counts.csv', 'child_fatality_Clark.csv')
-    ]
+    return prior_counts
 
-    # Append the directory to each file in the tuple pairs and update the region name extraction
-    files_to_merge_with_path = [
-        (os.path.join(directory, file1), os.path.join(directory, file2), file1.split('_')[0])
-        for file1, file2 in files_to_merge
-    ]
+def merge_prior_counts(df_child_fatality, df_prior_counts):
 
-    # Iterate over the files to merge them
-    for prior_counts_file, child_fatality_file, region_name in files_to_merge_with_path:
-        # Read the DataFrames from the files
-        df_prior_counts = pd.read_csv(prior_counts_file)
-        df_child_fatality = pd.read_csv(child_fatality_file)
+    ### BUG: original_region in df_prior_counts counted from PDF folders can be "output_files"
+    # rather than county, so they are not merging properly
 
+    # df_prior_counts
 
+    # original_region                          original_pdf  prior_cases_count
+    #   output_files         Rural_pdfs\1453180_5_2_23.pdf                  8
+    #   output_files  Rural_pdfs\1462383_60_day_update.pdf                  0
 
+    # df_child_fatality
 
-        ### BUG: original_region in df_prior_counts is now "output_files" rather than county
+    # original_region                original_pdf
+    #    Rural                     1453180_5_2_23.pdf
 
+    ###
 
-        # so they are not merging properly
+    # counts scraped alongside the fields are already in df_prior_counts, avoid _x/_y columns
+    df_child_fatality = df_child_fatality.drop(columns=['prior_cases_count'], errors='ignore')
 
-    # df_prior_counts
-        
-        # original_region                          original_pdf  prior_cases_count
-        #   output_files         Rural_pdfs\1453180_5_2_23.pdf                  8
-        #   output_files  Rural_pdfs\1462383_60_day_update.pdf                  0
-        
-        # df_child_fatality
+    # left join against counts indexed on ('original_region', 'original_pdf')
+    counts = df_prior_counts.drop_duplicates(subset=MERGE_KEYS, keep='last').set_index(MERGE_KEYS)
+    merged_df = df_child_fatality.join(counts['prior_cases_count'], on=MERGE_KEYS)
 
-        # original_region                original_pdf
-        #    Rural                     1453180_5_2_23.pdf
+    # some that don't span multi-pages end up with -1 and needs to be a zero instead
+    merged_df['prior_cases_count'] = merged_df['prior_cases_count'].replace(-1, 0)
 
+    # Get a list of all column names
+    columns = list(merged_df.columns)
 
+    # Remove 'prior_cases_count' from the list
+    columns.remove('prior_cases_count')
 
-        ###
+    # Insert 'prior_cases_count' at the desired new position (index 2 for the third position, as indexing starts at 0)
+    columns.insert(2, 'prior_cases_count')
 
+    # Reindex the DataFrame with the new column order
+    return merged_df[columns]
 
+def merge_and_save_csv(directory, frames=None, prior_counts=None):
 
+    # every county that was scraped, from memory when given, otherwise child_fatality_{county} on disk
+    frames = dict(frames or {})
+    for county, child_fatality_file in scraped_county_files(directory).items():
+        if county not in frames:
+            frames[county] = read_dataset(child_fatality_file)
 
-        
-        # Merge the DataFrames on 'original_region' and 'original_pdf'
-        merged_df = pd.merge(df_child_fatality, 
-                             df_prior_counts[['original_region', 'original_pdf', 'prior_cases_count']],
-                             on=['original_region', 'original_pdf'], how='left')
-        
-        # some that don't span multi-pages end up with -1 and needs to be a zero instead
-        merged_df['prior_cases_count'] = merged_df['prior_cases_count'].replace(-1, 0)
-        # print(merged_df.head())
+    merged = {}
+    for region_name, df_child_fatality in frames.items():
+        with METRICS.stage(region_name, "prior_history"):
+            if prior_counts is not None and region_name in prior_counts:
+                df_prior_counts = prior_counts[region_name]
+            else:
+                # debug artifact written by an earlier run
+                df_prior_counts = pd.read_csv(os.path.join(directory, f"{region_name}_pdfs_prior_counts.csv"))
 
-        # Get a list of all column names
-        columns = list(merged_df.columns)
+            merged_df = merge_prior_counts(df_child_fatality, df_prior_counts)
 
-        # Remove 'prior_cases_count' from the list
-        columns.remove('prior_cases_count')
+            # Construct the output filename
+            output_filename = f"{region_name}_merged.csv"
 
-        # Insert 'prior_cases_count' at the desired new position (index 2 for the third position, as indexing starts at 0)
-        columns.insert(2, 'prior_cases_count')
+            # Save the merged DataFrame to the specified directory
+            output_filepath = os.path.join(directory, output_filename)
+            print(output_filepath)
+            merged[region_name] = write_dataset(merged_df, output_filepath)
+            print(f"Saved merged file to {output_filepath}")
 
-        # Reindex the DataFrame with the new column order
-        merged_df = merged_df[columns]
-        
-        # Construct the output filename
-        output_filename = f"{region_name}_merged.csv"
-        
-        # Save the merged DataFrame to the specified directory
-        output_filepath = os.path.join(directory, output_filename)
-        print(output_filepath)
-        merged_df.to_csv(output_filepath, index=False)
-        print(f"Saved merged file to {output_filepath}")
+    return merged
 
-def run_and_merge_prior_history_counts(directory):
+def run_and_merge_prior_history_counts(directory, frames=None, write_intermediate=CONFIG.WRITE_INTERMEDIATE_CSVS):
 
-    # creates an output csv for each dataframe of counts
-    dataframe_for_each_region(directory)
+    # prior history counts for each county, kept in memory
+    prior_counts = dataframe_for_each_region(directory, frames=frames, write_intermediate=write_intermediate)
 
-    # merge original fatality scraping and newly created prior history counts together
-    merge_and_save_csv(directory)
+    # merge original fatality scraping and prior history counts together
+    return merge_and_save_csv(directory, frames=frames, prior_counts=prior_counts)
 
 
 if __name__ == "__main__":
 
-    run_and_merge_prior_history_counts()
-
+    run_and_merge_prior_history_counts(directory="./output_files/")
@@ -0,0 +1,357 @@
+import os
+import re
+import sys
+import json
+import math
+import time
+import hashlib
+import argparse
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import config.CONFIG as CONFIG
+
+# free text columns that are indexed, in this order
+SEARCH_FIELDS = ["summary_of_incident", "cause_of_incident_if_determined"]
+
+# each field's positions start FIELD_GAP past the previous field's last token, so a phrase
+# never matches across two fields however long a summary is
+FIELD_GAP = 1000
+
+# bumped when positions are laid out differently, an older saved index is rebuilt
+INDEX_VERSION = 2
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+QUERY_PATTERN = re.compile(r'(-?)"([^"]*)"|(\S+)')
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase alphanumeric tokens, hyphens and punctuation split words.
+
+    Example:
+        tokenize('Co-sleeping; the child was NOT breathing.')
+        >>> ['co', 'sleeping', 'the', 'child', 'was', 'not', 'breathing']
+    """
+
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_query(query: str) -> List[Tuple[List[Tuple[str, ...]], List[Tuple[str, ...]]]]:
+    """
+    Parses a query into OR groups of (required clauses, excluded clauses). A clause is a tuple
+    of tokens, more than one token is a phrase. Words are ANDed, OR starts a new group,
+    NOT or a leading - excludes the next word or "quoted phrase". A hyphenated word is a phrase.
+
+    Example:
+        parse_query('marijuana "edible gummies" OR co-sleeping -hospital')
+        >>> [([('marijuana',), ('edible', 'gummies')], []), ([('co', 'sleeping')], [('hospital',)])]
+    """
+
+    groups = [([], [])]
+    negate = False
+    for match in QUERY_PATTERN.finditer(query):
+        minus, phrase, word = match.groups()
+        if word == "OR":
+            groups.append(([], []))
+            continue
+        if word == "AND":
+            continue
+        if word == "NOT":
+            negate = True
+            continue
+
+        if phrase is not None:
+            negated, tokens = bool(minus), tokenize(phrase)
+        else:
+            negated, tokens = word.startswith("-"), tokenize(word.lstrip("-"))
+        if tokens:
+            groups[-1][1 if negate or negated else 0].append(tuple(tokens))
+        negate = False
+
+    return [group for group in groups if group[0] or group[1]]
+
+
+class SearchIndex:
+    """
+    Positional inverted index over the incident summary and cause of every disclosure, with
+    boolean and phrase queries ranked by BM25. Documents are keyed '{original_region}/{original_pdf}'
+    and can be added, replaced or removed one at a time, so new PDFs never need a rebuild.
+
+    Example:
+        index = SearchIndex.load('./output_files/search_index.json')
+        index.update_frame(final_df)
+        index.search('"co sleeping" OR drowning -bathtub', top=10)
+        >>> [('Clark/2023-01-17_ID_1469166.pdf', 7.41), ...]
+        index.save('./output_files/search_index.json')
+    """
+
+    def __init__(self):
+        # term -> {doc_id: [positions]}
+        self.postings: Dict[str, Dict[str, List[int]]] = {}
+        # doc_id -> distinct terms, so a document can be removed without scanning the vocabulary
+        self.doc_terms: Dict[str, List[str]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        # doc_id -> hash of the indexed text, unchanged documents are skipped on update
+        self.doc_hashes: Dict[str, str] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: str, fields: Iterable[Optional[str]]) -> bool:
+        """
+        Indexes one document, replacing an older version of it.
+
+        Args:
+            doc_id (str): '{original_region}/{original_pdf}'
+            fields (iterable): Text of each field, None/NaN for a missing field.
+
+        Returns:
+            changed (bool): False if the document was already indexed with the same text.
+        """
+
+        texts = [text if isinstance(text, str) else "" for text in fields]
+        text_hash = hashlib.sha1("\x00".join(texts).encode()).hexdigest()
+        if self.doc_hashes.get(doc_id) == text_hash:
+            return False
+        self.remove(doc_id)
+
+        positions: Dict[str, List[int]] = {}
+        length = offset = 0
+        for text in texts:
+            tokens = tokenize(text)
+            for position, token in enumerate(tokens):
+                positions.setdefault(token, []).append(offset + position)
+            length += len(tokens)
+            offset += len(tokens) + FIELD_GAP
+
+        for token, token_positions in positions.items():
+            self.postings.setdefault(token, {})[doc_id] = token_positions
+        self.doc_terms[doc_id] = list(positions)
+        self.doc_lengths[doc_id] = length
+        self.doc_hashes[doc_id] = text_hash
+        self.total_length += length
+        return True
+
+    def remove(self, doc_id: str) -> bool:
+        """
+        Removes a document, returns False if it wasn't indexed.
+        """
+
+        if doc_id not in self.doc_lengths:
+            return False
+        for token in self.doc_terms.pop(doc_id):
+            docs = self.postings[token]
+            del docs[doc_id]
+            if not docs:
+                del self.postings[token]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        del self.doc_hashes[doc_id]
+        return True
+
+    def update_frame(self, df: pd.DataFrame) -> Dict[str, int]:
+        """
+        Brings the index in line with a cleaned county DataFrame (the cleaning_df output): new and
+        edited disclosures are (re)indexed, unchanged ones skipped and documents of the frame's
+        regions that are no longer in it removed.
+
+        Returns:
+            counts (dict): Number of documents 'indexed', 'unchanged' and 'removed'.
+        """
+
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0}
+        fields = [df[field] if field in df.columns else pd.Series(None, index=df.index) for field in SEARCH_FIELDS]
+        doc_ids = (df["original_region"].astype(str) + "/" + df["original_pdf"].astype(str)).tolist()
+        for doc_id, *texts in zip(doc_ids, *fields):
+            counts["indexed" if self.add(doc_id, texts) else "unchanged"] += 1
+
+        current = set(doc_ids)
+        regions = {f"{region}/" for region in df["original_region"].astype(str).unique()}
+        for doc_id in [doc_id for doc_id in self.doc_lengths if doc_id not in current]:
+            if doc_id[: doc_id.index("/") + 1] in regions:
+                self.remove(doc_id)
+                counts["removed"] += 1
+        return counts
+
+    def _docs_with(self, clause: Tuple[str, ...]) -> Set[str]:
+        # documents containing a term, or every term of a phrase at consecutive positions
+        postings = [self.postings.get(token, {}) for token in clause]
+        docs = set(min(postings, key=len))
+        for docs_of_token in postings:
+            docs.intersection_update(docs_of_token)
+        if len(clause) == 1:
+            return docs
+
+        matches = set()
+        for doc_id in docs:
+            starts = set(postings[0][doc_id])
+            for i, docs_of_token in enumerate(postings[1:], start=1):
+                starts.intersection_update(position - i for position in docs_of_token[doc_id])
+                if not starts:
+                    break
+            if starts:
+                matches.add(doc_id)
+        return matches
+
+    def match(self, query: str) -> Set[str]:
+        """
+        Every document the boolean query matches, unranked.
+        """
+
+        matched: Set[str] = set()
+        for required, excluded in parse_query(query):
+            if required:
+                required = sorted(required, key=lambda clause: min(len(self.postings.get(t, {})) for t in clause))
+                docs = self._docs_with(required[0])
+                for clause in required[1:]:
+                    if not docs:
+                        break
+                    docs &= self._docs_with(clause)
+            else:
+                docs = set(self.doc_lengths)
+            for clause in excluded:
+                docs -= self._docs_with(clause)
+            matched |= docs
+        return matched
+
+    def search(self, query: str, top: Optional[int] = 10) -> List[Tuple[str, float]]:
+        """
+        Matching documents ranked by BM25 over the query's (non excluded) terms.
+
+        Args:
+            query (str): e.g. 'marijuana', '"co sleeping" OR drowning', 'fentanyl -hospital'
+            top (int): Number of results, None for all of them.
+
+        Returns:
+            results (list): (doc_id, score) pairs, best first.
+        """
+
+        docs = self.match(query)
+        if not docs:
+            return []
+
+        terms = {token for required, _ in parse_query(query) for clause in required for token in clause}
+        n_docs = len(self.doc_lengths)
+        average_length = self.total_length / n_docs if n_docs else 0.0
+
+        scores = dict.fromkeys(docs, 0.0)
+        for term in terms:
+            postings = self.postings.get(term, {})
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id in docs.intersection(postings):
+                tf = len(postings[doc_id])
+                norm = K1 * (1 - B + B * self.doc_lengths[doc_id] / average_length) if average_length else K1
+                scores[doc_id] += idf * tf * (K1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(doc_id, round(score, 4)) for doc_id, score in ranked[:top]]
+
+    def save(self, path: str) -> None:
+        """
+        Writes the index as JSON through a temp file and an atomic rename.
+        """
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "fields": SEARCH_FIELDS,
+                    "postings": self.postings,
+                    "doc_terms": self.doc_terms,
+                    "doc_lengths": self.doc_lengths,
+                    "doc_hashes": self.doc_hashes,
+                },
+                f,
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SearchIndex":
+        """
+        Loads a saved index, an empty one if there is none yet, it indexed other fields or it
+        was saved by another INDEX_VERSION.
+        """
+
+        index = cls()
+        if not os.path.exists(path):
+            return index
+        with open(path, "r") as f:
+            saved = json.load(f)
+        if saved.get("version") != INDEX_VERSION or saved.get("fields") != SEARCH_FIELDS:
+            return index
+
+        index.postings = saved["postings"]
+        index.doc_terms = saved["doc_terms"]
+        index.doc_lengths = saved["doc_lengths"]
+        index.doc_hashes = saved["doc_hashes"]
+        index.total_length = sum(index.doc_lengths.values())
+        return index
+
+
+def update_search_index(frames: Dict[str, pd.DataFrame], path: str = CONFIG.SEARCH_INDEX_PATH) -> SearchIndex:
+    """
+    Pipeline stage after cleaning_df: folds each county's cleaned frame into the saved index.
+
+    Args:
+        frames (dict): {county: cleaned DataFrame}
+        path (str): Saved index.
+
+    Returns:
+        index (SearchIndex): The updated index.
+    """
+
+    index = SearchIndex.load(path)
+    for county, df in frames.items():
+        counts = index.update_frame(df)
+        print(f"{county}: search index {counts}")
+    index.save(path)
+    return index
+
+
+def build_from_directory(directory: str, path: str = CONFIG.SEARCH_INDEX_PATH) -> SearchIndex:
+    """
+    (Re)indexes every {county}_merged dataset in directory.
+    """
+
+    # imported here, the pipeline stage above doesn't need to read datasets
+    from .columnar import read_dataset
+
+    frames = {}
+    for file_name in sorted(os.listdir(directory)):
+        if file_name.endswith("_merged.csv"):
+            frames[file_name[: -len("_merged.csv")]] = read_dataset(os.path.join(directory, file_name))
+    return update_search_index(frames, path)
+
+
+if __name__ == "__main__":
+    # python -m scripts.search_index build ./output_files
+    # python -m scripts.search_index query '"co sleeping" OR drowning' --top 20
+    parser = argparse.ArgumentParser(description="Full text search over incident summaries and causes")
+    parser.add_argument("--index", default=CONFIG.SEARCH_INDEX_PATH, help="saved index path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="index every {county}_merged dataset in a directory")
+    build.add_argument("directory", nargs="?", default=os.path.join(".", "output_files"))
+    search = commands.add_parser("query", help="run a query against the saved index")
+    search.add_argument("query")
+    search.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = build_from_directory(args.directory, args.index)
+        print(f"Indexed {len(index)} documents, {len(index.postings)} terms into {args.index}")
+        sys.exit(0)
+
+    index = SearchIndex.load(args.index)
+    start = time.perf_counter()
+    results = index.search(args.query, top=args.top)
+    elapsed_ms = 1000 * (time.perf_counter() - start)
+    for doc_id, score in results:
+        print(f"{score:8.3f}  {doc_id}")
+    print(f"{len(index.match(args.query))} matches in {len(index)} documents ({elapsed_ms:.3f} ms)")
@@ -0,0 +1,374 @@
+import os
+import json
+import time
+import queue
+import threading
+import requests
+import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+import config.CONFIG as CONFIG
+from .child_fatality_scrape import (
+    make_session,
+    find_pdf_links,
+    timed_download_pdf,
+    scrape_pdf_file_timed,
+    extract_pages_text_timed,
+    scrape_text,
+    record_scrape,
+    cleaning_df,
+    empty_dataset,
+    list_files,
+    upsert_records,
+)
+from .download_manifest import load_manifest, save_manifest, manifest_path, sha256_file
+from .build_state import build_state_path, load_build_state, save_build_state, diff_build_state
+from .pdf_text import extractor_version
+from .text_cache import TextCache, get_text_cache
+from .columnar import CATEGORY_COLUMNS, DatasetWriter, read_dataset, write_dataset
+from .metrics import METRICS
+
+# end of stream marker passed down every queue
+DONE = object()
+
+
+def stream_county(
+    url: str,
+    keys: List[str],
+    rename_cols: Dict[str, str],
+    time_cols: List[str],
+    download_workers: int = CONFIG.DOWNLOAD_WORKERS,
+    workers: Optional[int] = CONFIG.SCRAPE_WORKERS,
+    queue_size: int = CONFIG.STREAM_QUEUE_SIZE,
+    cache: Optional[TextCache] = None,
+    backend: str = CONFIG.PDF_BACKEND,
+    executor: Optional[ProcessPoolExecutor] = None,
+    incremental: bool = CONFIG.INCREMENTAL_REFRESH,
+    chunk_size: int = CONFIG.STREAM_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Downloads, scrapes and saves one county as a pipeline of stages joined by bounded queues,
+    instead of finishing every download before the first PDF is opened:
+
+        page links -> download threads -> extraction processes -> parsing thread -> record spool -> chunked cleaning/writing
+
+    A PDF is extracted as soon as its download lands, and each record is appended to a JSONL
+    spool (./output_files/child_fatality_{county}.jsonl) the moment it is parsed. A full queue
+    blocks the stage feeding it, so at most ~queue_size PDFs (or their page text) are waiting
+    or in flight between stages however large the archive is. The spool is then cleaned and
+    written chunk_size records at a time: one pass works out the date order (see sort_spool),
+    a second cleans each chunk in that order and appends it to the CSV and typed file through
+    a DatasetWriter. Apart from each PDF's date, memory stays flat until the saved dataset is
+    read back as the return value.
+
+    The output matches run_pdf_scraping_URL row for row, and the download manifest and build
+    state are updated the same way. In incremental mode PDFs whose content hash matches the
+    last build are not extracted, and the new rows are upserted into the existing dataset,
+    which is loaded in memory like run_pdf_scraping_URL does.
+
+    Args:
+        url (str): County page listing the PDFs.
+        keys (list): List of keys to initialize the dictionary with for data scraping.
+        rename_cols (dict): Dictionary mapping old column names to new column names for cleaning the DataFrame.
+        time_cols (list): List of columns that contain dates for converting to datetime.
+        download_workers (int): PDFs downloaded at the same time.
+        workers (int): Extraction processes, 1 (or None) extracts in a thread of this process.
+        queue_size (int): Capacity of each queue, and PDFs being extracted at most.
+        cache (TextCache): Extracted-text cache, None always extracts.
+        backend (str): Text extraction backend, 'pdfplumber' or 'pymupdf'.
+        executor (ProcessPoolExecutor): Process pool shared with other counties, None starts its own.
+        incremental (bool): Only scrape PDFs added or changed since the last run and upsert them.
+        chunk_size (int): Records cleaned and written at a time.
+
+    Returns:
+        final_df (DataFrame): The cleaned, typed county DataFrame that was saved.
+
+    Example:
+        stream_county('https://dcfs.nv.gov/Programs/CWS/CPS/ChildFatalities/Rural/',
+                      CONFIG.KEYS, CONFIG.RENAME_COLS, CONFIG.TIME_COLS, queue_size=16)
+    """
+
+    county = url.split("/")[-2]
+    save_dir = os.path.join(".", "output_files", f"{county}_pdfs")
+    os.makedirs(save_dir, exist_ok=True)
+    csv_filename = os.path.join(".", "output_files", f"child_fatality_{county}.csv")
+    spool_path = os.path.join(".", "output_files", f"child_fatality_{county}.jsonl")
+
+    # the last build, only PDFs that differ from it are scraped in incremental mode
+    state_path = build_state_path(csv_filename)
+    existing, state = None, {}
+    if incremental and os.path.exists(csv_filename) and os.path.exists(state_path):
+        existing = read_dataset(csv_filename)
+        state = load_build_state(state_path)
+
+    session = make_session(pool_size=download_workers)
+    manifest_file = manifest_path(save_dir)
+    old_manifest = load_manifest(manifest_file)
+    manifest, built_from, queued = {}, {}, set()
+    counts = {"new": 0, "changed": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+    errors = []
+    lock = threading.Lock()
+
+    href_queue = queue.Queue(maxsize=queue_size)
+    pdf_queue = queue.Queue(maxsize=queue_size)
+    # futures of the PDFs being extracted, in submission order, a full queue holds back extraction
+    extracted_queue = queue.Queue(maxsize=queue_size)
+    record_queue = queue.Queue(maxsize=queue_size)
+
+    def discover():
+        try:
+            with METRICS.stage(county, "listing"):
+                hrefs = find_pdf_links(url, session)
+            METRICS.inc("pdfs_listed", len(hrefs), county=county)
+            for href in hrefs:
+                href_queue.put(href)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            for _ in range(download_workers):
+                href_queue.put(DONE)
+
+    def download():
+        while (href := href_queue.get()) is not DONE:
+            pdf_name = os.path.basename(href)
+            try:
+                status, entry = timed_download_pdf(county, href, save_dir, session, old_manifest.get(pdf_name))
+            except requests.RequestException as e:
+                print(f"Failed to download {href}: {e}")
+                with lock:
+                    counts["failed"] += 1
+                    # keep the old entry so the file is retried conditionally next run
+                    if pdf_name in old_manifest:
+                        manifest[pdf_name] = old_manifest[pdf_name]
+            except Exception as e:
+                errors.append(e)
+                continue
+            else:
+                with lock:
+                    counts[status] += 1
+                    manifest[pdf_name] = entry
+
+            # a copy from an earlier run is still scraped when the download fails, like a batch run
+            pdf_path = os.path.join(save_dir, pdf_name)
+            with lock:
+                is_new = os.path.exists(pdf_path) and pdf_name not in queued
+                queued.add(pdf_name)
+            if is_new:
+                pdf_queue.put(pdf_path)
+
+    def download_all():
+        try:
+            with ThreadPoolExecutor(max_workers=download_workers) as download_pool:
+                for _ in range(download_workers):
+                    download_pool.submit(download)
+
+            # local PDFs no longer linked on the page, a batch run lists these too
+            for pdf_name in sorted(os.listdir(save_dir)):
+                if pdf_name.lower().endswith(".pdf") and pdf_name not in queued:
+                    queued.add(pdf_name)
+                    pdf_queue.put(os.path.join(save_dir, pdf_name))
+        finally:
+            pdf_queue.put(DONE)
+
+    pool = executor
+    if pool is None and workers and workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    extractor = extractor_version(backend)
+
+    def completed(result) -> Future:
+        future = Future()
+        future.set_result(result)
+        return future
+
+    def extract():
+        # hands each PDF to the pool, the results are picked up in order by parse()
+        try:
+            while (pdf_path := pdf_queue.get()) is not DONE:
+                try:
+                    pdf_sha256 = sha256_file(pdf_path)
+                    pdf_name = os.path.basename(pdf_path)
+                    built_from[pdf_name] = pdf_sha256
+                    if existing is not None and state.get(pdf_name) == pdf_sha256:
+                        continue  # unchanged since the last build, its rows are kept
+
+                    if cache is not None:
+                        pages_text = cache.get(pdf_sha256, extractor)
+                        if pages_text is not None:
+                            extracted_queue.put((pdf_path, pdf_sha256, True, completed((pages_text, 0.0))))
+                            continue
+                        task = (extract_pages_text_timed, pdf_path, backend)
+                    else:
+                        task = (scrape_pdf_file_timed, pdf_path, keys, backend)
+
+                    future = pool.submit(*task) if pool is not None else completed(task[0](*task[1:]))
+                    # blocks once queue_size PDFs are being extracted, which backs up the downloads
+                    extracted_queue.put((pdf_path, pdf_sha256, False, future))
+                except Exception as e:
+                    errors.append(e)
+        finally:
+            extracted_queue.put(DONE)
+
+    def parse():
+        # parses in its own thread, so the pool's result delivery (shared with other counties) never waits on it
+        try:
+            while (item := extracted_queue.get()) is not DONE:
+                pdf_path, pdf_sha256, from_cache, future = item
+                try:
+                    # (page texts, extract seconds) when the text cache is used, otherwise (record, timing)
+                    result = future.result()
+                    if cache is not None:
+                        pages_text, extract_seconds = result
+                        if not from_cache:
+                            cache.put(pdf_sha256, extractor, pages_text)
+                        start = time.perf_counter()
+                        record = scrape_text(pages_text, pdf_path, keys)
+                        parse_seconds = time.perf_counter() - start
+                        record_scrape(record, len(pages_text), extract_seconds, parse_seconds, from_cache)
+                    else:
+                        record, timing = result
+                        record_scrape(record, timing["pages"], timing["extract_seconds"], timing["parse_seconds"])
+                    record_queue.put(record)
+                except Exception as e:
+                    errors.append(e)
+        finally:
+            record_queue.put(DONE)
+
+    start_time = time.time()
+    stages = [threading.Thread(target=stage, daemon=True) for stage in (discover, download_all, extract, parse)]
+    try:
+        for stage in stages:
+            stage.start()
+
+        # records are written as they arrive, one line each with the PDF it came from.
+        # Downloads and extraction overlap, so they are timed as one stage
+        offsets = {}
+        with METRICS.stage(county, "download_and_scrape"), open(spool_path, "w") as spool:
+            while (record := record_queue.get()) is not DONE:
+                offsets[record["original_pdf"]] = spool.tell()
+                spool.write(json.dumps(record) + "\n")
+
+        for stage in stages:
+            stage.join()
+    finally:
+        session.close()
+        if pool is not None and pool is not executor:
+            pool.shutdown()
+
+    if errors:
+        raise errors[0]
+
+    save_manifest(manifest, manifest_file)
+    fetched = counts["new"] + counts["changed"] + counts["unchanged"]
+    print(
+        f"{county}: fetched {fetched}, skipped {counts['skipped']}, "
+        f"changed {counts['new'] + counts['changed']} ({counts['new']} new), failed {counts['failed']}, "
+        f"scraped {len(offsets)} in {round(time.time() - start_time, 2)} seconds"
+    )
+    if cache is not None:
+        print(f"Text cache: {cache.stats()}")
+
+    changed, removed = diff_build_state(built_from, state)
+    if existing is not None:
+        print(
+            f"Incremental refresh: {len(changed)} new or changed, {len(removed)} removed, "
+            f"{len(built_from) - len(changed)} unchanged"
+        )
+        if not changed and not removed:
+            os.remove(spool_path)
+            return existing
+
+    # records finish in any order, read them back in the order a batch run lists the PDFs
+    # so ties in the date sort come out the same
+    spooled = [pdf_name for pdf_name in list_files(save_dir, append_base_path=False) if pdf_name in offsets]
+    with open(spool_path, "r") as spool:
+
+        def read_records(pdf_names):
+            records = []
+            for pdf_name in pdf_names:
+                spool.seek(offsets[pdf_name])
+                records.append(json.loads(spool.readline()))
+            return records
+
+        if existing is not None:
+            # only the new and changed PDFs are in the spool, upserted into the dataset already in memory
+            with METRICS.stage(county, "cleaning"):
+                records = read_records(spooled)
+                final_df = cleaning_df(records, rename_cols, time_cols) if records else None
+                final_df = upsert_records(existing, final_df, changed + removed)
+            with METRICS.stage(county, "write"):
+                final_df = write_dataset(final_df, csv_filename)
+        else:
+            with METRICS.stage(county, "cleaning"):
+                order, categories = sort_spool(read_records, spooled, rename_cols, time_cols, chunk_size)
+            with METRICS.stage(county, "write"), DatasetWriter(csv_filename, categories=categories) as writer:
+                for i in range(0, len(order), chunk_size):
+                    writer.write(cleaning_df(read_records(order[i : i + chunk_size]), rename_cols, time_cols))
+                if not order:
+                    writer.write(empty_dataset(keys, rename_cols, time_cols))
+            # the saved dataset, for callers that merge the counties in memory
+            final_df = read_dataset(csv_filename)
+    save_build_state(built_from, state_path)
+    print(final_df.shape)
+    METRICS.inc("rows_written", len(final_df), county=county)
+    os.remove(spool_path)
+    print(f"Saved {csv_filename}")
+    return final_df
+
+
+def sort_spool(
+    read_records: Callable[[List[str]], List[Dict[str, object]]],
+    pdf_names: List[str],
+    rename_cols: Dict[str, str],
+    time_cols: List[str],
+    chunk_size: int,
+) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    Orders spooled records the way cleaning_df sorts a whole county, newest date first, ties in
+    pdf_names order, while only cleaning chunk_size records at a time. Only each PDF's date and
+    the categorical values are kept, so the chunks can then be cleaned and written in that order.
+
+    Args:
+        read_records (callable): Loads the spooled records of a list of PDF names.
+        pdf_names (list): Spooled PDFs, in the order a batch run lists them.
+        rename_cols (dict): Dictionary mapping old column names to new column names.
+        time_cols (list): List of columns that contain dates.
+        chunk_size (int): Records cleaned at a time.
+
+    Returns:
+        order (list): pdf_names in the order of the final dataset.
+        categories (dict): Sorted values of each categorical column, like write_dataset gives them.
+    """
+
+    dates, categories = [], {col: set() for col in CATEGORY_COLUMNS}
+    for i in range(0, len(pdf_names), chunk_size):
+        chunk = cleaning_df(read_records(pdf_names[i : i + chunk_size]), rename_cols, time_cols, enrich_city=False)
+        dates.append(chunk.set_index("original_pdf")["date"])
+        for col, values in categories.items():
+            if col in chunk.columns:
+                values.update(chunk[col].dropna().astype(str))
+
+    if not dates:
+        return [], {}
+    date_by_pdf = pd.concat(dates).reindex(pdf_names)
+    order = date_by_pdf.sort_values(ascending=False, kind="stable").index.tolist()
+    return order, {col: sorted(values) for col, values in categories.items()}
+
+
+def run_pdf_streaming_URL(
+    url: str,
+    keys: List[str],
+    rename_cols: Dict[str, str],
+    time_cols: List[str],
+    incremental: bool = CONFIG.INCREMENTAL_REFRESH,
+    executor: Optional[ProcessPoolExecutor] = None,
+) -> pd.DataFrame:
+    """
+    Streaming counterpart of run_pdf_scraping_URL, see stream_county.
+
+    Example:
+        run_pdf_streaming_URL(CONFIG.URL_LIST[0], CONFIG.KEYS, CONFIG.RENAME_COLS, CONFIG.TIME_COLS)
+    """
+
+    return stream_county(
+        url, keys, rename_cols, time_cols, cache=get_text_cache(), executor=executor, incremental=incremental
+    )
@@ -0,0 +1,145 @@
+import os
+import json
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional
+import config.CONFIG as CONFIG
+
+
+class TextCache:
+    """
+    On-disk cache of per-page extracted PDF text, content addressed by the SHA-256 of the
+    PDF bytes plus the extractor version, so an unchanged PDF is never parsed twice and a
+    pdfplumber/PyMuPDF upgrade naturally invalidates old entries.
+
+    Entries are JSON files laid out as {cache_dir}/{sha[:2]}/{sha}-{extractor}.json. A hit bumps
+    the file's mtime and the oldest mtimes are evicted first once max_bytes is exceeded (LRU),
+    down to evict_to * max_bytes so a full cache does not walk the directory on every put.
+
+    Example:
+        cache = TextCache('./.cache/pdf_text', max_bytes=512 * 1024**2)
+        pages_text = cache.get(sha256, 'pdfplumber-0.11.0')
+        if pages_text is None:
+            pages_text = extract_pages_text(pdf_path)
+            cache.put(sha256, 'pdfplumber-0.11.0', pages_text)
+        print(cache.stats())
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = CONFIG.TEXT_CACHE_DIR,
+        max_bytes: int = CONFIG.TEXT_CACHE_MAX_BYTES,
+        evict_to: float = CONFIG.TEXT_CACHE_EVICT_TO,
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.low_water_bytes = int(max_bytes * evict_to)
+        # counties share one instance across threads
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self.size_bytes = sum(os.path.getsize(path) for path in self._entries())
+
+    def _entries(self) -> List[str]:
+        paths = []
+        for root, _, files in os.walk(self.cache_dir):
+            paths.extend(os.path.join(root, f) for f in files if f.endswith(".json"))
+        return paths
+
+    def _path(self, pdf_sha256: str, extractor: str) -> str:
+        return os.path.join(
+            self.cache_dir, pdf_sha256[:2], f"{pdf_sha256}-{extractor}.json"
+        )
+
+    def get(self, pdf_sha256: str, extractor: str) -> Optional[List[str]]:
+        """
+        Returns the cached page texts, or None on a miss.
+        """
+
+        path = self._path(pdf_sha256, extractor)
+        try:
+            with open(path, "r") as f:
+                pages_text = json.load(f)
+        except (OSError, ValueError):
+            # missing, evicted by another process or half written
+            self.misses += 1
+            return None
+
+        # mark as recently used for LRU eviction
+        os.utime(path)
+        self.hits += 1
+        return pages_text
+
+    def put(self, pdf_sha256: str, extractor: str, pages_text: List[str]) -> None:
+        """
+        Stores page texts through a temp file + rename, then evicts once past max_bytes.
+        """
+
+        path = self._path(pdf_sha256, extractor)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(pages_text, f)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self.size_bytes += os.path.getsize(path) - previous_size
+            if self.size_bytes > self.max_bytes:
+                self.evict()
+
+    def evict(self) -> None:
+        """
+        Deletes least recently used entries until the cache is back under its low-water mark.
+        """
+
+        entries = []
+        for path in self._entries():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        # re-sync with disk, other processes may share the directory
+        self.size_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if self.size_bytes <= self.low_water_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.size_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size_bytes": self.size_bytes,
+        }
+
+
+def get_text_cache() -> Optional[TextCache]:
+    """
+    The configured text cache, or None when CONFIG.TEXT_CACHE_ENABLED is off.
+    """
+
+    if not CONFIG.TEXT_CACHE_ENABLED:
+        return None
+    return shared_text_cache(CONFIG.TEXT_CACHE_DIR, CONFIG.TEXT_CACHE_MAX_BYTES)
+
+
+@lru_cache(maxsize=8)
+def shared_text_cache(cache_dir: str, max_bytes: int) -> TextCache:
+    """
+    One TextCache per directory for the process, so the cache directory is only walked to size
+    it the first time.
+    """
+
+    return TextCache(cache_dir, max_bytes)
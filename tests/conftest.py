@@ -0,0 +1,170 @@
+import os
+import importlib.util
+import pytest
+import fitz  # PyMuPDF
+from ..benchmarks.dcfs_server import DCFSServer
+
+
+# Text laid out like the DCFS public disclosure form (see research/DEBUG.ipynb)
+PAGE_1 = """Division of Child and Family Services MTL# 0401-12032021
+Family Programs Office: Statewide Policy Manual Section 0400
+CHILD WELFARE AGENCY PUBLIC DISCLOSURE FORM
+Date: {date}
+Agency Name: Clark County Department of Family Services
+Agency Address: 500 S. Grand Central Pkwy, 5th Floor, Las Vegas, NV 89155
+Date of written notification to the Division of Child and Family Services and Legislative Auditor: {date}
+Internal reference UNITY Case Number: {case_number}
+Child Fatality Date of Death:
+Near Fatality Date of Near Fatality: {incident_date}
+INFORMATION FOR RELEASE
+A. Date of the notification to the child welfare agency of the death of a child:
+{incident_date}
+B. Location of child at the time of death or near fatality (city/county):
+Las Vegas, Clark
+C. A summary of the report of abuse or neglect and a factual description of the contents of the report:
+{summary}
+D. The date of birth and gender of child:
+{dob}, {gender}
+E. The date that the child suffered the fatality or near fatality:
+{incident_date}
+F. The cause of the fatality or near fatality, if such information has been determined:
+The cause of the near fatality is under investigation.
+G. Whether the agency had any contact with the child or a member of the child's family
+Date: 12/03/2021 FPO 0401A - Child Welfare Agency Public Disclosure Form Page 1 of 2"""
+
+PAGE_2 = """Division of Child and Family Services MTL# 0401-12032021
+Family Programs Office: Statewide Policy Manual Section 0400
+The information contained in this section is limited to contact(s) with the child who is the subject of this disclosure or
+a member of that child's family or household that is related to the fatality or near fatality incident. This limitation is
+required to preserve the confidentiality of all child abuse and neglect reports and records in order to protect the
+rights of the child and family as mandated by the Child Abuse Prevention and Treatment Act (CAPTA), as amended
+(42 U.S.C. 5101 et seq.).
+CCDFS has the following prior CPS history for this child or member of the child's family:
+{prior_history}
+The case closed.
+H. Whether the agency which provides child welfare services, in response to the fatality
+CCDFS has opened a case for investigation and family assessment.
+Date: 12/03/2021 FPO 0401A - Child Welfare Agency Public Disclosure Form Page 2 of 2"""
+
+
+def make_disclosure_pdf(path, case_number=1446073, prior_cases=2, gender="Male"):
+    """
+    Writes a small two page PDF laid out like a DCFS disclosure form.
+    """
+
+    fields = {
+        "date": "5/2/2023",
+        "case_number": case_number,
+        "incident_date": "4/13/2023",
+        "summary": f"CCDFS received a report for case {case_number}.\nThe child was transported to a local hospital.",
+        "dob": "7/19/2021",
+        "gender": gender,
+        "prior_history": "\n".join(
+            f"{month}/2/2019-A referral was received." for month in range(1, prior_cases + 1)
+        ),
+    }
+
+    doc = fitz.open()
+    for template in (PAGE_1, PAGE_2):
+        page = doc.new_page()
+        page.insert_text((36, 36), template.format(**fields), fontsize=7)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def pdf_string(text):
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def make_word_disclosure_pdf(path, case_number=1446073, prior_cases=2, gender="Male"):
+    """
+    Writes the same disclosure as make_disclosure_pdf by hand instead of through PyMuPDF, laid
+    out the way word processor exports are: every word its own positioned run, the footer drawn
+    before the body and the prior history as a table of date and description columns.
+    """
+
+    fields = {
+        "date": "5/2/2023",
+        "case_number": case_number,
+        "incident_date": "4/13/2023",
+        "summary": f"CCDFS received a report for case {case_number}.\nThe child was transported to a local hospital.",
+        "dob": "7/19/2021",
+        "gender": gender,
+        "prior_history": "\n".join(
+            f"{month}/2/2019\tA referral was received." for month in range(1, prior_cases + 1)
+        ),
+    }
+
+    pages = []
+    for template in (PAGE_1, PAGE_2):
+        *body, footer = template.format(**fields).split("\n")
+        footer_date, footer_text = footer.split(" FPO ")
+        # (x, y, text) runs in content stream order, the footer first
+        runs = [(36, 30, footer_date), (300, 30, "FPO " + footer_text)]
+        for line_number, line in enumerate(body):
+            y = 750 - 10 * line_number
+            for column, cell in zip((36, 120), line.split("\t")):
+                runs.append((column, y, cell))
+        stream = "".join(
+            f"BT /F1 7 Tf 1 0 0 1 {x} {y} Tm [{' -20 '.join(pdf_string(word + ' ') for word in text.split(' '))}] TJ ET\n"
+            for x, y, text in runs
+        )
+        pages.append(stream.encode("latin-1"))
+
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    for page_id, stream in zip(page_ids, pages):
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"endstream")
+
+    out, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+    return path
+
+
+@pytest.fixture
+def disclosure_pdf_dir(tmp_path):
+    # ./Clark_pdfs folder shaped like output_files/{county}_pdfs
+    pdf_dir = tmp_path / "Clark_pdfs"
+    pdf_dir.mkdir()
+    for i, gender in enumerate(["Male", "Female", "Male", "Female", "Male"]):
+        make_disclosure_pdf(
+            os.path.join(pdf_dir, f"2023-0{i + 1}-17_ID_{1469160 + i}.pdf"),
+            case_number=1469160 + i,
+            prior_cases=i,
+            gender=gender,
+        )
+    return str(pdf_dir)
+
+
+@pytest.fixture
+def dcfs_server():
+    # local stand-in for dcfs.nv.gov, tests adjust latency/faults on it before downloading
+    with DCFSServer({"Clark": 50, "Washoe": 5}, file_size=8 * 1024) as server:
+        yield server
+
+
+@pytest.fixture
+def flask_main():
+    # gcp_scripts isn't a package, load the service module from its file
+    path = os.path.join(os.path.dirname(__file__), "..", "gcp_scripts", "flask_main.py")
+    spec = importlib.util.spec_from_file_location("flask_main", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
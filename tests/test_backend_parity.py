@@ -0,0 +1,63 @@
+import os
+import shutil
+import pytest
+from ..scripts.child_fatality_scrape import list_files, loop_pdf_scrape
+from ..scripts.backend_parity import compare_backends, parity_pdf_paths
+from ..scripts.pdf_text import extract_pages_text
+from ..scripts.prior_history import count_dates_in_g_section
+from .conftest import make_word_disclosure_pdf
+import config.CONFIG as CONFIG
+
+
+def test_backends_scrape_identical_records(disclosure_pdf_dir):
+    pdf_paths = sorted(list_files(disclosure_pdf_dir, append_base_path=True))
+
+    diffs, timings = compare_backends(pdf_paths, CONFIG.KEYS)
+
+    assert diffs.empty, diffs.to_string()
+    assert list(timings["backend"]) == ["pdfplumber", "pymupdf"]
+    assert (timings["total_seconds"] > 0).all()
+
+
+def test_loop_pdf_scrape_backend_option(disclosure_pdf_dir):
+    file_list = sorted(list_files(disclosure_pdf_dir, append_base_path=False))
+
+    plumber = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1, backend="pdfplumber")
+    fitz = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1, backend="fitz")
+
+    assert plumber == fitz
+
+
+def test_parity_defaults_to_county_pdf_folders(disclosure_pdf_dir, tmp_path, monkeypatch):
+    # output_files holds the county CSVs, the PDFs are in its {county}_pdfs folders
+    monkeypatch.chdir(tmp_path)
+    output_files = tmp_path / "output_files"
+    output_files.mkdir()
+    (output_files / "child_fatality_Clark.csv").write_text("original_pdf\n")
+    shutil.move(disclosure_pdf_dir, output_files / "Clark_pdfs")
+
+    pdf_paths = parity_pdf_paths()
+    assert len(pdf_paths) == 5
+    assert sorted(parity_pdf_paths(["./output_files/Clark_pdfs"])) == sorted(pdf_paths)
+    assert parity_pdf_paths([str(output_files)]) == []
+
+
+def test_unknown_backend(disclosure_pdf_dir):
+    with pytest.raises(ValueError):
+        extract_pages_text(list_files(disclosure_pdf_dir, append_base_path=True)[0], backend="ocr")
+
+
+def test_prior_count_parity_on_word_layout(tmp_path):
+    # not written by PyMuPDF: the footer comes first in the content stream and the history
+    # dates sit in their own column, so the two backends order the text differently
+    pdf_dir = tmp_path / "Clark_pdfs"
+    pdf_dir.mkdir()
+    file_list = [f"2023-01-17_ID_{1469160 + i}.pdf" for i in range(4)]
+    for prior_cases, pdf_file in enumerate(file_list):
+        make_word_disclosure_pdf(str(pdf_dir / pdf_file), prior_cases=prior_cases)
+
+    records = loop_pdf_scrape(file_list, str(pdf_dir), CONFIG.KEYS, workers=1, backend="pdfplumber")
+
+    for prior_cases, (pdf_file, record) in enumerate(zip(file_list, records)):
+        with open(os.path.join(pdf_dir, pdf_file), "rb") as f:
+            assert record["prior_cases_count"] == count_dates_in_g_section(f.read()) == prior_cases
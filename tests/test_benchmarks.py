@@ -0,0 +1,79 @@
+import os
+import json
+import pytest
+import config.CONFIG as CONFIG
+from ..scripts.child_fatality_scrape import loop_pdf_scrape
+from ..benchmarks.synthetic_corpus import LAYOUTS, generate_county
+from ..benchmarks.run_benchmarks import STAGES, bench_county, find_regressions
+
+
+def test_synthetic_corpus_scrapes_like_each_layout(tmp_path):
+    for county, layout in LAYOUTS.items():
+        file_list = generate_county(str(tmp_path), county, 4)
+        pdf_dir = os.path.join(tmp_path, f"{county}_pdfs")
+        with open(os.path.join(pdf_dir, "corpus.json")) as f:
+            corpus = json.load(f)
+
+        records = loop_pdf_scrape(file_list, pdf_dir, CONFIG.KEYS, workers=1)
+
+        assert len(records) == 4
+        for record in records:
+            assert record["original_region"] == county
+            assert record["Agency Name"] == layout["agency_name"]
+            assert record[layout["case_key"]].startswith("14")
+            assert record["The date of birth and gender of child"].endswith(("Male", "Female"))
+            # every dated section G line is counted as prior history
+            assert record["prior_cases_count"] == corpus["history_dates"][record["original_pdf"]]
+
+        # an existing corpus of the same size is reused, not written again
+        mtime = os.path.getmtime(os.path.join(pdf_dir, file_list[0]))
+        assert generate_county(str(tmp_path), county, 4) == file_list
+        assert os.path.getmtime(os.path.join(pdf_dir, file_list[0])) == mtime
+
+
+def test_generate_county_never_clears_a_real_pdf_folder(tmp_path):
+    # shaped like ./output_files, downloaded PDFs and no corpus.json
+    pdf_dir = tmp_path / "Clark_pdfs"
+    pdf_dir.mkdir()
+    (pdf_dir / "2023-01-17_ID_1469166.pdf").write_bytes(b"%PDF-1.7 downloaded")
+
+    with pytest.raises(ValueError):
+        generate_county(str(tmp_path), "Clark", 2)
+    assert os.listdir(pdf_dir) == ["2023-01-17_ID_1469166.pdf"]
+
+    # a corpus of another size is replaced, so is one a crashed run left half written
+    file_list = generate_county(str(tmp_path), "Washoe", 2)
+    assert len(generate_county(str(tmp_path), "Washoe", 3)) == 3
+    with open(tmp_path / "Washoe_pdfs" / "corpus.json", "w") as f:
+        json.dump({"county": "Washoe", "n_pdfs": 2, "seed": 0}, f)
+    assert generate_county(str(tmp_path), "Washoe", 2) == file_list
+    assert sorted(os.listdir(tmp_path / "Washoe_pdfs")) == sorted(file_list + ["corpus.json"])
+
+
+def test_bench_county_times_every_stage(tmp_path):
+    file_list = generate_county(str(tmp_path), "Rural", 3)
+
+    results = bench_county(
+        os.path.join(tmp_path, "Rural_pdfs"), file_list, sample=2, repeat=1, workers=1, backend="pymupdf"
+    )
+
+    assert list(results) == STAGES
+    assert results["scrape_individual_pdf"]["n_pdfs"] == 2
+    assert results["loop_pdf_scrape"]["n_pdfs"] == 3
+    assert all(timing["us_per_pdf"] > 0 for timing in results.values())
+
+
+def test_find_regressions():
+    baseline = {"Clark": {"merge": {"us_per_pdf": 2.0}, "cleaning_df": {"us_per_pdf": 10.0}}}
+    results = {
+        "Clark": {
+            "merge": {"us_per_pdf": 3.0},
+            "cleaning_df": {"us_per_pdf": 11.0},
+            "loop_pdf_scrape": {"us_per_pdf": 9.0},
+        },
+        "Washoe": {"merge": {"us_per_pdf": 99.0}},
+    }
+
+    # cleaning_df is within the threshold, stages and counties without a baseline are skipped
+    assert find_regressions(results, baseline, 0.25) == ["Clark merge: 3.0 us/PDF vs baseline 2.0 (+50%)"]
+    assert find_regressions(results, baseline, 0.5) == []
@@ -0,0 +1,108 @@
+import os
+import pandas as pd
+import pytest
+from ..scripts.child_fatality_scrape import (
+    list_files,
+    loop_pdf_scrape,
+    cleaning_df,
+)
+from ..scripts.columnar import (
+    DatasetWriter,
+    columnar_path,
+    read_dataset,
+    read_statewide,
+    write_dataset,
+)
+import config.CONFIG as CONFIG
+
+
+def cleaned_clark(disclosure_pdf_dir):
+    file_list = sorted(list_files(disclosure_pdf_dir, append_base_path=False))
+    records = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1)
+    return cleaning_df(records, CONFIG.RENAME_COLS, CONFIG.TIME_COLS)
+
+
+def test_write_dataset_round_trips_schema(disclosure_pdf_dir, tmp_path):
+    csv_path = str(tmp_path / "child_fatality_Clark.csv")
+    written = write_dataset(cleaned_clark(disclosure_pdf_dir), csv_path, fmt="parquet")
+
+    assert os.path.exists(csv_path)
+    assert os.path.exists(columnar_path(csv_path, "parquet"))
+
+    df = read_dataset(csv_path, fmt="parquet")
+    pd.testing.assert_frame_equal(df, written)
+    assert df["date"].dtype == "datetime64[ns]"
+    assert df["DOB"].dtype == "datetime64[ns]"
+    assert isinstance(df["original_region"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["gender"].dtype, pd.CategoricalDtype)
+    assert df["prior_cases_count"].dtype == "Int64"
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_dataset_writer_matches_write_dataset(disclosure_pdf_dir, tmp_path, fmt):
+    df = cleaned_clark(disclosure_pdf_dir)
+    # a category only the last chunk has
+    df.loc[df.index[-1], "gender"] = "Female"
+    written = write_dataset(df, str(tmp_path / "whole.csv"), fmt=fmt)
+
+    csv_path = str(tmp_path / "chunked.csv")
+    with DatasetWriter(csv_path, fmt=fmt) as writer:
+        for i in range(0, len(df), 2):
+            writer.write(df.iloc[i : i + 2])
+        # nothing is in place until the writer closes
+        assert not os.path.exists(csv_path)
+    assert writer.rows == len(df)
+
+    with open(csv_path) as chunked, open(tmp_path / "whole.csv") as whole:
+        assert chunked.read() == whole.read()
+    chunked = read_dataset(csv_path, fmt=fmt)
+    pd.testing.assert_frame_equal(chunked, written, check_categorical=False)
+    assert set(chunked["gender"].cat.categories) == {"Male", "Female"}
+
+    # with the full category sets up front every chunk has the categories write_dataset gives
+    categories = {col: list(written[col].cat.categories) for col in ["original_region", "agency_name", "gender"]}
+    with DatasetWriter(csv_path, fmt=fmt, categories=categories) as writer:
+        for i in range(0, len(df), 2):
+            writer.write(df.iloc[i : i + 2])
+    pd.testing.assert_frame_equal(read_dataset(csv_path, fmt=fmt), written)
+
+
+def test_dataset_writer_keeps_old_dataset_on_error(disclosure_pdf_dir, tmp_path):
+    csv_path = str(tmp_path / "child_fatality_Clark.csv")
+    written = write_dataset(cleaned_clark(disclosure_pdf_dir), csv_path, fmt="parquet")
+
+    with pytest.raises(RuntimeError):
+        with DatasetWriter(csv_path, fmt="parquet") as writer:
+            writer.write(written.iloc[:2])
+            raise RuntimeError("scrape failed")
+
+    pd.testing.assert_frame_equal(read_dataset(csv_path, fmt="parquet"), written)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_read_dataset_csv_fallback_matches_parquet(disclosure_pdf_dir, tmp_path):
+    csv_path = str(tmp_path / "child_fatality_Clark.csv")
+    write_dataset(cleaned_clark(disclosure_pdf_dir), csv_path, fmt="parquet")
+
+    from_parquet = read_dataset(csv_path, fmt="parquet")
+    os.remove(columnar_path(csv_path, "parquet"))
+    from_csv = read_dataset(csv_path, fmt="parquet")
+
+    pd.testing.assert_frame_equal(from_csv, from_parquet)
+
+    # column subsets skip columns the file doesn't have
+    subset = read_dataset(csv_path, columns=["original_pdf", "prior_cases_count", "missing"])
+    assert list(subset.columns) == ["original_pdf", "prior_cases_count"]
+
+
+def test_read_statewide_combines_counties(disclosure_pdf_dir, tmp_path):
+    clark = cleaned_clark(disclosure_pdf_dir)
+    washoe = clark.assign(original_region="Washoe", agency_name="Washoe County Human Services Agency")
+    write_dataset(clark, str(tmp_path / "Clark_merged.csv"), fmt="feather")
+    write_dataset(washoe, str(tmp_path / "Washoe_merged.csv"), fmt="feather")
+
+    df = read_statewide(str(tmp_path), fmt="feather")
+
+    assert len(df) == 2 * len(clark)
+    assert sorted(df["original_region"].cat.categories) == ["Clark", "Washoe"]
+    assert df["date"].is_monotonic_decreasing
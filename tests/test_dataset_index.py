@@ -0,0 +1,123 @@
+import os
+import importlib.util
+import numpy as np
+import pandas as pd
+import pytest
+from ..scripts.columnar import write_dataset
+from ..scripts.dataset_index import DatasetIndex, DatasetStore
+from ..scripts.jobs import JobManager
+
+
+def merged_frame(region, n_rows, seed):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2021-01-01") + pd.to_timedelta(rng.integers(0, 1000, n_rows), unit="D")
+    return pd.DataFrame(
+        {
+            "original_region": region,
+            "original_pdf": [f"{region}_{i}.pdf" for i in range(n_rows)],
+            "prior_cases_count": rng.integers(0, 5, n_rows),
+            "date": dates.where(rng.random(n_rows) > 0.05),
+            # every case number appears twice, like a disclosure and its 60 day update
+            "internal_reference_unity_case_number": [
+                str(1400000 + seed * 1000 + i % (n_rows // 2)) for i in range(n_rows)
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def statewide():
+    return pd.concat(
+        [merged_frame("Clark", 300, 1), merged_frame("Washoe", 60, 2), merged_frame("Rural", 20, 3)],
+        ignore_index=True,
+    )
+
+
+def expected(df, region=None, start=None, end=None, case_number=None):
+    mask = pd.Series(True, index=df.index)
+    if region is not None:
+        mask &= df["original_region"] == region
+    if start is not None:
+        mask &= df["date"] >= start
+    if end is not None:
+        mask &= df["date"] <= end
+    if case_number is not None:
+        mask &= df["internal_reference_unity_case_number"] == case_number
+    matched = df[mask].sort_values("date", ascending=False, kind="stable", na_position="last")
+    return matched["original_pdf"].tolist()
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"region": "Washoe"},
+        {"start": pd.Timestamp("2022-01-01"), "end": pd.Timestamp("2022-06-30")},
+        {"region": "Clark", "start": pd.Timestamp("2023-01-01")},
+        {"case_number": "1401010"},
+        {"region": "Rural", "case_number": "1401010"},
+        {"region": "Nowhere"},
+    ],
+)
+def test_index_lookup_matches_pandas_filter(statewide, filters):
+    index = DatasetIndex(statewide)
+    positions = index.lookup(**filters)
+    assert index.df["original_pdf"].iloc[positions].tolist() == expected(statewide, **filters)
+
+
+def test_query_pages(statewide):
+    index = DatasetIndex(statewide)
+    first = index.query(region="Clark", page=1, page_size=50)
+    last = index.query(region="Clark", page=6, page_size=50)
+
+    assert first["total"] == 300 and first["pages"] == 6
+    assert len(first["records"]) == 50 and len(last["records"]) == 50
+    assert index.query(region="Clark", page=7, page_size=50)["records"] == []
+    assert first["records"][0]["date"] >= first["records"][-1]["date"]
+
+
+def test_store_swaps_index_when_output_changes(statewide, tmp_path):
+    write_dataset(statewide[statewide["original_region"] == "Clark"], str(tmp_path / "Clark_merged.csv"))
+    store = DatasetStore(str(tmp_path))
+    before = store.current()
+    assert before.regions() == ["Clark"]
+
+    # unchanged output keeps the same index object
+    assert store.refresh() is before
+
+    write_dataset(statewide[statewide["original_region"] == "Washoe"], str(tmp_path / "Washoe_merged.csv"))
+    after = store.refresh()
+    assert after is not before and after.version != before.version
+    assert after.regions() == ["Clark", "Washoe"]
+
+
+def test_flask_records_endpoint(statewide, tmp_path):
+    for region, df in statewide.groupby("original_region"):
+        write_dataset(df, str(tmp_path / f"{region}_merged.csv"))
+
+    path = os.path.join(os.path.dirname(__file__), "..", "gcp_scripts", "flask_main.py")
+    spec = importlib.util.spec_from_file_location("flask_main", path)
+    flask_main = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(flask_main)
+    flask_main.store = DatasetStore(str(tmp_path))
+    client = flask_main.app.test_client()
+
+    response = client.get("/records?region=Washoe&start=2022-01-01&page_size=10")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["total"] == len(expected(statewide, region="Washoe", start=pd.Timestamp("2022-01-01")))
+    assert len(body["records"]) == min(10, body["total"])
+
+    # unchanged data and query, 304 without a body
+    etag = response.headers["ETag"]
+    query = "/records?region=Washoe&start=2022-01-01&page_size=10"
+    cached = client.get(query, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+    # a different page is a different response
+    other = client.get(f"{query}&page=2", headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+    assert client.get("/records?start=not-a-date").status_code == 400
+    assert client.get("/records?page_size=100000").status_code == 400
@@ -4,7 +4,9 @@ from unittest.mock import MagicMock, patch
 import requests
 from ..scripts.child_fatality_scrape import (
     download_all_pdfs,
+    download_pdf,
 )
+from ..scripts.download_manifest import load_manifest, manifest_path
 
 
 @pytest.fixture
@@ -26,37 +28,214 @@ def mock_pdf_content():
     return b"%PDF-1.7 mock pdf content"
 
 
-def test_download_all_pdfs(mock_html_page, mock_pdf_content):
+def test_download_all_pdfs(mock_html_page, mock_pdf_content, tmp_path, monkeypatch):
     url = "https://dcfs.nv.gov/Programs/CWS/CPS/ChildFatalities/Clark/"
 
-    # Mock the network requests
-    with patch.object(requests, "get") as mock_get:
+    # download into a throwaway ./output_files
+    monkeypatch.chdir(tmp_path)
+
+    # Mock the pooled session used for every request
+    with patch.object(requests, "Session") as mock_session_cls:
+        mock_get = mock_session_cls.return_value.get
         mock_get.return_value.text = mock_html_page
-        mock_get.return_value.content = mock_pdf_content
-
-        # Mock the filesystem operations
-        with patch.object(os.path, "exists") as mock_exists, patch(
-            "builtins.open", new_callable=MagicMock
-        ):
-            mock_exists.return_value = True  # simulate directory already exists
-            output_directory = download_all_pdfs(url)
-            print(output_directory)
-
-            # Check the filesystem was used correctly
-            assert mock_exists.call_count == 2  # Check exists was called for each file
-            assert os.path.basename(output_directory) == "Clark_pdfs"
-
-            # Check the network requests were called correctly
-            assert mock_get.call_count == 3  # One for the HTML page, two for the PDFs
-            print(mock_get.call_args_list)
-            assert (
-                mock_get.call_args_list[0][0][0] == url
-            )  # First request is for the HTML page
-            assert (
-                mock_get.call_args_list[1][0][0]
-                == "https://dcfs.nv.gov//uploadedFiles/dcfsnvgov/content/Programs/CWS/CPS/ChildFatalities/Clark/document1.pdf"
-            )  # Second request is for the first PDF
-            assert (
-                mock_get.call_args_list[2][0][0]
-                == "https://dcfs.nv.gov//uploadedFiles/dcfsnvgov/content/Programs/CWS/CPS/ChildFatalities/Clark/document2.pdf"
-            )  # Third request is for the second PDF
+        mock_get.return_value.iter_content.return_value = [mock_pdf_content]
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.headers = {}
+
+        output_directory = download_all_pdfs(url, max_workers=2)
+        print(output_directory)
+
+        # Check the files landed in the county folder
+        assert os.path.basename(output_directory) == "Clark_pdfs"
+        assert sorted(os.listdir(output_directory)) == ["document1.pdf", "document2.pdf"]
+        with open(os.path.join(output_directory, "document1.pdf"), "rb") as f:
+            assert f.read() == mock_pdf_content
+
+        # Check the network requests were called correctly
+        assert mock_session_cls.call_count == 1  # one shared connection pool
+        assert mock_get.call_count == 3  # One for the HTML page, two for the PDFs
+        print(mock_get.call_args_list)
+        assert (
+            mock_get.call_args_list[0][0][0] == url
+        )  # First request is for the HTML page
+        # PDFs download concurrently so their order isn't fixed
+        assert {call[0][0] for call in mock_get.call_args_list[1:]} == {
+            "https://dcfs.nv.gov//uploadedFiles/dcfsnvgov/content/Programs/CWS/CPS/ChildFatalities/Clark/document1.pdf",
+            "https://dcfs.nv.gov//uploadedFiles/dcfsnvgov/content/Programs/CWS/CPS/ChildFatalities/Clark/document2.pdf",
+        }
+
+
+def test_download_all_pdfs_skips_failed_pdf(mock_html_page, mock_pdf_content, tmp_path, monkeypatch):
+    url = "https://dcfs.nv.gov/Programs/CWS/CPS/ChildFatalities/Clark/"
+    monkeypatch.chdir(tmp_path)
+
+    def fake_get(href, **kwargs):
+        response = MagicMock()
+        response.text = mock_html_page
+        response.iter_content.return_value = [mock_pdf_content]
+        response.status_code = 200
+        response.headers = {}
+        if href.endswith("document1.pdf"):
+            response.raise_for_status.side_effect = requests.HTTPError("503")
+        return response
+
+    with patch.object(requests, "Session") as mock_session_cls:
+        mock_session_cls.return_value.get.side_effect = fake_get
+        output_directory = download_all_pdfs(url, max_workers=2)
+
+    # a single failing PDF doesn't stop the rest of the county downloading
+    assert os.listdir(output_directory) == ["document2.pdf"]
+
+
+def test_download_all_pdfs_conditional_get(mock_html_page, mock_pdf_content, tmp_path, monkeypatch):
+    url = "https://dcfs.nv.gov/Programs/CWS/CPS/ChildFatalities/Clark/"
+    monkeypatch.chdir(tmp_path)
+    sent_headers = {}
+
+    def fake_get(href, headers=None, **kwargs):
+        response = MagicMock()
+        response.text = mock_html_page
+        response.iter_content.return_value = [mock_pdf_content]
+        response.headers = {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        sent_headers[href] = headers or {}
+        # document1 is unchanged on the server once we've seen its ETag
+        if href.endswith("document1.pdf") and sent_headers[href].get("If-None-Match") == '"v1"':
+            response.status_code = 304
+        else:
+            response.status_code = 200
+        return response
+
+    with patch.object(requests, "Session") as mock_session_cls:
+        mock_session_cls.return_value.get.side_effect = fake_get
+        save_dir = download_all_pdfs(url, max_workers=2)
+
+        manifest = load_manifest(manifest_path(save_dir))
+        assert set(manifest) == {"document1.pdf", "document2.pdf"}
+        assert manifest["document1.pdf"]["etag"] == '"v1"'
+        assert manifest["document1.pdf"]["size"] == len(mock_pdf_content)
+
+        # second run sends the stored validators and leaves the unchanged file alone
+        pdf_path = os.path.join(save_dir, "document1.pdf")
+        mtime = os.path.getmtime(pdf_path)
+        download_all_pdfs(url, max_workers=2)
+
+    assert any(k.endswith("document1.pdf") and v.get("If-None-Match") == '"v1"' for k, v in sent_headers.items())
+    assert os.path.getmtime(pdf_path) == mtime
+    assert set(load_manifest(manifest_path(save_dir))) == {"document1.pdf", "document2.pdf"}
+
+
+def test_download_pdf_resumes_with_range(mock_pdf_content, tmp_path):
+    href = "https://dcfs.nv.gov//uploadedFiles/dcfsnvgov/content/Programs/CWS/CPS/ChildFatalities/Clark/document1.pdf"
+    requests_sent = []
+
+    def fake_get(href, headers=None, **kwargs):
+        headers = headers or {}
+        requests_sent.append(headers)
+        response = MagicMock()
+        response.headers = {"ETag": '"v1"'}
+        if "Range" in headers:
+            start = int(headers["Range"][len("bytes="):-1])
+            response.status_code = 206
+            response.iter_content.return_value = [mock_pdf_content[start:]]
+        else:
+            # first attempt drops the connection half way through the body
+            def dropped(chunk_size):
+                yield mock_pdf_content[:10]
+                raise requests.ConnectionError("connection reset")
+
+            response.status_code = 200
+            response.iter_content.side_effect = dropped
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = fake_get
+
+    status, entry = download_pdf(href, str(tmp_path), session, chunk_size=4)
+
+    assert status == "new"
+    assert requests_sent[1] == {"Range": "bytes=10-", "If-Range": '"v1"'}
+    assert (tmp_path / "document1.pdf").read_bytes() == mock_pdf_content
+    assert entry["size"] == len(mock_pdf_content)
+    # nothing but the finished PDF is left in the folder
+    assert os.listdir(tmp_path) == ["document1.pdf"]
+
+
+def test_download_pdf_failure_leaves_no_truncated_pdf(mock_pdf_content, tmp_path):
+    href = "https://dcfs.nv.gov/Clark/document1.pdf"
+
+    def dropped(chunk_size):
+        yield mock_pdf_content[:10]
+        raise requests.ConnectionError("connection reset")
+
+    session = MagicMock()
+    session.get.return_value.status_code = 200
+    session.get.return_value.headers = {}
+    session.get.return_value.iter_content.side_effect = dropped
+
+    with pytest.raises(requests.ConnectionError):
+        download_pdf(href, str(tmp_path), session, retries=0)
+
+    # the partial bytes wait in the .part file, the final name is never written
+    assert not (tmp_path / "document1.pdf").exists()
+    assert (tmp_path / "document1.pdf.part").read_bytes() == mock_pdf_content[:10]
+
+
+def test_download_pdf_retries_failed_request(mock_pdf_content, tmp_path):
+    href = "https://dcfs.nv.gov/Clark/document1.pdf"
+    response = MagicMock()
+    response.status_code = 200
+    response.headers = {}
+    response.iter_content.return_value = [mock_pdf_content]
+
+    session = MagicMock()
+    session.get.side_effect = [requests.ConnectionError("refused"), requests.Timeout("timed out"), response]
+
+    status, _ = download_pdf(href, str(tmp_path), session, retries=2)
+
+    assert status == "new"
+    assert (tmp_path / "document1.pdf").read_bytes() == mock_pdf_content
+
+
+def test_download_pdf_finishes_complete_part_file_on_416(mock_pdf_content, tmp_path):
+    href = "https://dcfs.nv.gov/Clark/document1.pdf"
+    # a crash between the .part file's fsync and the rename leaves it complete
+    (tmp_path / "document1.pdf.part").write_bytes(mock_pdf_content)
+    (tmp_path / "document1.pdf.part.json").write_text('{"etag": "\\"v1\\"", "last_modified": null}')
+
+    session = MagicMock()
+    session.get.return_value.status_code = 416
+    session.get.return_value.headers = {"Content-Range": f"bytes */{len(mock_pdf_content)}"}
+
+    status, entry = download_pdf(href, str(tmp_path), session)
+
+    assert status == "new"
+    assert session.get.call_count == 1
+    assert entry["etag"] == '"v1"' and entry["size"] == len(mock_pdf_content)
+    assert (tmp_path / "document1.pdf").read_bytes() == mock_pdf_content
+    assert os.listdir(tmp_path) == ["document1.pdf"]
+
+
+def test_download_pdf_refetches_oversized_part_file_on_416(mock_pdf_content, tmp_path):
+    href = "https://dcfs.nv.gov/Clark/document1.pdf"
+    (tmp_path / "document1.pdf.part").write_bytes(mock_pdf_content + b"junk")
+    (tmp_path / "document1.pdf.part.json").write_text('{"etag": "\\"v1\\"", "last_modified": null}')
+    requests_sent = []
+
+    def fake_get(href, headers=None, **kwargs):
+        requests_sent.append(dict(headers or {}))
+        response = MagicMock()
+        response.headers = {"ETag": '"v1"', "Content-Range": f"bytes */{len(mock_pdf_content)}"}
+        response.status_code = 416 if "Range" in (headers or {}) else 200
+        response.iter_content.return_value = [mock_pdf_content]
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = fake_get
+
+    status, _ = download_pdf(href, str(tmp_path), session, retries=0)
+
+    # the .part file is dropped and the PDF fetched whole, even with no retries left
+    assert status == "new"
+    assert requests_sent[1] == {}
+    assert (tmp_path / "document1.pdf").read_bytes() == mock_pdf_content
+    assert os.listdir(tmp_path) == ["document1.pdf"]
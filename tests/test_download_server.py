@@ -0,0 +1,109 @@
+import os
+import json
+import time
+from unittest.mock import patch
+import config.CONFIG as CONFIG
+from ..scripts.child_fatality_scrape import download_all_pdfs, download_pdf, find_pdf_links, make_session
+from ..scripts.download_manifest import load_manifest, manifest_path
+from ..benchmarks.dcfs_server import DCFSServer
+
+
+def assert_mirrors_server(server, county, save_dir):
+    assert sorted(name for name in os.listdir(save_dir) if name.endswith(".pdf")) == sorted(server.files[county])
+    for name in server.files[county]:
+        with open(os.path.join(save_dir, name), "rb") as f:
+            assert f.read() == server.file_bytes(county, name)
+
+
+def test_find_pdf_links_uses_the_page_host(dcfs_server):
+    hrefs = find_pdf_links(dcfs_server.county_url("Washoe"), make_session())
+
+    # only the county's uploads, not the other PDF links on the page
+    assert len(hrefs) == 5
+    assert all(href.startswith(dcfs_server.base_url + "//uploadedFiles/") for href in hrefs)
+    assert all("/ChildFatalities/Washoe/" in href for href in hrefs)
+
+
+def test_download_all_pdfs_then_conditional_rerun(dcfs_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    url = dcfs_server.county_url("Clark")
+
+    save_dir = download_all_pdfs(url, max_workers=8)
+    assert_mirrors_server(dcfs_server, "Clark", save_dir)
+    assert dcfs_server.stats["200"] == 50
+    assert set(load_manifest(manifest_path(save_dir))) == set(dcfs_server.files["Clark"])
+
+    # one PDF is republished, everything else is answered with a 304
+    changed = "Clark_000007.pdf"
+    dcfs_server.update_file("Clark", changed)
+    download_all_pdfs(url, max_workers=8)
+
+    assert dcfs_server.stats["304"] == 49
+    assert dcfs_server.stats["200"] == 51
+    assert_mirrors_server(dcfs_server, "Clark", save_dir)
+    assert load_manifest(manifest_path(save_dir))[changed]["etag"] == dcfs_server.etag("Clark", changed)
+
+
+def test_dropped_transfer_resumes_with_range(dcfs_server, tmp_path):
+    name = "Clark_000003.pdf"
+    href = dcfs_server.base_url + "/uploadedFiles/dcfsnvgov/content/Programs/CWS/CPS/ChildFatalities/Clark/" + name
+    dcfs_server.inject(name, "drop")
+
+    # chunks smaller than the half body that arrives, so part of it lands in the .part file
+    status, entry = download_pdf(href, str(tmp_path), make_session(), chunk_size=1024)
+
+    assert status == "new"
+    assert dcfs_server.stats["drop"] == 1
+    assert dcfs_server.stats["206"] == 1
+    assert (tmp_path / name).read_bytes() == dcfs_server.file_bytes("Clark", name)
+    assert os.listdir(tmp_path) == [name]
+
+
+def test_failed_pdfs_are_fetched_on_the_next_run(dcfs_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    url = dcfs_server.county_url("Clark")
+    dcfs_server.inject("Clark_000001.pdf", "503")
+    dcfs_server.inject("Clark_000002.pdf", "stall")
+    dcfs_server.stall_seconds = 1.0
+
+    with patch.object(CONFIG, "DOWNLOAD_TIMEOUT", 0.3):
+        start = time.perf_counter()
+        save_dir = download_all_pdfs(url, max_workers=8)
+        # a stalled server costs the timeout, not the whole stall
+        assert time.perf_counter() - start < 1.0
+
+    # the timed out request is retried in the same run, the 503 waits for the next one
+    on_disk = set(os.listdir(save_dir))
+    assert "Clark_000001.pdf" not in on_disk and "Clark_000002.pdf" in on_disk
+
+    download_all_pdfs(url, max_workers=8)
+    assert_mirrors_server(dcfs_server, "Clark", save_dir)
+
+
+def test_concurrent_downloads_overlap_latency_and_bandwidth(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # 20 PDFs of 16 KiB at 64 KiB/s with 50 ms latency: ~0.3 s each, 6 s one after another
+    with DCFSServer({"Rural": 20}, file_size=16 * 1024, latency=0.05, bandwidth=64 * 1024) as server:
+        start = time.perf_counter()
+        save_dir = download_all_pdfs(server.county_url("Rural"), max_workers=10)
+        elapsed = time.perf_counter() - start
+
+        assert_mirrors_server(server, "Rural", save_dir)
+    assert 0.5 < elapsed < 3.0
+
+
+def test_complete_part_file_is_finished_after_416(dcfs_server, tmp_path):
+    name = "Clark_000004.pdf"
+    href = dcfs_server.base_url + "/uploadedFiles/dcfsnvgov/content/Programs/CWS/CPS/ChildFatalities/Clark/" + name
+    (tmp_path / f"{name}.part").write_bytes(dcfs_server.file_bytes("Clark", name))
+    (tmp_path / f"{name}.part.json").write_text(f'{{"etag": {json.dumps(dcfs_server.etag("Clark", name))}}}')
+
+    for _ in range(2):
+        status, _ = download_pdf(href, str(tmp_path), make_session())
+
+    # the first run renames the complete .part file, the second finds nothing to resume
+    assert status == "new"
+    assert dcfs_server.stats["416"] == 1
+    assert dcfs_server.stats["200"] == 1
+    assert (tmp_path / name).read_bytes() == dcfs_server.file_bytes("Clark", name)
+    assert os.listdir(tmp_path) == [name]
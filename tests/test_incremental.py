@@ -0,0 +1,89 @@
+import os
+import pandas as pd
+import pytest
+from ..scripts import child_fatality_scrape
+from ..scripts.child_fatality_scrape import list_files, scrape_county
+from ..scripts.build_state import build_state_path, diff_build_state, load_build_state
+from .conftest import make_disclosure_pdf
+import config.CONFIG as CONFIG
+
+
+@pytest.fixture
+def scraped_pdfs(monkeypatch):
+    # no text cache, record which PDFs actually get scraped
+    scraped = []
+    loop_pdf_scrape = child_fatality_scrape.loop_pdf_scrape
+
+    def spy(file_list, *args, **kwargs):
+        scraped.append(list(file_list))
+        return loop_pdf_scrape(file_list, *args, **{**kwargs, "workers": 1})
+
+    monkeypatch.setattr(child_fatality_scrape, "get_text_cache", lambda: None)
+    monkeypatch.setattr(child_fatality_scrape, "loop_pdf_scrape", spy)
+    return scraped
+
+
+def run(pdf_dir, csv_filename, incremental):
+    file_list = sorted(list_files(pdf_dir, append_base_path=False))
+    return scrape_county(
+        file_list, pdf_dir, csv_filename, CONFIG.KEYS, CONFIG.RENAME_COLS, CONFIG.TIME_COLS, incremental
+    )
+
+
+def by_pdf(df):
+    return df.sort_values("original_pdf").reset_index(drop=True).to_csv(index=False)
+
+
+def test_diff_build_state():
+    changed, removed = diff_build_state(
+        {"a.pdf": "1", "b.pdf": "9", "d.pdf": "4"},
+        {"b.pdf": "2", "c.pdf": "3", "d.pdf": "4"},
+    )
+    assert changed == ["a.pdf", "b.pdf"]
+    assert removed == ["c.pdf"]
+
+
+def test_incremental_refresh_matches_full_rebuild(disclosure_pdf_dir, tmp_path, scraped_pdfs):
+    csv_filename = str(tmp_path / "child_fatality_Clark.csv")
+    run(disclosure_pdf_dir, csv_filename, incremental=True)
+
+    # first run has nothing to compare against and builds from every PDF
+    assert len(scraped_pdfs[-1]) == 5
+    assert len(load_build_state(build_state_path(csv_filename))) == 5
+
+    # nothing changed, nothing scraped
+    unchanged = run(disclosure_pdf_dir, csv_filename, incremental=True)
+    assert len(scraped_pdfs) == 1
+    assert len(unchanged) == 5
+
+    # one PDF posted, one re-issued with new content, one taken down
+    make_disclosure_pdf(os.path.join(disclosure_pdf_dir, "2023-06-17_ID_1469170.pdf"), case_number=1469170)
+    make_disclosure_pdf(os.path.join(disclosure_pdf_dir, "2023-02-17_ID_1469161.pdf"), case_number=1469161, prior_cases=4)
+    os.remove(os.path.join(disclosure_pdf_dir, "2023-05-17_ID_1469164.pdf"))
+
+    incremental = run(disclosure_pdf_dir, csv_filename, incremental=True)
+    assert sorted(scraped_pdfs[-1]) == ["2023-02-17_ID_1469161.pdf", "2023-06-17_ID_1469170.pdf"]
+
+    full = run(disclosure_pdf_dir, str(tmp_path / "full.csv"), incremental=False)
+    assert len(scraped_pdfs[-1]) == 5
+
+    assert by_pdf(incremental) == by_pdf(full)
+    assert by_pdf(pd.read_csv(csv_filename)) == by_pdf(pd.read_csv(tmp_path / "full.csv"))
+    assert incremental["date"].is_monotonic_decreasing
+    assert set(load_build_state(build_state_path(csv_filename))) == set(incremental["original_pdf"])
+
+
+def test_empty_county_saves_an_empty_dataset(disclosure_pdf_dir, tmp_path, scraped_pdfs):
+    empty_dir = tmp_path / "Rural_pdfs"
+    empty_dir.mkdir()
+    csv_filename = str(tmp_path / "child_fatality_Rural.csv")
+
+    for incremental in (False, True):
+        empty = run(str(empty_dir), csv_filename, incremental=incremental)
+        assert len(empty) == 0
+        assert pd.read_csv(csv_filename).empty
+
+    # same columns as a county with PDFs
+    full = run(disclosure_pdf_dir, str(tmp_path / "child_fatality_Clark.csv"), incremental=False)
+    assert list(empty.columns) == list(full.columns)
+    assert list(pd.read_csv(csv_filename).columns) == list(full.columns)
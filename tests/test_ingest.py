@@ -0,0 +1,85 @@
+import os
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from ..scripts.child_fatality_scrape import full_data_path_prep, ingest_file, loop_pdf_scrape
+from .conftest import make_disclosure_pdf
+import config.CONFIG as CONFIG
+
+
+@pytest.fixture
+def county_folder(tmp_path, monkeypatch):
+    # {FULL_DATA_PATH}/Clark/{year}/*.pdf, ./output_files is created under tmp_path
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(tmp_path / "output_files")
+    county = tmp_path / "data" / "Clark"
+    for year, cases in [("2020", [1469150]), ("2022", [1469160, 1469161]), ("2023", [1469162, 1469163])]:
+        os.makedirs(county / year)
+        for i, case_number in enumerate(cases):
+            make_disclosure_pdf(
+                str(county / year / f"{year}-0{i + 1}-17_ID_{case_number}.pdf"),
+                case_number=case_number,
+                prior_cases=i,
+            )
+    return str(county)
+
+
+def scrape(county_folder, mode):
+    pdf_files_list, pdf_dir = full_data_path_prep(county_folder, ["2022", "2023"], mode=mode)
+    records = loop_pdf_scrape(pdf_files_list, pdf_dir, CONFIG.KEYS, workers=1, region="Clark")
+    return pd.DataFrame(records).sort_values("original_pdf").reset_index(drop=True)
+
+
+def test_ingest_modes_scrape_the_same(county_folder):
+    copied = scrape(county_folder, "copy")
+    linked = scrape(county_folder, "link")
+    manifest = scrape(county_folder, "manifest")
+
+    assert len(copied) == 4
+    assert (copied["original_region"] == "Clark").all()
+    pd.testing.assert_frame_equal(linked, copied)
+    pd.testing.assert_frame_equal(manifest, copied)
+
+
+def test_link_mode_places_links_not_copies(county_folder):
+    full_data_path_prep(county_folder, ["2023"], mode="link")
+
+    source = os.path.join(county_folder, "2023", "2023-01-17_ID_1469162.pdf")
+    for placed_dir in [os.path.join(county_folder, "Kev_Dev"), os.path.join("output_files", "Clark_pdfs")]:
+        assert os.path.samefile(os.path.join(placed_dir, os.path.basename(source)), source)
+
+
+def test_manifest_mode_places_nothing(county_folder):
+    pdf_files_list, pdf_dir = full_data_path_prep(county_folder, ["2022", "2023"], mode="manifest")
+
+    assert pdf_dir == county_folder
+    assert sorted(pdf_files_list) == sorted(
+        os.path.join(year, name)
+        for year in ["2022", "2023"]
+        for name in os.listdir(os.path.join(county_folder, year))
+    )
+    assert not os.path.exists(os.path.join(county_folder, "Kev_Dev"))
+    assert not os.path.exists(os.path.join("output_files", "Clark_pdfs"))
+
+
+def test_ingest_file_falls_back_to_symlink_then_copy(tmp_path):
+    src = tmp_path / "a.pdf"
+    src.write_bytes(b"%PDF original")
+    dst_dir = tmp_path / "dst"
+    dst_dir.mkdir()
+
+    with patch("os.link", side_effect=OSError("cross-device link")):
+        dst = ingest_file(str(src), str(dst_dir), mode="link")
+    assert os.path.islink(dst)
+    os.remove(dst)
+
+    with patch("os.link", side_effect=OSError), patch("os.symlink", side_effect=OSError):
+        dst = ingest_file(str(src), str(dst_dir), mode="link")
+    assert not os.path.islink(dst) and not os.path.samefile(dst, src)
+
+    # copying over an earlier link leaves the original untouched
+    os.remove(dst)
+    assert os.path.samefile(ingest_file(str(src), str(dst_dir), mode="link"), src)
+    dst = ingest_file(str(src), str(dst_dir), mode="copy")
+    assert not os.path.samefile(dst, src)
+    assert src.read_bytes() == b"%PDF original"
@@ -0,0 +1,117 @@
+import time
+import threading
+import pytest
+from ..scripts.jobs import JobManager
+
+
+def blocking_run(release, calls):
+    def run(progress, **kwargs):
+        calls.append(kwargs)
+        progress("Clark", {"status": "running"})
+        progress("Rural", {"status": "ok", "rows": 19, "seconds": 0.1})
+        release.wait(5)
+        counties = {
+            "Clark": {"status": "ok", "rows": 279, "seconds": 0.2},
+            "Rural": {"status": "ok", "rows": 19, "seconds": 0.1},
+        }
+        return {"counties": counties}, 200
+
+    return run
+
+
+def wait_for(jobs, job_id, status, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = jobs.get(job_id)
+        if job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job never reached {status}: {jobs.get(job_id)}")
+
+
+def test_job_manager_deduplicates_and_reports_progress():
+    release, calls = threading.Event(), []
+    jobs = JobManager(blocking_run(release, calls))
+
+    job, created = jobs.submit(URL_based_run=True)
+    assert created
+    running = wait_for(jobs, job["id"], "running")
+    assert running["counties"]["Rural"]["rows"] == 19
+
+    # a second trigger while the first is running joins it
+    again, created = jobs.submit(URL_based_run=True)
+    assert not created
+    assert again["id"] == job["id"]
+
+    release.set()
+    done = wait_for(jobs, job["id"], "done")
+    assert done["status_code"] == 200
+    assert done["counties"]["Clark"] == {"status": "ok", "rows": 279, "seconds": 0.2}
+    assert calls == [{"URL_based_run": True}]
+
+    # once finished a new trigger starts a new job
+    new_job, created = jobs.submit(URL_based_run=True)
+    assert created and new_job["id"] != job["id"]
+    wait_for(jobs, new_job["id"], "done")
+
+
+def test_job_manager_records_failure():
+    def broken_run(progress, **kwargs):
+        raise RuntimeError("FULL_DATA_PATH not mounted")
+
+    jobs = JobManager(broken_run)
+    job, _ = jobs.submit()
+    failed = wait_for(jobs, job["id"], "failed")
+    assert failed["status_code"] == 500
+    assert failed["error"] == "RuntimeError('FULL_DATA_PATH not mounted')"
+    assert jobs.get("no-such-job") is None
+
+
+def test_flask_job_api(flask_main):
+    release, calls = threading.Event(), []
+    flask_main.jobs = JobManager(blocking_run(release, calls))
+    client = flask_main.app.test_client()
+
+    response = client.post("/jobs", json={"URL_based_run": True})
+    assert response.status_code == 202
+    job_id = response.get_json()["id"]
+    assert response.headers["Location"].endswith(f"/jobs/{job_id}")
+
+    # the scheduler's GET on / joins the running job
+    response = client.get("/")
+    assert response.status_code == 202
+    assert response.get_json()["id"] == job_id
+    assert response.get_json()["deduplicated"] is True
+
+    release.set()
+    wait_for(flask_main.jobs, job_id, "done")
+    assert calls == [{"URL_based_run": True}]
+    status = client.get(f"/jobs/{job_id}").get_json()
+    assert status["status"] == "done"
+    assert set(status["counties"]) == {"Clark", "Rural"}
+
+    assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_flask_scheduler_route_scrapes_urls(flask_main):
+    release, calls = threading.Event(), []
+    flask_main.jobs = JobManager(blocking_run(release, calls))
+    client = flask_main.app.test_client()
+
+    # CONFIG.URL_based_run is off for local runs, the deployed trigger still scrapes the URLs
+    job_id = client.get("/").get_json()["id"]
+    release.set()
+    wait_for(flask_main.jobs, job_id, "done")
+    assert calls == [{"URL_based_run": True}]
+
+
+def test_flask_job_api_rejects_non_boolean_url_based_run(flask_main):
+    calls = []
+    flask_main.jobs = JobManager(lambda **kwargs: calls.append(kwargs))
+    client = flask_main.app.test_client()
+
+    for value in ["false", 0, 1, None, "true"]:
+        response = client.post("/jobs", json={"URL_based_run": value})
+        assert response.status_code == 400
+        assert "URL_based_run" in response.get_json()["error"]
+    assert calls == []
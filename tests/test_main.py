@@ -0,0 +1,120 @@
+import json
+import time
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from .. import main as main_module
+
+
+@pytest.fixture(autouse=True)
+def report_path(tmp_path):
+    # keep the run report out of the project's output_files
+    path = tmp_path / "run_report.json"
+    with patch.object(main_module.CONFIG, "METRICS_REPORT_PATH", str(path)):
+        yield path
+
+
+def slow_county(seconds, rows=0, error=None):
+    def run_func(executor=None, **kwargs):
+        time.sleep(seconds)
+        if error is not None:
+            raise error
+        return pd.DataFrame({"original_pdf": [f"{i}.pdf" for i in range(rows)]})
+
+    return run_func
+
+
+def test_main_runs_counties_concurrently_with_fault_isolation():
+    jobs = {
+        "Clark": (slow_county(0.5, rows=3), {"url": "clark"}),
+        "Rural": (slow_county(0.5, error=ValueError("Rural broke")), {"url": "rural"}),
+        "Washoe": (slow_county(0.5, rows=2), {"url": "washoe"}),
+    }
+
+    with patch.object(main_module, "county_jobs", return_value=jobs), patch.object(
+        main_module.CONFIG, "SCRAPE_WORKERS", 1
+    ), patch.object(main_module, "run_and_merge_prior_history_counts") as mock_merge, patch.object(
+        main_module, "update_search_index"
+    ) as mock_index:
+        start = time.perf_counter()
+        result, status_code = main_module.main(URL_based_run=True)
+        elapsed = time.perf_counter() - start
+
+    # counties overlap, wall clock is about the slowest county rather than the sum
+    assert elapsed < 1.2
+
+    assert status_code == 207
+    assert list(result["counties"]) == ["Clark", "Rural", "Washoe"]
+    assert result["counties"]["Clark"]["status"] == "ok"
+    assert result["counties"]["Clark"]["rows"] == 3
+    assert result["counties"]["Rural"] == {
+        "status": "failed",
+        "error": "ValueError('Rural broke')",
+        "seconds": result["counties"]["Rural"]["seconds"],
+    }
+
+    # only the counties that succeeded are merged
+    assert sorted(mock_merge.call_args.kwargs["frames"]) == ["Clark", "Washoe"]
+    assert result["prior_history"] == {"status": "ok"}
+    assert sorted(mock_index.call_args.args[0]) == ["Clark", "Washoe"]
+
+
+def test_main_writes_run_report(report_path):
+    jobs = {
+        "Clark": (slow_county(0.1, rows=3), {"url": "clark"}),
+        "Rural": (slow_county(0, error=ValueError("Rural broke")), {"url": "rural"}),
+    }
+
+    with patch.object(main_module, "county_jobs", return_value=jobs), patch.object(
+        main_module.CONFIG, "SCRAPE_WORKERS", 1
+    ), patch.object(main_module, "run_and_merge_prior_history_counts"), patch.object(
+        main_module, "update_search_index"
+    ):
+        result, _ = main_module.main(URL_based_run=True)
+
+    report = json.loads(report_path.read_text())
+    # failed counties are timed too
+    assert set(report["stages"]) == {"Clark", "Rural", "statewide"}
+    assert report["stages"]["Clark"]["total"] >= 0.1
+    assert set(report["stages"]["statewide"]) == {"search_index"}
+    assert result["stages"] == report["stages"]
+
+
+def test_main_reports_total_failure():
+    jobs = {"Clark": (slow_county(0, error=OSError("offline")), {"url": "clark"})}
+
+    with patch.object(main_module, "county_jobs", return_value=jobs), patch.object(
+        main_module.CONFIG, "SCRAPE_WORKERS", 1
+    ), patch.object(main_module, "run_and_merge_prior_history_counts"), patch.object(
+        main_module, "update_search_index"
+    ) as mock_index:
+        result, status_code = main_module.main(URL_based_run=True)
+
+    assert status_code == 500
+    assert result["counties"]["Clark"]["status"] == "failed"
+    # nothing was scraped, the index is left alone
+    mock_index.assert_not_called()
+    assert result["search_index"] == {"status": "skipped"}
+
+
+def test_main_rejects_empty_county_list():
+    with patch.object(main_module, "county_jobs", return_value={}), patch.object(
+        main_module, "run_and_merge_prior_history_counts"
+    ) as mock_merge:
+        with pytest.raises(ValueError, match="No counties configured, CONFIG.URL_LIST is empty"):
+            main_module.main(URL_based_run=True)
+    mock_merge.assert_not_called()
+
+
+def test_main_reports_progress():
+    jobs = {"Clark": (slow_county(0, rows=1), {"url": "clark"})}
+    updates = []
+
+    with patch.object(main_module, "county_jobs", return_value=jobs), patch.object(
+        main_module.CONFIG, "SCRAPE_WORKERS", 1
+    ), patch.object(main_module, "run_and_merge_prior_history_counts"), patch.object(
+        main_module, "update_search_index"
+    ):
+        main_module.main(URL_based_run=True, progress=lambda name, status: updates.append((name, status["status"])))
+
+    assert updates == [("Clark", "running"), ("Clark", "ok"), ("prior_history", "running"), ("search_index", "running")]
@@ -0,0 +1,149 @@
+import os
+import config.CONFIG as CONFIG
+from ..scripts import child_fatality_scrape, prior_history
+from ..scripts.child_fatality_scrape import cleaning_df, download_all_pdfs, list_files, loop_pdf_scrape, scrape_county
+from ..scripts.metrics import METRICS, Metrics
+from ..scripts.prior_history import run_and_merge_prior_history_counts
+from ..scripts.text_cache import TextCache
+
+
+def counter(report, name, **labels):
+    return sum(
+        sample["value"]
+        for sample in report["counters"]
+        if sample["name"] == name and all(sample["labels"].get(k) == v for k, v in labels.items())
+    )
+
+
+def timer(report, name, **labels):
+    return next(
+        sample for sample in report["timers"] if sample["name"] == name and sample["labels"] == labels
+    )
+
+
+def test_metrics_report_and_prometheus_text():
+    metrics = Metrics(slow_log_size=2)
+    metrics.inc("pdfs_listed", 3, county="Clark")
+    with metrics.stage("Clark", "cleaning"):
+        pass
+    metrics.observe("stage_seconds", 2.0, county="Clark", stage="write")
+    metrics.record_download("Clark", "a.pdf", "new", 0.5, size=1000)
+    metrics.record_pdf("Clark", "a.pdf", pages=2, extract_seconds=0.25, parse_seconds=0.01)
+    metrics.record_pdf("Clark", "b.pdf", pages=2, extract_seconds=0.0, parse_seconds=0.02, cached=True)
+    metrics.record_pdf("Wa\"shoe", "c.pdf", pages=3, extract_seconds=0.1, parse_seconds=0.01)
+
+    report = metrics.report()
+    assert report["stages"]["Clark"]["write"] == 2.0
+    assert "cleaning" in report["stages"]["Clark"]
+    assert counter(report, "pages_extracted", county="Clark") == 2  # the cached PDF wasn't extracted
+    assert counter(report, "text_cache_hits") == 1
+    assert timer(report, "pdf_parse_seconds", county="Clark")["count"] == 2
+    # download and scrape costs of a PDF add up, only the 2 slowest are kept
+    assert [(pdf["pdf"], pdf["seconds"]) for pdf in report["slow_pdfs"]] == [("a.pdf", 0.76), ("c.pdf", 0.11)]
+    assert report["slow_pdfs"][0]["bytes"] == 1000
+
+    text = metrics.to_prometheus()
+    assert "# TYPE nv_child_fatality_pdfs_listed_total counter" in text
+    assert 'nv_child_fatality_pdfs_listed_total{county="Clark"} 3' in text
+    assert 'nv_child_fatality_download_bytes_total{county="Clark"} 1000' in text
+    assert "# TYPE nv_child_fatality_stage_seconds summary" in text
+    assert 'nv_child_fatality_stage_seconds_sum{county="Clark",stage="write"} 2.000000' in text
+    assert 'nv_child_fatality_pdf_extract_seconds_max{county="Clark"} 0.250000' in text
+    assert 'county="Wa\\"shoe"' in text
+
+    # large counters are written exactly, not rounded to 6 significant digits
+    metrics.inc("download_bytes", 123456789, county="Washoe")
+    metrics.inc("rows_written", 0.5, county="Washoe")
+    text = metrics.to_prometheus()
+    assert 'nv_child_fatality_download_bytes_total{county="Washoe"} 123456789' in text
+    assert 'nv_child_fatality_rows_written_total{county="Washoe"} 0.5' in text
+
+    metrics.reset()
+    assert metrics.report()["counters"] == [] and metrics.to_prometheus() == "\n"
+
+
+def test_scrape_records_per_pdf_metrics(disclosure_pdf_dir, tmp_path):
+    file_list = list_files(disclosure_pdf_dir, append_base_path=False)
+
+    METRICS.reset()
+    loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=2)
+    report = METRICS.report()
+    assert counter(report, "pdfs_scraped", county="Clark") == 5
+    assert counter(report, "pages_extracted", county="Clark") >= 5
+    assert timer(report, "pdf_extract_seconds", county="Clark")["count"] == 5
+    assert {pdf["pdf"] for pdf in report["slow_pdfs"]} == set(file_list)
+    assert all(pdf["extract_seconds"] > 0 for pdf in report["slow_pdfs"])
+
+    # with the text cache, a second run extracts nothing
+    cache = TextCache(str(tmp_path / "cache"))
+    loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1, cache=cache)
+    METRICS.reset()
+    loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1, cache=cache)
+    report = METRICS.report()
+    assert counter(report, "text_cache_hits", county="Clark") == 5
+    assert counter(report, "pages_extracted") == 0
+
+
+def test_scrape_county_times_its_stages(disclosure_pdf_dir, tmp_path, monkeypatch):
+    # no text cache, nothing written outside tmp_path
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(child_fatality_scrape, "get_text_cache", lambda: None)
+    file_list = list_files(disclosure_pdf_dir, append_base_path=False)
+    csv_filename = str(tmp_path / "child_fatality_Clark.csv")
+
+    METRICS.reset()
+    scrape_county(file_list, disclosure_pdf_dir, csv_filename, CONFIG.KEYS, CONFIG.RENAME_COLS, CONFIG.TIME_COLS)
+
+    report = METRICS.report()
+    assert set(report["stages"]["Clark"]) == {"hash", "scrape", "cleaning", "write"}
+    assert counter(report, "rows_written", county="Clark") == 5
+
+
+def test_prior_history_is_timed_per_county(disclosure_pdf_dir, monkeypatch):
+    monkeypatch.setattr(prior_history, "get_text_cache", lambda: None)
+    directory = os.path.dirname(disclosure_pdf_dir)
+    file_list = list_files(disclosure_pdf_dir, append_base_path=False)
+    records = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1)
+    frames = {"Clark": cleaning_df(records, CONFIG.RENAME_COLS, CONFIG.TIME_COLS)}
+
+    METRICS.reset()
+    run_and_merge_prior_history_counts(directory, frames=frames, write_intermediate=False)
+
+    report = METRICS.report()
+    assert list(report["stages"]) == ["Clark"]
+    # counting and merging add up to one stage
+    assert timer(report, "stage_seconds", county="Clark", stage="prior_history")["count"] == 2
+
+
+def test_download_metrics(dcfs_server, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dcfs_server.inject("Clark_000001.pdf", "503")
+
+    METRICS.reset()
+    download_all_pdfs(dcfs_server.county_url("Clark"), max_workers=4)
+    download_all_pdfs(dcfs_server.county_url("Clark"), max_workers=4)
+
+    report = METRICS.report()
+    assert counter(report, "pdfs_listed", county="Clark") == 100
+    assert counter(report, "pdfs_downloaded", county="Clark", status="new") == 50
+    assert counter(report, "pdfs_downloaded", county="Clark", status="skipped") == 49
+    assert counter(report, "pdfs_downloaded", county="Clark", status="failed") == 1
+    assert counter(report, "download_bytes", county="Clark") == 50 * dcfs_server.file_size
+    assert timer(report, "pdf_download_seconds", county="Clark")["count"] == 100
+    assert set(report["stages"]["Clark"]) == {"listing", "download"}
+    assert os.path.exists(os.path.join("output_files", "Clark_pdfs", "Clark_000001.pdf"))
+
+
+def test_flask_metrics_endpoints(flask_main):
+    client = flask_main.app.test_client()
+    # the service's registry, it imports scripts.metrics as a top level package
+    flask_main.METRICS.reset()
+    flask_main.METRICS.inc("pdfs_listed", 7, county="Rural")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert 'nv_child_fatality_pdfs_listed_total{county="Rural"} 7' in response.get_data(as_text=True)
+
+    report = client.get("/metrics/report").get_json()
+    assert counter(report, "pdfs_listed", county="Rural") == 7
@@ -0,0 +1,101 @@
+import os
+import pandas as pd
+from unittest.mock import patch
+from ..scripts.child_fatality_scrape import (
+    list_files,
+    loop_pdf_scrape,
+    cleaning_df,
+)
+from ..scripts import prior_history
+from ..scripts.prior_history import count_dates_in_g_section
+from ..scripts.pdf_text import count_dates_in_g_text
+import config.CONFIG as CONFIG
+
+
+def test_count_dates_in_g_text():
+    text = (
+        "F. The cause:\nunder investigation.\nG. Whether the agency had any contact\n"
+        "9/2/2014-A referral was received.\n7/20/18-A report was received.\n"
+        "Date: 12/03/2021 FPO 0401A footer\nH. Whether the agency 1/1/2024"
+    )
+    # two history dates, the footer date is subtracted
+    assert count_dates_in_g_text(text) == 2
+    assert count_dates_in_g_text("no lettered sections at all") == 0
+
+
+def test_scraped_prior_count_matches_pymupdf_count(disclosure_pdf_dir):
+    file_list = sorted(list_files(disclosure_pdf_dir, append_base_path=False))
+    records = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1)
+
+    for pdf_file, record in zip(file_list, records):
+        with open(os.path.join(disclosure_pdf_dir, pdf_file), "rb") as f:
+            assert record["prior_cases_count"] == count_dates_in_g_section(f.read())
+
+
+def test_run_and_merge_reuses_scraped_counts(disclosure_pdf_dir, monkeypatch):
+    monkeypatch.setattr(prior_history, "get_text_cache", lambda: None)
+    directory = os.path.dirname(disclosure_pdf_dir)
+    file_list = sorted(list_files(disclosure_pdf_dir, append_base_path=False))
+    records = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1)
+    final_df = cleaning_df(records, CONFIG.RENAME_COLS, CONFIG.TIME_COLS)
+    final_df.to_csv(os.path.join(directory, "child_fatality_Clark.csv"), index=False)
+
+    # only the counting step is under test
+    with patch.object(prior_history, "count_pdf_paths") as mock_count, patch.object(
+        prior_history, "merge_and_save_csv"
+    ):
+        prior_history.run_and_merge_prior_history_counts(directory, write_intermediate=True)
+        # no PDF is opened a second time
+        mock_count.assert_not_called()
+
+    counts = pd.read_csv(os.path.join(directory, "Clark_pdfs_prior_counts.csv"))
+    assert list(counts.columns) == ["original_region", "original_pdf", "prior_cases_count"]
+    assert sorted(counts["prior_cases_count"]) == [0, 1, 2, 3, 4]
+
+
+def test_run_and_merge_in_memory(disclosure_pdf_dir, monkeypatch):
+    monkeypatch.setattr(prior_history, "get_text_cache", lambda: None)
+    directory = os.path.dirname(disclosure_pdf_dir)
+    file_list = sorted(list_files(disclosure_pdf_dir, append_base_path=False))
+    records = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1)
+    final_df = cleaning_df(records, CONFIG.RENAME_COLS, CONFIG.TIME_COLS)
+
+    with patch.object(prior_history, "read_dataset") as mock_read:
+        merged = prior_history.run_and_merge_prior_history_counts(
+            directory, frames={"Clark": final_df}, write_intermediate=False
+        )
+        # the scraped frame is never read back from disk
+        mock_read.assert_not_called()
+
+    assert list(merged) == ["Clark"]
+    assert not os.path.exists(os.path.join(directory, "Clark_pdfs_prior_counts.csv"))
+    assert os.path.exists(os.path.join(directory, "Clark_merged.csv"))
+
+    df = merged["Clark"]
+    assert list(df.columns[:3]) == ["original_region", "original_pdf", "prior_cases_count"]
+    assert df.set_index("original_pdf")["prior_cases_count"].to_dict() == {
+        pdf_file: i for i, pdf_file in enumerate(file_list)
+    }
+
+
+def test_merge_prior_counts_indexed_join():
+    scraped = pd.DataFrame(
+        {
+            "original_region": ["Rural", "Rural", "Elko"],
+            "original_pdf": ["a.pdf", "b.pdf", "a.pdf"],
+            "date": ["1/1/2023", "1/2/2023", "1/3/2023"],
+        }
+    )
+    counts = pd.DataFrame(
+        {
+            "original_region": ["Elko", "Rural", "Rural"],
+            "original_pdf": ["a.pdf", "b.pdf", "a.pdf"],
+            "prior_cases_count": [7, -1, 3],
+        }
+    )
+
+    merged = prior_history.merge_prior_counts(scraped, counts)
+
+    assert list(merged.columns) == ["original_region", "original_pdf", "prior_cases_count", "date"]
+    # rows stay in scraped order, -1 (single page PDFs) becomes 0
+    assert merged["prior_cases_count"].tolist() == [3, 0, 7]
@@ -0,0 +1,217 @@
+import os
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from ..scripts.child_fatality_scrape import (
+    list_files,
+    loop_pdf_scrape,
+    cleaning_df,
+    scrape_individual_pdf,
+    parse_disclosure_fields,
+    parse_dob_gender,
+    split_dob_gender,
+    normalize_dates,
+    zip_city_columns,
+)
+from ..scripts.pdf_text import count_dates_in_g_text, extract_pages_text
+import config.CONFIG as CONFIG
+
+
+def test_loop_pdf_scrape_parallel_matches_serial(disclosure_pdf_dir):
+    file_list = sorted(list_files(disclosure_pdf_dir, append_base_path=False))
+
+    serial = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1)
+    parallel = loop_pdf_scrape(
+        file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=2, chunksize=2
+    )
+
+    # results come back in file_list order
+    assert [record["original_pdf"] for record in parallel] == file_list
+
+    # the final csv is byte for byte the same
+    serial_csv = cleaning_df(serial, CONFIG.RENAME_COLS, CONFIG.TIME_COLS).to_csv(index=False)
+    parallel_csv = cleaning_df(parallel, CONFIG.RENAME_COLS, CONFIG.TIME_COLS).to_csv(index=False)
+    assert serial_csv == parallel_csv
+
+
+def test_scrape_individual_pdf_stops_after_last_needed_section(disclosure_pdf_dir):
+    pdf_path = sorted(list_files(disclosure_pdf_dir, append_base_path=True))[2]
+    pages = extract_pages_text(pdf_path)
+    # a long update: extra pages after section H that the record never uses
+    pages = pages + ["NON-DISCLOSURE NOTICE\nA. Not a real section: ignored"] * 3
+    pages_read = []
+
+    def lazy_pages():
+        for page_text in pages:
+            pages_read.append(page_text)
+            yield page_text
+
+    record = scrape_individual_pdf(lazy_pages(), pdf_path, CONFIG.KEYS)
+    full_record = scrape_individual_pdf(pages[:2], pdf_path, CONFIG.KEYS, stop_section=None)
+
+    # section H starts on page 2, so page 3 onwards is never extracted
+    assert len(pages_read) == 2
+    assert record == full_record
+
+
+def test_stray_stop_section_line_before_section_g_reads_on(disclosure_pdf_dir):
+    pdf_path = sorted(list_files(disclosure_pdf_dir, append_base_path=True))[3]
+    pages = extract_pages_text(pdf_path)
+    # initials at the start of a summary line look like section H, on page 1 before D-G
+    pages[0] = pages[0].replace(
+        "The child was transported", "H. M. reported the child was transported"
+    )
+    pages_read = []
+
+    def lazy_pages():
+        for page_text in pages:
+            pages_read.append(page_text)
+            yield page_text
+
+    record = scrape_individual_pdf(lazy_pages(), pdf_path, CONFIG.KEYS)
+
+    # page 2 is still read, D-G and the prior history dates in G aren't lost
+    assert len(pages_read) == 2
+    assert record == scrape_individual_pdf(pages, pdf_path, CONFIG.KEYS, stop_section=None)
+    assert record["The date of birth and gender of child"] == "7/19/2021, Female"
+    assert count_dates_in_g_text("\n".join(pages_read)) == 3
+
+
+def test_missing_key_keeps_reading_pages(disclosure_pdf_dir):
+    pdf_path = sorted(list_files(disclosure_pdf_dir, append_base_path=True))[0]
+    pages = extract_pages_text(pdf_path)
+    pages[0] = pages[0].replace("Agency Name: Clark County Department of Family Services\n", "")
+    pages = pages + ["Agency Name: Clark County Department of Family Services"]
+
+    record = scrape_individual_pdf(iter(pages), pdf_path, CONFIG.KEYS)
+
+    # section H began on page 2 but Agency Name was still missing, so page 3 is read too
+    assert record["Agency Name"] == "Clark County Department of Family Services"
+
+
+def test_scrape_individual_pdf_requires_information_for_release():
+    with pytest.raises(ValueError):
+        scrape_individual_pdf(["Date: 5/2/2023\nA. no release header"], "Clark_pdfs/x.pdf", CONFIG.KEYS)
+
+
+def test_parse_disclosure_fields_release_header_on_second_page():
+    pages = [
+        "Date: 1/1/2023\nAgency Name: ignored, below the release header's line index",
+        "Agency Name: Washoe County Human Services Agency\nINFORMATION FOR RELEASE\n"
+        "A. Location of child at the time of death or near fatality (city/county):\nReno,\nWashoe",
+    ]
+
+    data = parse_disclosure_fields(pages, "Washoe_pdfs/x.pdf", CONFIG.KEYS)
+
+    assert data["Date"] == "1/1/2023"
+    assert data["Agency Name"] == "Washoe County Human Services Agency"
+    assert data["Location of child at the time of death or near fatality (city/county)"] == "Reno,Washoe"
+    assert data["Agency Address"] == ""
+
+
+def test_cleaning_df_records_match_one_row_frames(disclosure_pdf_dir):
+    file_list = sorted(list_files(disclosure_pdf_dir, append_base_path=False))
+    records = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1)
+
+    # the older one-DataFrame-per-PDF path still cleans to the same output
+    frames = [pd.DataFrame(record, index=[0]) for record in records]
+    from_records = cleaning_df(records, CONFIG.RENAME_COLS, CONFIG.TIME_COLS)
+    from_frames = cleaning_df(frames, CONFIG.RENAME_COLS, CONFIG.TIME_COLS)
+
+    assert from_records.to_csv(index=False) == from_frames.to_csv(index=False)
+
+
+def test_cleaning_df_enrich_city(disclosure_pdf_dir):
+    file_list = sorted(list_files(disclosure_pdf_dir, append_base_path=False))
+    records = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1)
+
+    plain = cleaning_df(records, CONFIG.RENAME_COLS, CONFIG.TIME_COLS, enrich_city=False)
+    enriched = cleaning_df(records, CONFIG.RENAME_COLS, CONFIG.TIME_COLS, enrich_city=True)
+
+    assert "agency_city" not in plain.columns
+    assert (enriched["agency_zip"] == "89155").all()
+    assert (enriched["agency_city"] == "Las Vegas").all()
+    pd.testing.assert_frame_equal(enriched.drop(columns=["agency_zip", "agency_city"]), plain)
+
+
+@pytest.mark.parametrize("county", ["Clark", "Rural", "Washoe"])
+def test_split_dob_gender_matches_parse_dob_gender(county):
+    csv_path = os.path.join(
+        os.path.dirname(__file__), "..", "output_files", f"child_fatality_{county}.csv"
+    )
+    values = pd.read_csv(csv_path)["date_of_birth_and_gender"]
+
+    expected = values.apply(parse_dob_gender)
+    result = split_dob_gender(values)
+
+    # None from parse_dob_gender and NaN from str.extract both write an empty csv cell
+    assert result["DOB"].fillna("").tolist() == expected[0].fillna("").tolist()
+    assert result["gender"].fillna("").tolist() == expected[1].fillna("").tolist()
+
+
+def test_split_dob_gender_missing_values():
+    result = split_dob_gender(pd.Series([np.nan, "unknown", "Female 2-3-19"]))
+
+    assert result["DOB"].isna().tolist() == [True, True, False]
+    assert result["gender"].tolist()[2] == "Female"
+    assert result["DOB"].tolist()[2] == "2-3-19"
+
+
+def test_normalize_dates_formats_and_failures():
+    values = pd.Series(
+        ["4/13/2023", "4/13/23", "April 13, 2023", "04-13-2023", " 4/13/2023 ", "4/13/2023 (approx.)", "unknown", np.nan]
+    )
+
+    dates, failed = normalize_dates(values)
+
+    assert dates[:6].tolist() == [pd.Timestamp("2023-04-13")] * 6
+    assert dates[6:].isna().all()
+    # the missing value isn't a failure, the unparseable one is
+    assert failed == 1
+    # the old single format parse only kept 1 of these 6 dates
+    assert pd.to_datetime(values, format="%m/%d/%Y", errors="coerce").notna().sum() == 1
+
+
+def test_normalize_dates_keeps_parsed_datetimes():
+    parsed = pd.Series([pd.Timestamp("2023-04-13 10:30"), pd.Timestamp("2023-04-14"), pd.NaT])
+
+    dates, failed = normalize_dates(parsed)
+    assert dates.tolist()[:2] == parsed.tolist()[:2] and pd.isna(dates[2])
+    assert failed == 0
+
+    # datetime objects among the strings aren't parsed back from their str()
+    mixed = pd.Series([pd.Timestamp("2023-04-13 10:30"), "4/14/2023", "unknown"])
+    dates, failed = normalize_dates(mixed)
+    assert dates[:2].tolist() == [pd.Timestamp("2023-04-13 10:30"), pd.Timestamp("2023-04-14")]
+    assert failed == 1
+
+
+def test_zip_city_columns():
+    addresses = pd.Series(
+        [
+            "350 South Center Street, Reno, NV 89512/",
+            "2533 N. Carson Street #100 Carson City, Nevada 89706",
+            "350 South Center Street Reno NV",
+            "500 S. Grand Central Pkwy, 5th Floor, Las Vegas, NV 89155-1234",
+            np.nan,
+        ]
+    )
+
+    df = zip_city_columns(addresses)
+
+    assert df["agency_zip"][[0, 1, 3]].tolist() == ["89512", "89706", "89155"]
+    assert df["agency_city"][[0, 1, 3]].tolist() == ["Reno", "Carson City", "Las Vegas"]
+    assert df[["agency_zip", "agency_city"]].iloc[[2, 4]].isna().all().all()
+
+
+def test_loop_pdf_scrape_shared_executor_matches_serial(disclosure_pdf_dir):
+    file_list = sorted(list_files(disclosure_pdf_dir, append_base_path=False))
+
+    serial = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        shared = loop_pdf_scrape(
+            file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1, chunksize=2, executor=executor
+        )
+
+    pd.testing.assert_frame_equal(pd.DataFrame(shared), pd.DataFrame(serial))
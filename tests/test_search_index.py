@@ -0,0 +1,147 @@
+import json
+import time
+import pandas as pd
+from ..scripts.search_index import SearchIndex, parse_query, tokenize, update_search_index
+
+
+def incidents_df(region="Clark"):
+    return pd.DataFrame(
+        {
+            "original_region": [region] * 4,
+            "original_pdf": ["a.pdf", "b.pdf", "c.pdf", "d.pdf"],
+            "summary_of_incident": [
+                "Infant found unresponsive after co-sleeping with parent. Marijuana in the home.",
+                "Child drowned in the backyard pool.",
+                "Toddler ingested marijuana edibles, marijuana marijuana found in the car.",
+                None,
+            ],
+            "cause_of_incident_if_determined": ["Unsafe sleep", "Drowning", "Ingestion", "Pending"],
+        }
+    )
+
+
+def build_index(region="Clark"):
+    index = SearchIndex()
+    index.update_frame(incidents_df(region))
+    return index
+
+
+def ids(results):
+    return [doc_id for doc_id, _ in results]
+
+
+def test_tokenize_and_parse_query():
+    assert tokenize("Co-sleeping; NOT breathing.") == ["co", "sleeping", "not", "breathing"]
+    assert parse_query('marijuana "unsafe sleep" OR co-sleeping NOT pool -"back yard"') == [
+        ([("marijuana",), ("unsafe", "sleep")], []),
+        ([("co", "sleeping")], [("pool",), ("back", "yard")]),
+    ]
+
+
+def test_boolean_and_phrase_queries():
+    index = build_index()
+
+    assert index.match("marijuana") == {"Clark/a.pdf", "Clark/c.pdf"}
+    assert index.match("marijuana unsafe") == {"Clark/a.pdf"}
+    assert index.match("drowning OR edibles") == {"Clark/b.pdf", "Clark/c.pdf"}
+    assert index.match("marijuana -edibles") == {"Clark/a.pdf"}
+    assert index.match("NOT marijuana") == {"Clark/b.pdf", "Clark/d.pdf"}
+    # hyphenated words and quotes are phrases, word order matters
+    assert index.match("co-sleeping") == {"Clark/a.pdf"}
+    assert index.match('"sleeping co"') == set()
+    # the cause field is searched too, but a phrase never spans summary and cause
+    assert index.match("pending") == {"Clark/d.pdf"}
+    assert index.match('"home unsafe"') == set()
+
+
+def test_phrase_never_spans_fields_after_a_long_summary():
+    index = SearchIndex()
+    summary = " ".join(["word"] * 999 + ["unsafe"])
+    index.add("Clark/long.pdf", [summary, "sleep environment"])
+    index.add("Clark/short.pdf", ["slept in an unsafe sleep environment", "pending"])
+
+    assert index.match('"unsafe sleep"') == {"Clark/short.pdf"}
+    assert index.match('"sleep environment"') == {"Clark/long.pdf", "Clark/short.pdf"}
+
+
+def test_search_ranks_by_bm25():
+    index = build_index()
+
+    # c.pdf mentions marijuana three times
+    assert ids(index.search("marijuana")) == ["Clark/c.pdf", "Clark/a.pdf"]
+    assert ids(index.search("marijuana", top=1)) == ["Clark/c.pdf"]
+    assert index.search("fentanyl") == []
+
+
+def test_update_frame_is_incremental():
+    index = build_index()
+    assert len(index) == 4
+
+    df = incidents_df()
+    df.loc[1, "summary_of_incident"] = "Child found in the bathtub."
+    df = df[df["original_pdf"] != "d.pdf"]
+    df.loc[len(df)] = ["Clark", "e.pdf", "Fentanyl exposure.", None]
+
+    counts = index.update_frame(df)
+    assert counts == {"indexed": 2, "unchanged": 2, "removed": 1}
+    assert index.match("pool") == set()
+    assert index.match("bathtub") == {"Clark/b.pdf"}
+    assert index.match("fentanyl") == {"Clark/e.pdf"}
+    assert "Clark/d.pdf" not in index.doc_lengths
+    # removed terms don't linger in the vocabulary
+    assert "pending" not in index.postings
+
+    # another region's update leaves Clark alone
+    index.update_frame(incidents_df("Washoe"))
+    assert index.match("marijuana") == {"Clark/a.pdf", "Clark/c.pdf", "Washoe/a.pdf", "Washoe/c.pdf"}
+
+    # same result as indexing the final data from scratch
+    rebuilt = SearchIndex()
+    rebuilt.update_frame(df)
+    rebuilt.update_frame(incidents_df("Washoe"))
+    assert index.postings == rebuilt.postings
+    assert index.total_length == rebuilt.total_length
+
+
+def test_update_search_index_saves_and_loads(tmp_path):
+    path = str(tmp_path / "search_index.json")
+
+    update_search_index({"Clark": incidents_df("Clark")}, path)
+    index = update_search_index({"Washoe": incidents_df("Washoe")}, path)
+
+    loaded = SearchIndex.load(path)
+    assert len(loaded) == 8
+    assert loaded.search("drowning") == index.search("drowning")
+    assert SearchIndex.load(str(tmp_path / "missing.json")).search("drowning") == []
+
+    # an index saved with the old position layout is rebuilt rather than reused
+    with open(path) as f:
+        saved = json.load(f)
+    saved["version"] = 1
+    with open(path, "w") as f:
+        json.dump(saved, f)
+    assert len(SearchIndex.load(path)) == 0
+
+
+def test_lookup_stays_fast_on_a_large_corpus():
+    words = [f"word{i}" for i in range(2000)]
+    summaries = [" ".join(words[(i * 7 + j) % len(words)] for j in range(60)) for i in range(20000)]
+    df = pd.DataFrame(
+        {
+            "original_region": "Clark",
+            "original_pdf": [f"{i}.pdf" for i in range(len(summaries))],
+            "summary_of_incident": summaries,
+            "cause_of_incident_if_determined": "Drowning",
+        }
+    )
+    df.loc[123, "summary_of_incident"] += " marijuana edibles"
+    index = SearchIndex()
+    index.update_frame(df)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        results = index.search('"marijuana edibles"')
+    per_query = (time.perf_counter() - start) / 100
+
+    assert ids(results) == ["Clark/123.pdf"]
+    assert per_query < 0.001
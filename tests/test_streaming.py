@@ -0,0 +1,127 @@
+import os
+import threading
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+import requests
+from ..scripts import child_fatality_scrape, streaming
+from ..scripts.child_fatality_scrape import run_pdf_scraping_URL
+from ..scripts.streaming import stream_county
+from ..scripts.text_cache import TextCache
+from ..scripts.build_state import build_state_path, load_build_state
+from .conftest import make_disclosure_pdf
+import config.CONFIG as CONFIG
+
+URL = "https://dcfs.nv.gov/Programs/CWS/CPS/ChildFatalities/Clark/"
+UPLOAD = "/uploadedFiles/dcfsnvgov/content/Programs/CWS/CPS/ChildFatalities/Clark"
+
+
+@pytest.fixture
+def dcfs_session(tmp_path, monkeypatch):
+    # a county page linking 8 disclosure PDFs, served by a mocked pooled session
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("output_files")
+    pdf_bytes = {}
+    for i in range(8):
+        pdf_path = make_disclosure_pdf(
+            str(tmp_path / f"source_{i}.pdf"), case_number=1469160 + i, prior_cases=i % 4
+        )
+        with open(pdf_path, "rb") as f:
+            pdf_bytes[f"2023-0{i + 1}-17_ID_{1469160 + i}.pdf"] = f.read()
+    page = "".join(f'<a href="{UPLOAD}/{name}">{name}</a>' for name in pdf_bytes)
+
+    def fake_get(href, **kwargs):
+        response = MagicMock()
+        response.status_code = 200
+        response.headers = {}
+        response.text = page
+        response.iter_content.return_value = [pdf_bytes.get(os.path.basename(href), b"")]
+        return response
+
+    with patch.object(requests, "Session") as mock_session_cls:
+        mock_session_cls.return_value.get.side_effect = fake_get
+        yield pdf_bytes
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 500), (2, 500), (1, 3)])
+def test_stream_county_matches_batch_run(dcfs_session, workers, chunk_size):
+    with patch.object(streaming, "cleaning_df", wraps=child_fatality_scrape.cleaning_df) as cleaning:
+        streamed = stream_county(
+            URL,
+            CONFIG.KEYS,
+            CONFIG.RENAME_COLS,
+            CONFIG.TIME_COLS,
+            download_workers=3,
+            workers=workers,
+            queue_size=2,
+            chunk_size=chunk_size,
+        )
+    # the spool is never cleaned more than chunk_size records at a time
+    assert max(len(call.args[0]) for call in cleaning.call_args_list) == min(chunk_size, len(dcfs_session))
+    streamed_csv = pd.read_csv(os.path.join("output_files", "child_fatality_Clark.csv"))
+
+    with patch.object(child_fatality_scrape, "get_text_cache", return_value=None):
+        batch = run_pdf_scraping_URL(URL, CONFIG.KEYS, CONFIG.RENAME_COLS, CONFIG.TIME_COLS)
+    batch_csv = pd.read_csv(os.path.join("output_files", "child_fatality_Clark.csv"))
+
+    # row for row, every PDF has the same incident date so row order comes down to file order
+    assert len(streamed) == len(dcfs_session)
+    pd.testing.assert_frame_equal(streamed, batch)
+    pd.testing.assert_frame_equal(streamed_csv, batch_csv)
+
+    # the spool is removed once the dataset is written, the build state is recorded
+    assert not os.path.exists(os.path.join("output_files", "child_fatality_Clark.jsonl"))
+    state = load_build_state(build_state_path(os.path.join("output_files", "child_fatality_Clark.csv")))
+    assert sorted(state) == sorted(dcfs_session)
+
+
+def test_stream_county_with_text_cache(dcfs_session, tmp_path):
+    cache = TextCache(str(tmp_path / "cache"))
+    parsed_in = set()
+
+    def scrape_text(*args, **kwargs):
+        parsed_in.add(threading.current_thread().name)
+        return child_fatality_scrape.scrape_text(*args, **kwargs)
+
+    with patch.object(streaming, "scrape_text", side_effect=scrape_text):
+        first = stream_county(URL, CONFIG.KEYS, CONFIG.RENAME_COLS, CONFIG.TIME_COLS, workers=2, cache=cache)
+    second = stream_county(URL, CONFIG.KEYS, CONFIG.RENAME_COLS, CONFIG.TIME_COLS, workers=1, cache=cache)
+
+    assert cache.stats()["misses"] == len(dcfs_session)
+    assert cache.stats()["hits"] == len(dcfs_session)
+    pd.testing.assert_frame_equal(first, second)
+    # parsed by the pipeline's own thread, not in the process pool's result callbacks
+    assert len(parsed_in) == 1 and next(iter(parsed_in)).endswith("(parse)")
+
+
+def test_stream_county_incremental(dcfs_session, tmp_path):
+    stream_county(URL, CONFIG.KEYS, CONFIG.RENAME_COLS, CONFIG.TIME_COLS, workers=1, incremental=True)
+
+    # one PDF is republished with another case number
+    changed = sorted(dcfs_session)[3]
+    with open(make_disclosure_pdf(str(tmp_path / "changed.pdf"), case_number=1, prior_cases=0), "rb") as f:
+        dcfs_session[changed] = f.read()
+
+    with patch.object(streaming, "scrape_pdf_file_timed", wraps=child_fatality_scrape.scrape_pdf_file_timed) as scrape:
+        incremental = stream_county(URL, CONFIG.KEYS, CONFIG.RENAME_COLS, CONFIG.TIME_COLS, workers=1, incremental=True)
+    assert [os.path.basename(call.args[0]) for call in scrape.call_args_list] == [changed]
+
+    rebuilt = stream_county(URL, CONFIG.KEYS, CONFIG.RENAME_COLS, CONFIG.TIME_COLS, workers=1, incremental=False)
+    by_pdf = lambda df: df.sort_values("original_pdf").reset_index(drop=True)  # noqa: E731
+    pd.testing.assert_frame_equal(by_pdf(incremental), by_pdf(rebuilt))
+    assert incremental.loc[incremental["original_pdf"] == changed, "internal_reference_unity_case_number"].tolist() == ["1"]
+
+
+def test_stream_county_with_no_pdfs(dcfs_session):
+    # a county page that doesn't link any PDF yet
+    with patch.object(streaming, "find_pdf_links", return_value=[]):
+        empty = stream_county(URL, CONFIG.KEYS, CONFIG.RENAME_COLS, CONFIG.TIME_COLS, workers=1)
+    assert empty.empty
+    assert "original_pdf" in pd.read_csv(os.path.join("output_files", "child_fatality_Clark.csv")).columns
+
+
+def test_stream_county_raises_instead_of_hanging(dcfs_session):
+    # one PDF isn't a disclosure form
+    with patch.object(streaming, "scrape_pdf_file_timed", side_effect=ValueError("no INFORMATION FOR RELEASE")):
+        with pytest.raises(ValueError):
+            stream_county(URL, CONFIG.KEYS, CONFIG.RENAME_COLS, CONFIG.TIME_COLS, workers=1, queue_size=1)
@@ -0,0 +1,95 @@
+import os
+import time
+from unittest.mock import patch
+from ..scripts import child_fatality_scrape
+from ..scripts.child_fatality_scrape import list_files, loop_pdf_scrape
+from ..scripts.text_cache import TextCache, get_text_cache
+from ..scripts.download_manifest import sha256_file
+from ..scripts.pdf_text import PYMUPDF_EXTRACTOR, extract_pages_text
+from ..scripts.prior_history import count_pdf_paths
+import config.CONFIG as CONFIG
+
+
+def test_text_cache_hit_miss(tmp_path):
+    cache = TextCache(str(tmp_path / "cache"), max_bytes=1024 * 1024)
+
+    assert cache.get("ab" * 32, "pdfplumber-1") is None
+    cache.put("ab" * 32, "pdfplumber-1", ["page 1", "page 2"])
+    assert cache.get("ab" * 32, "pdfplumber-1") == ["page 1", "page 2"]
+
+    # a different extractor version is a different entry
+    assert cache.get("ab" * 32, "pdfplumber-2") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_text_cache_evicts_least_recently_used(tmp_path):
+    page = "x" * 100
+    cache = TextCache(str(tmp_path / "cache"), max_bytes=250)
+
+    cache.put("aa" * 32, "v1", [page])
+    cache.put("bb" * 32, "v1", [page])
+    # make "aa" the most recently used entry
+    old = time.time() - 60
+    os.utime(cache._path("bb" * 32, "v1"), (old, old))
+    cache.get("aa" * 32, "v1")
+
+    cache.put("cc" * 32, "v1", [page])
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("bb" * 32, "v1") is None
+    assert cache.get("aa" * 32, "v1") == [page]
+    assert cache.stats()["size_bytes"] <= 250
+
+
+def test_text_cache_evicts_down_to_low_water_mark(tmp_path):
+    page = "x" * 100
+    cache = TextCache(str(tmp_path / "cache"), max_bytes=1000, evict_to=0.5)
+    for i in range(9):
+        cache.put(f"{i:02d}" * 32, "v1", [page])
+        os.utime(cache._path(f"{i:02d}" * 32, "v1"), (i, i))
+
+    # one put past the cap frees room for several more before the next directory walk
+    cache.put("ff" * 32, "v1", [page])
+    assert cache.stats()["evictions"] == 6
+    assert cache.stats()["size_bytes"] <= 500
+    with patch.object(cache, "_entries") as mock_entries:
+        for i in range(4):
+            cache.put(f"f{i}" * 32, "v1", [page])
+        mock_entries.assert_not_called()
+
+
+def test_get_text_cache_reuses_one_instance(tmp_path, monkeypatch):
+    monkeypatch.setattr(CONFIG, "TEXT_CACHE_DIR", str(tmp_path / "cache"))
+    cache = get_text_cache()
+    assert get_text_cache() is cache
+
+    monkeypatch.setattr(CONFIG, "TEXT_CACHE_ENABLED", False)
+    assert get_text_cache() is None
+
+
+def test_loop_pdf_scrape_rerun_hits_cache(disclosure_pdf_dir, tmp_path):
+    cache = TextCache(str(tmp_path / "cache"))
+    file_list = sorted(list_files(disclosure_pdf_dir, append_base_path=False))
+
+    first = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1, cache=cache)
+
+    # unchanged corpus: nothing is parsed the second time
+    with patch.object(child_fatality_scrape, "extract_pages_text") as mock_extract:
+        second = loop_pdf_scrape(file_list, disclosure_pdf_dir, CONFIG.KEYS, workers=1, cache=cache)
+        mock_extract.assert_not_called()
+
+    assert cache.stats()["hits"] == len(file_list)
+    assert first == second
+
+
+def test_prior_history_and_scrape_share_cached_text(disclosure_pdf_dir, tmp_path):
+    cache = TextCache(str(tmp_path / "cache"))
+    pdf_paths = sorted(list_files(disclosure_pdf_dir, append_base_path=True))
+    counts = count_pdf_paths(pdf_paths, cache=cache)
+
+    # prior history filled the cache, the pymupdf scrape reads the same page shape back
+    for pdf_path in pdf_paths:
+        cached = cache.get(sha256_file(pdf_path), PYMUPDF_EXTRACTOR)
+        assert cached == extract_pages_text(pdf_path, backend="pymupdf")
+    assert counts == count_pdf_paths(pdf_paths)